@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import openai
+import pydantic
+from app import ports
+from app.domain.errors import LLMRateLimitError, LLMServiceError, LLMTimeoutError, LocalRateLimitError
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infra.llm_calls import complete, complete_async
+from app.infra.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Errors caused by one key or endpoint rather than by the request, so another member may succeed.
+MEMBER_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    openai.AuthenticationError,
+    openai.PermissionDeniedError,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    asyncio.TimeoutError,
+)
+
+
+def is_member_error(error: BaseException) -> bool:
+    # OpenAIAdapterImpl wraps provider errors in LLMServiceError; look at the original one.
+    if isinstance(error, LLMServiceError):
+        return isinstance(error.__cause__, MEMBER_ERRORS)
+    return isinstance(error, MEMBER_ERRORS)
+
+
+class LLMPoolMember:
+    """
+    One API key / endpoint of an `LLMClientPool` with its load and health counters.
+    `rate_limiter` and `limiter` are the ones guarding `llm` and are only read.
+    """
+
+    def __init__(self, name: str, llm: ports.LLm, rate_limiter: Optional[RateLimiter] = None,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None):
+        self.name = name
+        self.llm = llm
+        self.rate_limiter = rate_limiter
+        self.limiter = limiter
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def throttled(self) -> bool:
+        return self.rate_limiter is not None and self.rate_limiter.time_until_admitted(0) > 0
+
+    def stats(self, now: float) -> Dict[str, object]:
+        return {
+            "name": self.name,
+            "available": self.ejected_until <= now,
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "ejections": self.ejections,
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+            "concurrency": self.limiter.stats() if self.limiter is not None else None,
+        }
+
+
+class LLMClientPool(ports.LLm):
+    """
+    Spreads completions over several API keys and endpoints.
+
+    Each call goes to the available member with the fewest outstanding requests, trying
+    members whose own rate limit budget is spent last. A member failing with a key- or
+    endpoint-specific error (provider rate limit, connection, 5xx, auth) is taken out of
+    rotation for `eject_seconds`, doubled on every consecutive failure up to
+    `max_eject_seconds`, and the call moves on to the next member; a rejection by the
+    member's local rate limiter moves on without ejecting it. When every member is
+    ejected, the one due back first is used anyway rather than failing outright.
+
+    Members should not retry on their own: retries belong above the pool, so that a 429
+    ejects the member at once and the retry lands on another key.
+    """
+
+    accepts_prompt_tokens = True
+
+    def __init__(self, members: List[LLMPoolMember], eject_seconds: float = 30.0, max_eject_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if not members:
+            raise ValueError("LLMClientPool needs at least one member")
+        self._members = members
+        self._eject_seconds = eject_seconds
+        self._max_eject_seconds = max_eject_seconds
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def select(self, exclude: Optional[List[LLMPoolMember]] = None) -> Optional[LLMPoolMember]:
+        candidates = [member for member in self._members if not exclude or member not in exclude]
+        if not candidates:
+            return None
+        now = self._clock()
+        available = [member for member in candidates if member.ejected_until <= now]
+        if not available:
+            return min(candidates, key=lambda member: member.ejected_until)
+        return min(available, key=lambda member: (member.throttled, member.outstanding, member.requests))
+
+    @property
+    def queue_depth(self) -> int:
+        """Shortest concurrency queue over the available members, so the pool can stand in for a limiter."""
+        now = self._clock()
+        depths = [
+            member.limiter.queue_depth if member.limiter is not None else 0
+            for member in self._members if member.ejected_until <= now
+        ]
+        return min(depths) if depths else 0
+
+    def time_until_admitted(self, prompt_tokens: int) -> float:
+        """Shortest rate limit wait over the available members, so the pool can stand in for a RateLimiter."""
+        now = self._clock()
+        waits = [
+            member.rate_limiter.time_until_admitted(prompt_tokens) if member.rate_limiter is not None else 0.0
+            for member in self._members if member.ejected_until <= now
+        ]
+        return min(waits) if waits else self._eject_seconds
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel],
+                       prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        tried: List[LLMPoolMember] = []
+        while True:
+            member = self.select(tried)
+            tried.append(member)
+            self._start(member)
+            try:
+                response = complete(member.llm, system_prompt, user_prompt, dto, prompt_tokens)
+            except LocalRateLimitError:
+                # Only this member's budget is spent; it says nothing about the key's health.
+                if len(tried) == len(self._members):
+                    raise
+                continue
+            except Exception as e:
+                if not is_member_error(e):
+                    raise
+                self._fail(member, e)
+                if len(tried) == len(self._members):
+                    raise
+                continue
+            finally:
+                member.outstanding -= 1
+            member.consecutive_failures = 0
+            return response
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel],
+                                   prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        tried: List[LLMPoolMember] = []
+        while True:
+            member = self.select(tried)
+            tried.append(member)
+            self._start(member)
+            try:
+                response = await complete_async(member.llm, system_prompt, user_prompt, dto, prompt_tokens)
+            except LocalRateLimitError:
+                # Only this member's budget is spent; it says nothing about the key's health.
+                if len(tried) == len(self._members):
+                    raise
+                continue
+            except Exception as e:
+                if not is_member_error(e):
+                    raise
+                self._fail(member, e)
+                if len(tried) == len(self._members):
+                    raise
+                continue
+            finally:
+                member.outstanding -= 1
+            member.consecutive_failures = 0
+            return response
+
+    def stats(self) -> Dict[str, object]:
+        now = self._clock()
+        return {
+            "size": len(self._members),
+            "available": sum(1 for member in self._members if member.ejected_until <= now),
+            "members": [member.stats(now) for member in self._members],
+        }
+
+    @staticmethod
+    def _start(member: LLMPoolMember) -> None:
+        member.outstanding += 1
+        member.requests += 1
+
+    def _fail(self, member: LLMPoolMember, error: Exception) -> None:
+        member.failures += 1
+        member.consecutive_failures += 1
+        member.ejections += 1
+        duration = min(self._max_eject_seconds, self._eject_seconds * 2 ** (member.consecutive_failures - 1))
+        member.ejected_until = self._clock() + duration
+        logger.warning(f"LLM pool member {member.name} failed ({type(error).__name__}), out of rotation for {duration:.0f}s")
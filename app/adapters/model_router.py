@@ -0,0 +1,127 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import openai
+import pydantic
+from app import ports
+from app.domain.errors import LLMRateLimitError
+from app.infra.circuit_breaker import CircuitBreaker
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infra.llm_calls import complete, complete_async
+from app.infra.rate_limiter import RateLimiter
+from app.infra.token_counter import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ERRORS = (openai.RateLimitError, LLMRateLimitError)
+
+
+class ModelRoute:
+    """
+    One model the router can send completions to. `max_prompt_tokens` of 0 accepts
+    prompts of any size; `limiter`, `rate_limiter` and `breaker` are the ones guarding
+    `llm` and are only read to tell whether the model is saturated.
+    """
+
+    def __init__(self, model: str, llm: ports.LLm, max_prompt_tokens: int = 0,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.model = model
+        self.llm = llm
+        self.max_prompt_tokens = max_prompt_tokens
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker
+
+    def fits(self, prompt_tokens: int) -> bool:
+        return not self.max_prompt_tokens or prompt_tokens <= self.max_prompt_tokens
+
+    def saturated(self, prompt_tokens: int, max_queue_depth: int) -> bool:
+        if self.breaker is not None and self.breaker.is_open:
+            return True
+        if self.limiter is not None and max_queue_depth and self.limiter.queue_depth >= max_queue_depth:
+            return True
+        return self.rate_limiter is not None and self.rate_limiter.time_until_admitted(prompt_tokens) > 0
+
+
+class ModelRouter(ports.LLm):
+    """
+    Sends each completion to the first route, ordered from smallest to largest model,
+    whose `max_prompt_tokens` fits the prompt. When that route is saturated (its
+    concurrency queue is `max_queue_depth` deep, its rate limit budget is exhausted or
+    its circuit is open) the completion goes to the fallback route instead, and a
+    rate-limited call is retried once on the fallback.
+    """
+
+    accepts_prompt_tokens = True
+
+    def __init__(self, routes: List[ModelRoute], token_counter: TokenCounter,
+                 fallback: Optional[ModelRoute] = None, max_queue_depth: int = 16):
+        if not routes:
+            raise ValueError("ModelRouter needs at least one route")
+        self._routes = routes
+        self._fallback = fallback
+        self._token_counter = token_counter
+        self._max_queue_depth = max_queue_depth
+        self.served: Dict[str, int] = {route.model: 0 for route in routes + ([fallback] if fallback else [])}
+        self.fallbacks = 0
+
+    def select(self, prompt_tokens: int) -> ModelRoute:
+        route = next((route for route in self._routes if route.fits(prompt_tokens)), self._routes[-1])
+        if (self._fallback is not None and route is not self._fallback
+                and route.saturated(prompt_tokens, self._max_queue_depth)
+                and not self._fallback.saturated(prompt_tokens, self._max_queue_depth)):
+            logger.info(f"Model {route.model} is saturated, routing to fallback model {self._fallback.model}")
+            self.fallbacks += 1
+            return self._fallback
+        return route
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel],
+                       prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        if prompt_tokens is None:
+            prompt_tokens = self._token_counter.count_messages(system_prompt, user_prompt)
+        route = self.select(prompt_tokens)
+        try:
+            response = complete(route.llm, system_prompt, user_prompt, dto, prompt_tokens)
+        except RATE_LIMIT_ERRORS:
+            if self._fallback is None or route is self._fallback:
+                raise
+            route = self._use_fallback(route)
+            response = complete(route.llm, system_prompt, user_prompt, dto, prompt_tokens)
+        self.served[route.model] += 1
+        return response
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel],
+                                   prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        response, _ = await self.run_routed_completion_async(system_prompt, user_prompt, dto, prompt_tokens)
+        return response
+
+    async def run_routed_completion_async(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel],
+                                          prompt_tokens: Optional[int] = None) -> Tuple[pydantic.BaseModel, str]:
+        """Like `run_completion_async`, but also returns the name of the model that served the completion."""
+        if prompt_tokens is None:
+            prompt_tokens = self._token_counter.count_messages(system_prompt, user_prompt)
+        route = self.select(prompt_tokens)
+        try:
+            response = await complete_async(route.llm, system_prompt, user_prompt, dto, prompt_tokens)
+        except RATE_LIMIT_ERRORS:
+            if self._fallback is None or route is self._fallback:
+                raise
+            route = self._use_fallback(route)
+            response = await complete_async(route.llm, system_prompt, user_prompt, dto, prompt_tokens)
+        self.served[route.model] += 1
+        return response, route.model
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "routes": [{"model": route.model, "max_prompt_tokens": route.max_prompt_tokens} for route in self._routes],
+            "fallback_model": self._fallback.model if self._fallback else None,
+            "served": dict(self.served),
+            "fallbacks": self.fallbacks,
+        }
+
+    def _use_fallback(self, route: ModelRoute) -> ModelRoute:
+        logger.warning(f"Model {route.model} is rate limited, retrying on fallback model {self._fallback.model}")
+        self.fallbacks += 1
+        return self._fallback
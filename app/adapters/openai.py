@@ -1,37 +1,37 @@
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
 import openai
 import pydantic
 from app import ports
 
+# Runs a request, possibly racing a duplicate of it, e.g. `HedgingPolicy.run`.
+Hedge = Callable[[Callable[[], Awaitable[Any]]], Awaitable[Any]]
+
 
 class OpenAIAdapter(ports.LLm):
-    def __init__(self, api_key: str, model: str) -> None:
+    def __init__(self, api_key: str, model: str, hedging: Optional[Hedge] = None,
+                 base_url: Optional[str] = None, max_retries: int = openai.DEFAULT_MAX_RETRIES) -> None:
+        # Pass max_retries=0 when a RetryingLLM wraps this adapter so attempts don't multiply.
         self._model = model
-        self._client = openai.OpenAI(api_key=api_key)
-        self._aclient = openai.AsyncOpenAI(api_key=api_key)
+        # base_url points the client at any OpenAI-compatible endpoint; None uses the SDK default.
+        self._client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self._aclient = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self._hedging = hedging
 
     def run_completion(self, system_prompt: str, user_prompt: str, dto: type[pydantic.BaseModel]) -> pydantic.BaseModel:
         """
         Executes a completion request using the OpenAI API with the provided prompts and response format.
-    
+
         Args:
             system_prompt (str): The system's introductory message for the chat.
             user_prompt (str): The user input for which a response is needed.
             dto (Type[pydantic.BaseModel]): A Pydantic model class used to define the structure of the API response.
-    
+
         Returns:
             pydantic.BaseModel: An instance of the provided DTO class populated with the API response data.
             more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
         """
-
-        completion = self._client.beta.chat.completions.parse(
-            model=self._model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format=dto
-        )
-        return completion.choices[0].message.parsed
+        return self.run_completion_with_usage(system_prompt, user_prompt, dto)[0]
 
     async def run_completion_async(self, system_prompt: str, user_prompt: str,
                                    dto: type[pydantic.BaseModel]) -> pydantic.BaseModel:
@@ -48,6 +48,37 @@ class OpenAIAdapter(ports.LLm):
 
          more info: https://platform.openai.com/docs/guides/structured-outputs?api-mode=chat
          """
+        return (await self.run_completion_with_usage_async(system_prompt, user_prompt, dto))[0]
+
+    def run_completion_with_usage(self, system_prompt: str, user_prompt: str,
+                                  dto: type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        """Like `run_completion`, but also returns the token usage the API billed."""
+        return self._parse(system_prompt, user_prompt, dto)
+
+    async def run_completion_with_usage_async(self, system_prompt: str, user_prompt: str,
+                                              dto: type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        return await self._attempt_async(system_prompt, user_prompt, dto)
+
+    def _parse(self, system_prompt: str, user_prompt: str,
+               dto: type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        completion = self._client.beta.chat.completions.parse(
+            model=self._model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            response_format=dto
+        )
+        return completion.choices[0].message.parsed, completion.usage
+
+    async def _attempt_async(self, system_prompt: str, user_prompt: str,
+                             dto: type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        if self._hedging is not None:
+            return await self._hedging(lambda: self._parse_async(system_prompt, user_prompt, dto))
+        return await self._parse_async(system_prompt, user_prompt, dto)
+
+    async def _parse_async(self, system_prompt: str, user_prompt: str,
+                           dto: type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
         completion = await self._aclient.beta.chat.completions.parse(
             model=self._model,
             messages=[
@@ -56,4 +87,4 @@ class OpenAIAdapter(ports.LLm):
             ],
             response_format=dto
         )
-        return completion.choices[0].message.parsed
+        return completion.choices[0].message.parsed, completion.usage
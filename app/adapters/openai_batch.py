@@ -0,0 +1,58 @@
+import asyncio
+import os
+from typing import Optional
+
+import openai
+from app import ports
+from app.domain.errors import BulkBatchFailedError
+from app.domain.models import BulkBatchStatus
+
+
+class OpenAIBatchAdapter(ports.BatchLLm):
+    def __init__(self, api_key: str, base_url: Optional[str] = None) -> None:
+        self._aclient = openai.AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    async def submit(self, request_file: str) -> str:
+        """
+        Uploads a JSONL request file and creates a batch against the chat completions endpoint.
+
+        Args:
+            request_file (str): Path of a JSONL file with one `/v1/chat/completions` request per line.
+
+        Returns:
+            str: The id of the created batch.
+            more info: https://platform.openai.com/docs/guides/batch
+        """
+        with open(request_file, "rb") as file:
+            content = await asyncio.to_thread(file.read)
+        uploaded = await self._aclient.files.create(file=(os.path.basename(request_file), content), purpose="batch")
+        batch = await self._aclient.batches.create(
+            input_file_id=uploaded.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def get_status(self, batch_id: str) -> BulkBatchStatus:
+        batch = await self._aclient.batches.retrieve(batch_id)
+        return BulkBatchStatus(batch.status)
+
+    async def download_results(self, batch_id: str, destination: str) -> None:
+        """
+        Writes the output file followed by the error file of the batch to `destination`.
+        Requests that failed on the provider side are only listed in the error file, in the
+        same line format, so both are needed to account for every request.
+        """
+        batch = await self._aclient.batches.retrieve(batch_id)
+        file_ids = [file_id for file_id in (batch.output_file_id, batch.error_file_id) if file_id]
+        if not file_ids:
+            raise BulkBatchFailedError(batch_id, batch.status)
+        with open(destination, "wb") as output:
+            last_chunk = b""
+            for file_id in file_ids:
+                if last_chunk and not last_chunk.endswith(b"\n"):
+                    await asyncio.to_thread(output.write, b"\n")
+                async with self._aclient.files.with_streaming_response.content(file_id) as response:
+                    async for chunk in response.iter_bytes():
+                        await asyncio.to_thread(output.write, chunk)
+                        last_chunk = chunk or last_chunk
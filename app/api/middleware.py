@@ -0,0 +1,17 @@
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
+
+
+class NonStreamingGZipMiddleware(GZipMiddleware):
+    """
+    GZip for responses of at least `minimum_size` bytes, except streamed batch results.
+
+    The gzip responder does not flush between chunks, so compressing an NDJSON or SSE
+    stream would hold records back until the compressor's buffer fills.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
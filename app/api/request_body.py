@@ -0,0 +1,92 @@
+import io
+import zlib
+
+from fastapi import HTTPException, Request
+
+try:
+    import zstandard
+except ImportError:  # optional `zstd` extra: zstd request bodies are rejected with 415
+    zstandard = None
+
+# zlib window bits accepting both gzip and zlib streams.
+GZIP_WBITS = 32 + zlib.MAX_WBITS
+
+# Longest JSON escape per UTF-8 byte of a string (`\u0001`), and room for the object around it.
+JSON_ESCAPE_RATIO = 6
+JSON_ENVELOPE_SIZE = 1024
+
+
+def _too_large(max_size: int) -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Request body exceeds maximum allowed size {max_size}")
+
+
+async def read_body(request: Request, max_size: int) -> bytes:
+    """
+    Reads a request body of at most `max_size` bytes after decoding `Content-Encoding`.
+
+    Supports identity, gzip/deflate and, when `zstandard` is installed, zstd. Bodies are
+    decompressed as they arrive and never inflated past `max_size + 1` bytes, so a
+    compression bomb is rejected after reading only a small part of it.
+    """
+    encoding = request.headers.get("content-encoding", "identity").strip().lower()
+    declared_length = request.headers.get("content-length")
+    if declared_length and declared_length.isdigit() and int(declared_length) > max_size:
+        # Transcripts compress well, so even a compressed body above the limit is rejected.
+        raise _too_large(max_size)
+
+    if encoding == "identity":
+        return await _read_raw(request, max_size)
+    if encoding in ("gzip", "x-gzip", "deflate"):
+        return await _read_gzip(request, max_size)
+    if encoding == "zstd":
+        if zstandard is None:
+            raise HTTPException(status_code=415, detail="zstd request bodies require the zstandard package")
+        return _decompress_zstd(await _read_raw(request, max_size), max_size)
+    raise HTTPException(status_code=415, detail=f"Unsupported Content-Encoding: {encoding}")
+
+
+async def _read_raw(request: Request, max_size: int) -> bytes:
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_size:
+            raise _too_large(max_size)
+    return bytes(body)
+
+
+async def _read_gzip(request: Request, max_size: int) -> bytes:
+    decompressor = zlib.decompressobj(GZIP_WBITS)
+    body = bytearray()
+    try:
+        async for chunk in request.stream():
+            data = chunk
+            while data and not decompressor.eof:
+                body += decompressor.decompress(data, max_size + 1 - len(body))
+                if len(body) > max_size:
+                    raise _too_large(max_size)
+                data = decompressor.unconsumed_tail
+        body += decompressor.flush()
+    except zlib.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid compressed request body: {str(e)}")
+    if not decompressor.eof:
+        raise HTTPException(status_code=400, detail="Invalid compressed request body: truncated stream")
+    if len(body) > max_size:
+        raise _too_large(max_size)
+    return bytes(body)
+
+
+def _decompress_zstd(data: bytes, max_size: int) -> bytes:
+    # zstandard's decompressobj has no output limit; a bounded read from a stream reader does.
+    try:
+        body = bytearray()
+        with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data), read_across_frames=True) as reader:
+            while len(body) <= max_size:
+                chunk = reader.read(max_size + 1 - len(body))
+                if not chunk:
+                    break
+                body += chunk
+    except zstandard.ZstdError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid compressed request body: {str(e)}")
+    if len(body) > max_size:
+        raise _too_large(max_size)
+    return bytes(body)
@@ -0,0 +1,60 @@
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+from app.domain.models import TranscriptAnalysis
+from app.use_cases.analyze_batch import BatchAnalysisResult
+
+ANALYSIS_FIELDS = ("id", "summary", "next_actions", "created_at", "reused", "reused_from", "model")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Parses a comma-separated `fields=` projection; None selects every field."""
+    if not fields:
+        return None
+    selected = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [field for field in selected if field not in ANALYSIS_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown fields {', '.join(unknown)}; available: {', '.join(ANALYSIS_FIELDS)}"
+        )
+    return selected
+
+
+def analysis_content(analysis: TranscriptAnalysis, fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """
+    Plain dict of an analysis in the TranscriptAnalysisResponse shape.
+
+    Routes return these through ORJSONResponse, which serializes UUIDs and datetimes
+    natively, so no response model is built and validated per analysis.
+    """
+    content = {
+        "id": analysis.id,
+        "summary": analysis.summary,
+        "next_actions": analysis.next_actions,
+        "created_at": analysis.created_at,
+        "reused": analysis.reused_from is not None,
+        "reused_from": analysis.reused_from,
+        "model": analysis.model,
+    }
+    if fields is None:
+        return content
+    return {field: content[field] for field in fields}
+
+
+def batch_item_content(result: BatchAnalysisResult, index: int, include_transcript: bool = True,
+                       fields: Optional[Tuple[str, ...]] = None) -> Dict[str, Any]:
+    """Dict of one batch result; without `include_transcript` the client matches results by `index`."""
+    content: Dict[str, Any] = {"index": result.index if result.index is not None else index}
+    if include_transcript:
+        content["transcript"] = result.transcript
+    content["success"] = result.success
+    content["analysis"] = analysis_content(result.analysis, fields) if result.success else None
+    content["error"] = result.error
+    return content
+
+
+def dumps(content: Any) -> str:
+    return orjson.dumps(content).decode("utf-8")
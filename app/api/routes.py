@@ -1,14 +1,42 @@
 import logging
+from datetime import datetime
+from typing import Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import ValidationError
 
-from app.api.schemas import TranscriptAnalysisResponse, BatchAnalysisRequest, BatchAnalysisResponse, BatchAnalysisItemResponse
-from app.domain.errors import EmptyTranscriptError, TranscriptTooLargeError, AnalysisNotFoundError, LLMRateLimitError, LLMTimeoutError, LLMServiceError
-from app.infra.di import get_analyze_transcript_use_case, get_get_analysis_use_case, get_analyze_batch_use_case
-from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase
+from app.adapters.llm_pool import LLMClientPool
+from app.adapters.model_router import ModelRouter
+from app.api.request_body import JSON_ENVELOPE_SIZE, JSON_ESCAPE_RATIO, read_body
+from app.api.responses import analysis_content, batch_item_content, dumps, parse_fields
+from app.api.schemas import AnalyzeTranscriptRequest, TranscriptAnalysisResponse, AnalysisListResponse, AnalysisSearchResponse, AnalysisEstimateResponse, BatchAnalysisRequest, BatchAnalysisResponse, BatchJobRequest, BatchJobResponse, BatchJobItemResponse, BatchJobResultsResponse, LongTranscriptRequest
+from app.domain.errors import InvalidCursorError, EmptyTranscriptError, TranscriptTooLargeError, AnalysisNotFoundError, LLMRateLimitError, LLMTimeoutError, LLMServiceError, JobNotFoundError, SearchUnavailableError
+from app.domain.models import BatchJob, BatchJobItem
+from app.domain.ports import AnalysisRepository
+from app.infra.analysis_cache import AnalysisCache
+from app.infra.circuit_breaker import CircuitBreaker
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infra.di import get_analyze_transcript_use_case, get_get_analysis_use_case, get_analyze_batch_use_case, get_analyze_long_transcript_use_case, get_analysis_cache, get_single_flight, get_concurrency_limiter, get_rate_limiter, get_retry_policy, get_hedging_policy, get_estimate_analysis_use_case, get_latency_model, get_repository, get_list_analyses_use_case, get_search_analyses_use_case, get_search_index, get_near_duplicate_index, get_transcript_preprocessor, get_model_router, get_llm_pool, get_circuit_breaker
+from app.infra.di import get_submit_batch_job_use_case, get_get_batch_job_use_case, get_get_batch_job_results_use_case, get_cancel_batch_job_use_case, get_job_worker_pool
+from app.infra.job_worker_pool import BatchJobWorkerPool
+from app.infra.hedging import HedgingPolicy
+from app.infra.latency_model import LatencyModel
+from app.infra.near_duplicate_index import NearDuplicateIndex
+from app.infra.rate_limiter import RateLimiter
+from app.infra.retry import RetryPolicy
+from app.infra.search_index import InvertedIndex
+from app.infra.single_flight import SingleFlight
+from app.infra.transcript_compaction import TranscriptPreprocessor
+from app.use_cases.analyze_transcript import MAX_TRANSCRIPT_SIZE, AnalyzeTranscriptUseCase
+from app.use_cases.estimate_analysis import EstimateAnalysisUseCase
 from app.use_cases.get_analysis import GetAnalysisUseCase
+from app.use_cases.list_analyses import ListAnalysesUseCase
+from app.use_cases.search_analyses import SearchAnalysesUseCase
 from app.use_cases.analyze_batch import AnalyzeBatchUseCase
+from app.use_cases.analyze_long_transcript import AnalyzeLongTranscriptUseCase
+from app.use_cases.batch_jobs import CancelBatchJobUseCase, GetBatchJobResultsUseCase, GetBatchJobUseCase, SubmitBatchJobUseCase
 
 logger = logging.getLogger(__name__)
 
@@ -18,27 +46,67 @@ router = APIRouter()
 @router.get("/analyze", response_model=TranscriptAnalysisResponse)
 async def analyze_transcript(
     transcript: str = Query(..., min_length=1, description="The plain text transcript to analyze"),
+    bypass_cache: bool = Query(False, description="Skip the analysis cache and always call the LLM"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
     use_case: AnalyzeTranscriptUseCase = Depends(get_analyze_transcript_use_case)
 ):
     """
     Analyze a single transcript and return summary with next actions.
     
     - **transcript**: The plain text transcript to analyze
+    - **bypass_cache**: Force a fresh LLM call even if an identical or near-identical transcript was analyzed recently
+    - **fields**: Optional comma-separated subset of the fields below
     
     Returns a TranscriptAnalysis with:
     - **id**: Unique identifier for the analysis
     - **summary**: Brief summary of the transcript
     - **next_actions**: List of recommended actions
     - **created_at**: Timestamp when analysis was created
+    - **reused**: Whether the analysis was copied from a near-duplicate transcript
+    - **reused_from**: Id of the analysis it was copied from
+    - **model**: LLM that produced the analysis
     """
+    selected_fields = parse_fields(fields)
+    return await _analyze(use_case, transcript, bypass_cache, selected_fields)
+
+
+@router.post("/analyze", response_model=TranscriptAnalysisResponse)
+async def analyze_transcript_body(
+    http_request: Request,
+    bypass_cache: bool = Query(False, description="Skip the analysis cache and always call the LLM"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
+    use_case: AnalyzeTranscriptUseCase = Depends(get_analyze_transcript_use_case)
+):
+    """
+    Analyze a transcript sent in the request body instead of the query string.
+    
+    - **body**: Plain text, or JSON `{"transcript": "..."}` with `Content-Type: application/json`
+    - **Content-Encoding**: Optional `gzip`, `deflate` or `zstd`; decompressed incrementally and rejected with 413 past the size limit
+    - **bypass_cache**: Force a fresh LLM call even if an identical or near-identical transcript was analyzed recently
+    - **fields**: Optional comma-separated subset of the returned fields
+    
+    Returns the same TranscriptAnalysis as `GET /analyze`.
+    """
+    selected_fields = parse_fields(fields)
+    is_json = http_request.headers.get("content-type", "").startswith("application/json")
+    # Both limits are UTF-8 bytes. JSON escaping can make the body up to six times larger than the
+    # transcript (one byte as `\u0001`), so JSON gets that much room and the use case checks the transcript itself.
+    body = await read_body(http_request, MAX_TRANSCRIPT_SIZE * JSON_ESCAPE_RATIO + JSON_ENVELOPE_SIZE if is_json else MAX_TRANSCRIPT_SIZE)
     try:
-        analysis = await use_case.execute(transcript)
-        return TranscriptAnalysisResponse(
-            id=analysis.id,
-            summary=analysis.summary,
-            next_actions=analysis.next_actions,
-            created_at=analysis.created_at
-        )
+        if is_json:
+            transcript = AnalyzeTranscriptRequest.model_validate_json(body).transcript
+        else:
+            transcript = body.decode("utf-8")
+    except (ValidationError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return await _analyze(use_case, transcript, bypass_cache, selected_fields)
+
+
+async def _analyze(use_case: AnalyzeTranscriptUseCase, transcript: str, bypass_cache: bool,
+                   fields: Optional[Tuple[str, ...]]) -> ORJSONResponse:
+    try:
+        analysis = await use_case.execute(transcript, bypass_cache=bypass_cache)
+        return ORJSONResponse(analysis_content(analysis, fields))
     except EmptyTranscriptError as e:
         raise HTTPException(status_code=422, detail=str(e))
     except TranscriptTooLargeError as e:
@@ -54,26 +122,120 @@ async def analyze_transcript(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/analyze/dry-run", response_model=AnalysisEstimateResponse)
+async def estimate_analysis(
+    transcript: str = Query(..., min_length=1, description="The plain text transcript to estimate"),
+    use_case: EstimateAnalysisUseCase = Depends(get_estimate_analysis_use_case)
+):
+    """
+    Estimate the cost and latency of analyzing a transcript without calling the LLM.
+    
+    - **transcript**: The plain text transcript that would be analyzed
+    
+    Returns an estimate with:
+    - **prompt_tokens**: Prompt tokens of the request, counted locally
+    - **expected_output_tokens**: Output tokens budgeted per analysis
+    - **tokens_exact**: Whether the model tokenizer was used rather than a heuristic
+    - **predicted_latency_seconds**: Expected LLM call latency, learned from recent calls
+    - **predicted_queue_seconds**: Expected wait for an LLM concurrency slot
+    - **compaction_tokens_saved**: Tokens removed by transcript compaction before prompting
+    """
+    try:
+        estimate = await use_case.execute(transcript)
+        return AnalysisEstimateResponse(**estimate.model_dump())
+    except EmptyTranscriptError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TranscriptTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in estimate_analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/analyses", response_model=AnalysisListResponse)
+async def list_analyses(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of analyses per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    created_from: Optional[datetime] = Query(None, description="Only analyses created at or after this time"),
+    created_to: Optional[datetime] = Query(None, description="Only analyses created before this time"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
+    use_case: ListAnalysesUseCase = Depends(get_list_analyses_use_case)
+):
+    """
+    List stored analyses, newest first.
+    
+    - **limit**: Page size (1-100)
+    - **cursor**: Opaque cursor from the previous page's `next_cursor`
+    - **created_from** / **created_to**: Optional creation time range (ISO 8601, UTC if no offset)
+    - **fields**: Optional comma-separated subset of analysis fields
+    
+    Returns a page of analyses and `next_cursor`, which is null on the last page.
+    """
+    selected_fields = parse_fields(fields)
+    try:
+        page = await use_case.execute(limit, cursor=cursor, created_from=created_from, created_to=created_to)
+        return ORJSONResponse({
+            "results": [analysis_content(analysis, selected_fields) for analysis in page.analyses],
+            "next_cursor": page.next_cursor
+        })
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in list_analyses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/analyses/search", response_model=AnalysisSearchResponse)
+async def search_analyses(
+    q: str = Query(..., min_length=1, max_length=500, description="Search terms; quote phrases that must match exactly"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
+    use_case: SearchAnalysesUseCase = Depends(get_search_analyses_use_case)
+):
+    """
+    Full-text search over analysis summaries and next actions.
+    
+    - **q**: Terms ranked by relevance (BM25); `"quoted phrases"` must appear in that order
+    - **limit**: Maximum number of results (1-100)
+    - **fields**: Optional comma-separated subset of analysis fields
+    
+    Returns the best matches with their scores and the total number of matching analyses.
+    """
+    selected_fields = parse_fields(fields)
+    try:
+        search_results = await use_case.execute(q, limit)
+        return ORJSONResponse({
+            "results": [
+                {"score": result.score, "analysis": analysis_content(result.analysis, selected_fields)}
+                for result in search_results.results
+            ],
+            "total_matches": search_results.total_matches
+        })
+    except SearchUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in search_analyses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.get("/analyses/{analysis_id}", response_model=TranscriptAnalysisResponse)
 async def get_analysis(
     analysis_id: UUID,
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
     use_case: GetAnalysisUseCase = Depends(get_get_analysis_use_case)
 ):
     """
     Retrieve a previously stored analysis by its ID.
     
     - **analysis_id**: The UUID of the analysis to retrieve
+    - **fields**: Optional comma-separated subset of analysis fields
     
     Returns the stored TranscriptAnalysis or 404 if not found.
     """
+    selected_fields = parse_fields(fields)
     try:
         analysis = await use_case.execute(analysis_id)
-        return TranscriptAnalysisResponse(
-            id=analysis.id,
-            summary=analysis.summary,
-            next_actions=analysis.next_actions,
-            created_at=analysis.created_at
-        )
+        return ORJSONResponse(analysis_content(analysis, selected_fields))
     except AnalysisNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -84,50 +246,277 @@ async def get_analysis(
 @router.post("/analyses/batch", response_model=BatchAnalysisResponse)
 async def analyze_batch(
     request: BatchAnalysisRequest,
+    include_transcript: bool = Query(True, description="Echo each input transcript; otherwise match results by index"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
     use_case: AnalyzeBatchUseCase = Depends(get_analyze_batch_use_case)
 ):
     """
     Analyze multiple transcripts concurrently.
     
     - **transcripts**: List of transcript texts to analyze
+    - **include_transcript**: Set to false to leave the input transcripts out of the response
+    - **fields**: Optional comma-separated subset of analysis fields
     
     Returns a BatchAnalysisResponse with:
-    - **results**: List of individual analysis results
+    - **results**: List of individual analysis results, each with the `index` of its transcript
     - **total_count**: Total number of transcripts processed
     - **successful_count**: Number of successful analyses
+    - **deduplicated_count**: LLM calls saved because transcripts repeated within the batch
     
-    Each result contains either a successful analysis or an error message.
+    Each result contains either a successful analysis or an error message. Transcripts that
+    are equal apart from whitespace are analyzed once and share the same analysis.
     """
+    selected_fields = parse_fields(fields)
     try:
         results = await use_case.execute(request.transcripts)
         
-        response_results = []
-        for result in results:
-            if result.success:
-                response_results.append(BatchAnalysisItemResponse(
-                    transcript=result.transcript,
-                    success=True,
-                    analysis=TranscriptAnalysisResponse(
-                        id=result.analysis.id,
-                        summary=result.analysis.summary,
-                        next_actions=result.analysis.next_actions,
-                        created_at=result.analysis.created_at
-                    )
-                ))
-            else:
-                response_results.append(BatchAnalysisItemResponse(
-                    transcript=result.transcript,
-                    success=False,
-                    error=result.error
-                ))
+        response_results = [
+            batch_item_content(result, index, include_transcript, selected_fields)
+            for index, result in enumerate(results)
+        ]
         
         successful_count = sum(1 for r in results if r.success)
         
-        return BatchAnalysisResponse(
-            results=response_results,
-            total_count=len(results),
-            successful_count=successful_count
-        )
+        return ORJSONResponse({
+            "results": response_results,
+            "total_count": len(results),
+            "successful_count": successful_count,
+            "deduplicated_count": results.deduplicated_count
+        })
     except Exception as e:
         logger.error(f"Unexpected error in analyze_batch: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/analyses/batch/stream")
+async def analyze_batch_stream(
+    request: BatchAnalysisRequest,
+    http_request: Request,
+    include_transcript: bool = Query(True, description="Echo each input transcript; otherwise match results by index"),
+    fields: Optional[str] = Query(None, description="Comma-separated analysis fields to return, e.g. id,summary"),
+    use_case: AnalyzeBatchUseCase = Depends(get_analyze_batch_use_case)
+):
+    """
+    Analyze multiple transcripts concurrently, streaming each result as soon as it completes.
+    
+    - **transcripts**: List of transcript texts to analyze
+    
+    Results are sent in completion order as newline-delimited JSON (`application/x-ndjson`), or as
+    Server-Sent Events when the request has `Accept: text/event-stream`. Each result record has
+    `type: "result"` and the `index` of its transcript in the request; the stream ends with a
+    `type: "summary"` record holding `total_count` and `successful_count`. `include_transcript`
+    and `fields` trim each result record as for `/analyses/batch`.
+    """
+    selected_fields = parse_fields(fields)
+    use_sse = "text/event-stream" in http_request.headers.get("accept", "")
+    
+    async def stream():
+        total_count = 0
+        successful_count = 0
+        async for result in use_case.execute_stream(request.transcripts):
+            total_count += 1
+            successful_count += int(result.success)
+            item = {"type": "result", **batch_item_content(result, result.index, include_transcript, selected_fields)}
+            yield _format_stream_record("result", dumps(item), use_sse)
+        summary = {"type": "summary", "total_count": total_count, "successful_count": successful_count}
+        yield _format_stream_record("summary", dumps(summary), use_sse)
+    
+    media_type = "text/event-stream" if use_sse else "application/x-ndjson"
+    return StreamingResponse(stream(), media_type=media_type)
+
+
+@router.post("/analyses/long", response_model=TranscriptAnalysisResponse)
+async def analyze_long_transcript(
+    request: LongTranscriptRequest,
+    use_case: AnalyzeLongTranscriptUseCase = Depends(get_analyze_long_transcript_use_case)
+):
+    """
+    Analyze a transcript that is too large for a single LLM call.
+    
+    - **transcript**: The plain text transcript to analyze, up to the long transcript size limit
+    
+    The transcript is split on speaker turns, chunks are analyzed in parallel and the partial
+    results are merged into one summary. Returns the same TranscriptAnalysis as `/analyze`.
+    """
+    try:
+        analysis = await use_case.execute(request.transcript)
+        return ORJSONResponse(analysis_content(analysis))
+    except EmptyTranscriptError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except TranscriptTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except LLMRateLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except LLMTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except LLMServiceError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in analyze_long_transcript: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/jobs", response_model=BatchJobResponse, status_code=202)
+async def submit_batch_job(
+    request: BatchJobRequest,
+    use_case: SubmitBatchJobUseCase = Depends(get_submit_batch_job_use_case)
+):
+    """
+    Submit a large batch of transcripts for asynchronous analysis.
+    
+    - **transcripts**: List of transcript texts to analyze (up to 10,000)
+    
+    Returns immediately with the job and its ID; a background worker pool processes the items.
+    Poll `GET /jobs/{job_id}` for progress and fetch results from `GET /jobs/{job_id}/results`.
+    """
+    try:
+        job = await use_case.execute(request.transcripts)
+        return _to_job_response(job)
+    except Exception as e:
+        logger.error(f"Unexpected error in submit_batch_job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/jobs/{job_id}", response_model=BatchJobResponse)
+async def get_batch_job(
+    job_id: UUID,
+    use_case: GetBatchJobUseCase = Depends(get_get_batch_job_use_case)
+):
+    """
+    Retrieve the status and progress counters of a batch job.
+    
+    - **job_id**: The UUID returned when the job was submitted
+    """
+    try:
+        job = await use_case.execute(job_id)
+        return _to_job_response(job)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_batch_job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/jobs/{job_id}/results", response_model=BatchJobResultsResponse)
+async def get_batch_job_results(
+    job_id: UUID,
+    offset: int = Query(0, ge=0, description="Index of the first item to return"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of items to return"),
+    use_case: GetBatchJobResultsUseCase = Depends(get_get_batch_job_results_use_case)
+):
+    """
+    Page through the per-item results of a batch job, ordered by input index.
+    
+    - **offset**: Index of the first item to return
+    - **limit**: Page size (max 1000)
+    
+    Items that have not been processed yet have status `pending`. `next_offset` is null on the last page.
+    """
+    try:
+        job, items = await use_case.execute(job_id, offset, limit)
+        next_offset = offset + len(items) if offset + len(items) < job.total_count else None
+        return BatchJobResultsResponse(
+            job=_to_job_response(job),
+            results=[_to_job_item_response(item) for item in items],
+            offset=offset,
+            limit=limit,
+            next_offset=next_offset
+        )
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_batch_job_results: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=BatchJobResponse)
+async def cancel_batch_job(
+    job_id: UUID,
+    use_case: CancelBatchJobUseCase = Depends(get_cancel_batch_job_use_case)
+):
+    """
+    Cancel a batch job. Items not yet picked up by a worker are skipped; finished items are kept.
+    
+    - **job_id**: The UUID of the job to cancel
+    """
+    try:
+        job = await use_case.execute(job_id)
+        return _to_job_response(job)
+    except JobNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in cancel_batch_job: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/stats")
+async def get_stats(
+    cache: AnalysisCache = Depends(get_analysis_cache),
+    single_flight: SingleFlight = Depends(get_single_flight),
+    limiter: AdaptiveConcurrencyLimiter = Depends(get_concurrency_limiter),
+    rate_limiter: RateLimiter = Depends(get_rate_limiter),
+    retry_policy: RetryPolicy = Depends(get_retry_policy),
+    hedging: HedgingPolicy = Depends(get_hedging_policy),
+    worker_pool: BatchJobWorkerPool = Depends(get_job_worker_pool),
+    latency_model: LatencyModel = Depends(get_latency_model),
+    repository: AnalysisRepository = Depends(get_repository),
+    search_index: InvertedIndex = Depends(get_search_index),
+    near_duplicates: NearDuplicateIndex = Depends(get_near_duplicate_index),
+    preprocessor: TranscriptPreprocessor = Depends(get_transcript_preprocessor),
+    model_router: Optional[ModelRouter] = Depends(get_model_router),
+    llm_pool: Optional[LLMClientPool] = Depends(get_llm_pool),
+    circuit_breaker: CircuitBreaker = Depends(get_circuit_breaker)
+):
+    """
+    Runtime statistics of the analysis pipeline.
+    
+    - **analysis_cache**: Size, hit/miss counters and evictions of the analysis result cache
+    - **single_flight**: In-flight LLM calls and how many duplicate requests joined one
+    - **llm_concurrency**: Current adaptive concurrency limit, in-flight calls and queue depth
+    - **llm_rate_limit**: Remaining request/token budget and throttling counters
+    - **llm_retries**: Attempts, retries and error types of LLM calls
+    - **llm_hedging**: Hedged requests, how often the hedge won and the current hedge delay
+    - **batch_jobs**: Worker count and depth of the batch job queue
+    - **llm_latency_model**: Samples and fitted coefficients of the latency predictor
+    - **repository**: Stored analyses, memory budget and eviction counters
+    - **search_index**: Indexed analyses, distinct terms and query count
+    - **near_duplicates**: Indexed transcript signatures, lookups and reused analyses
+    - **transcript_compaction**: Transcripts compacted before prompting and the characters saved
+    - **model_routing**: Configured model routes, calls served per model and fallbacks; null without routing
+    - **llm_pool**: Per-key/endpoint outstanding requests, failures, ejections and rate limit budget; null with a single key
+    - **llm_circuit_breaker**: Breaker state (closed, open, half_open), recent failure rate and rejected calls
+    """
+    return {
+        "analysis_cache": cache.stats(),
+        "single_flight": single_flight.stats(),
+        "llm_concurrency": limiter.stats(),
+        "llm_rate_limit": rate_limiter.stats(),
+        "llm_retries": retry_policy.stats(),
+        "llm_hedging": hedging.stats(),
+        "batch_jobs": worker_pool.stats(),
+        "llm_latency_model": latency_model.stats(),
+        "repository": repository.stats(),
+        "search_index": search_index.stats(),
+        "near_duplicates": near_duplicates.stats(),
+        "transcript_compaction": preprocessor.stats(),
+        "model_routing": model_router.stats() if model_router is not None else None,
+        "llm_pool": llm_pool.stats() if llm_pool is not None else None,
+        "llm_circuit_breaker": circuit_breaker.stats()
+    }
+
+
+def _to_job_response(job: BatchJob) -> BatchJobResponse:
+    return BatchJobResponse(**job.model_dump())
+
+
+def _to_job_item_response(item: BatchJobItem) -> BatchJobItemResponse:
+    analysis = None
+    if item.analysis is not None:
+        analysis = TranscriptAnalysisResponse(**analysis_content(item.analysis))
+    return BatchJobItemResponse(index=item.index, status=item.status, analysis=analysis, error=item.error)
+
+
+def _format_stream_record(event: str, payload: str, use_sse: bool) -> str:
+    if use_sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
@@ -4,12 +4,19 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from app.domain.models import BatchJobItemStatus, BatchJobStatus
+
+MAX_JOB_TRANSCRIPTS = 10_000
+
 
 class TranscriptAnalysisResponse(BaseModel):
     id: UUID
     summary: str
     next_actions: List[str]
     created_at: datetime
+    reused: bool = False
+    reused_from: Optional[UUID] = None
+    model: Optional[str] = None
 
     class Config:
         json_encoders = {
@@ -17,12 +24,47 @@ class TranscriptAnalysisResponse(BaseModel):
         }
 
 
+class AnalysisListResponse(BaseModel):
+    results: List[TranscriptAnalysisResponse]
+    next_cursor: Optional[str] = None
+
+
+class AnalysisSearchItemResponse(BaseModel):
+    score: float
+    analysis: TranscriptAnalysisResponse
+
+
+class AnalysisSearchResponse(BaseModel):
+    results: List[AnalysisSearchItemResponse]
+    total_matches: int
+
+
+class AnalysisEstimateResponse(BaseModel):
+    model: str
+    prompt_tokens: int
+    expected_output_tokens: int
+    tokens_exact: bool
+    predicted_latency_seconds: float
+    predicted_queue_seconds: float
+    compaction_tokens_saved: int = 0
+
+
 class BatchAnalysisRequest(BaseModel):
     transcripts: List[str] = Field(..., min_items=1, max_items=10)
 
 
+class AnalyzeTranscriptRequest(BaseModel):
+    transcript: str = Field(..., min_length=1)
+
+
+class LongTranscriptRequest(BaseModel):
+    transcript: str = Field(..., min_length=1)
+
+
 class BatchAnalysisItemResponse(BaseModel):
-    transcript: str
+    index: Optional[int] = None
+    # Left out when the request sets include_transcript=false.
+    transcript: Optional[str] = None
     success: bool
     analysis: Optional[TranscriptAnalysisResponse] = None
     error: Optional[str] = None
@@ -32,6 +74,37 @@ class BatchAnalysisResponse(BaseModel):
     results: List[BatchAnalysisItemResponse]
     total_count: int
     successful_count: int
+    deduplicated_count: int = 0
+
+
+class BatchJobRequest(BaseModel):
+    transcripts: List[str] = Field(..., min_items=1, max_items=MAX_JOB_TRANSCRIPTS)
+
+
+class BatchJobResponse(BaseModel):
+    id: UUID
+    status: BatchJobStatus
+    total_count: int
+    completed_count: int
+    successful_count: int
+    failed_count: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class BatchJobItemResponse(BaseModel):
+    index: int
+    status: BatchJobItemStatus
+    analysis: Optional[TranscriptAnalysisResponse] = None
+    error: Optional[str] = None
+
+
+class BatchJobResultsResponse(BaseModel):
+    job: BatchJobResponse
+    results: List[BatchJobItemResponse]
+    offset: int
+    limit: int
+    next_offset: Optional[int] = None
 
 
 class ErrorResponse(BaseModel):
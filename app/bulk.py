@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import json
+import logging
+from typing import Iterator
+
+from app.infra.di import get_bulk_analyze_use_case
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+def read_transcripts(path: str) -> Iterator[str]:
+    with open(path, encoding="utf-8") as lines:
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)["transcript"]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Analyze a file of transcripts through the provider batch API")
+    parser.add_argument("input", help='JSONL file with one {"transcript": "..."} object per line')
+    args = parser.parse_args()
+
+    report = await get_bulk_analyze_use_case().execute(read_transcripts(args.input))
+    print(json.dumps({
+        "batch_id": report.batch_id,
+        "total_count": report.total_count,
+        "successful_count": report.successful_count,
+        "failed_count": report.failed_count,
+        "errors": {str(index): error for index, error in sorted(report.errors.items())},
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
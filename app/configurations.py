@@ -1,10 +1,100 @@
+from typing import Dict, List, Optional
+
 import pydantic_settings
 
 
 class EnvConfigs(pydantic_settings.BaseSettings):
-    model_config =pydantic_settings.SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+    model_config =pydantic_settings.SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4o-2024-08-06"
+    # Any OpenAI-compatible endpoint, e.g. an Azure OpenAI v1 URL; empty uses the OpenAI API.
+    OPENAI_BASE_URL: str = ""
+    # More keys/endpoints balanced with the one above, as a JSON list of
+    # {"name": ..., "api_key": ..., "base_url": ...} objects; a missing api_key reuses OPENAI_API_KEY.
+    OPENAI_POOL_ENDPOINTS: Optional[List[Dict[str, str]]] = None
+    OPENAI_POOL_EJECT_SECONDS: float = 30.0
+    # Model routing: prompts up to OPENAI_SMALL_MODEL_MAX_TOKENS go to the small model, and
+    # calls move to the fallback model while the chosen one is saturated or rate limited.
+    OPENAI_SMALL_MODEL: str = ""
+    OPENAI_SMALL_MODEL_MAX_TOKENS: int = 2000
+    OPENAI_FALLBACK_MODEL: str = ""
+    OPENAI_FALLBACK_QUEUE_DEPTH: int = 16
+
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    ANALYSIS_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    ANALYSIS_CACHE_TTL_SECONDS: float = 3600.0
+
+    # Off by default: similarity of word shingles cannot tell "will sign" from "will not sign",
+    # so reuse is only safe for transcripts that really only vary in noise.
+    NEAR_DUPLICATE_ENABLED: bool = False
+    NEAR_DUPLICATE_THRESHOLD: float = 0.9
+    NEAR_DUPLICATE_CAPACITY: int = 100_000
+
+    LLM_CONCURRENCY_INITIAL: int = 5
+    LLM_CONCURRENCY_MIN: int = 1
+    LLM_CONCURRENCY_MAX: int = 64
+    LLM_LATENCY_THRESHOLD_SECONDS: float = 30.0
+
+    OPENAI_RPM_LIMIT: int = 500
+    OPENAI_TPM_LIMIT: int = 30000
+    OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 10.0
+    OPENAI_EXPECTED_OUTPUT_TOKENS: int = 400
+    MAX_TRANSCRIPT_TOKENS: int = 0
+
+    TRANSCRIPT_COMPACTION_ENABLED: bool = True
+    # Regular expressions removed from transcripts before prompting; unset uses timestamps and fillers.
+    TRANSCRIPT_NOISE_PATTERNS: Optional[List[str]] = None
+
+    OPENAI_TIMEOUT_SECONDS: float = 30.0
+
+    LLM_CIRCUIT_BREAKER_ENABLED: bool = True
+    LLM_CIRCUIT_FAILURE_RATE: float = 0.5
+    LLM_CIRCUIT_SLOW_CALL_SECONDS: float = 30.0
+    LLM_CIRCUIT_WINDOW_SIZE: int = 20
+    LLM_CIRCUIT_MIN_CALLS: int = 10
+    LLM_CIRCUIT_OPEN_SECONDS: float = 30.0
+    LLM_CIRCUIT_HALF_OPEN_CALLS: int = 3
+
+    OPENAI_RETRY_MAX_ATTEMPTS: int = 4
+    OPENAI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    OPENAI_RETRY_MAX_DELAY_SECONDS: float = 20.0
+    OPENAI_RETRY_DEADLINE_SECONDS: float = 60.0
+
+    OPENAI_HEDGING_ENABLED: bool = False
+    OPENAI_HEDGING_PERCENTILE: float = 0.95
+    OPENAI_HEDGING_BUDGET_RATIO: float = 0.05
+    OPENAI_HEDGING_MIN_SAMPLES: int = 20
+
+    BATCH_PACK_TOKEN_BUDGET: int = 0
+    BATCH_PACK_MAX_ITEMS: int = 10
+
+    JOB_WORKER_COUNT: int = 4
+    JOB_SQLITE_PATH: str = ""
+    JOB_CLAIM_SECONDS: float = 600.0
+    JOB_RETENTION_SECONDS: float = 24 * 3600.0
+
+    BULK_WORK_DIR: str = "bulk"
+    BULK_POLL_INTERVAL_SECONDS: float = 60.0
+
+    LONG_TRANSCRIPT_MAX_BYTES: int = 5 * 1024 * 1024
+    LONG_TRANSCRIPT_CHUNK_TOKENS: int = 6000
+    LONG_TRANSCRIPT_OVERLAP_TURNS: int = 2
+    LONG_TRANSCRIPT_REDUCE_TOKENS: int = 6000
+
+
+class RepositoryConfigs(pydantic_settings.BaseSettings):
+    """Storage settings, kept apart from `EnvConfigs` so reads work without LLM credentials."""
+    model_config = pydantic_settings.SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    REPOSITORY_MAX_ENTRIES: int = 100_000
+    REPOSITORY_MAX_BYTES: int = 256 * 1024 * 1024
+    REPOSITORY_TTL_SECONDS: float = 7 * 24 * 3600.0
 
+    REPOSITORY_BACKEND: str = "memory"
+    REPOSITORY_SQLITE_PATH: str = "analyses.db"
+    REPOSITORY_BATCH_SIZE: int = 500
+    REPOSITORY_FLUSH_INTERVAL_SECONDS: float = 0.05
 
+    REPOSITORY_SHARED_PATH: str = "/dev/shm/transcript-analyses"
+    REPOSITORY_SHARED_CAPACITY: int = 1 << 20
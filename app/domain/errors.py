@@ -9,6 +9,13 @@ class TranscriptTooLargeError(DomainError):
         super().__init__(f"Transcript size {size} exceeds maximum allowed size {max_size}")
 
 
+class TranscriptTooManyTokensError(TranscriptTooLargeError):
+    def __init__(self, tokens: int, max_tokens: int):
+        self.size = tokens
+        self.max_size = max_tokens
+        DomainError.__init__(self, f"Transcript has {tokens} tokens, exceeding the maximum of {max_tokens} tokens")
+
+
 class EmptyTranscriptError(DomainError):
     def __init__(self):
         super().__init__("Transcript must not be empty")
@@ -20,6 +27,36 @@ class AnalysisNotFoundError(DomainError):
         super().__init__(f"Analysis with id {analysis_id} not found")
 
 
+class InvalidCursorError(DomainError):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor: {cursor}")
+
+
+class AnalysisStoreFullError(DomainError):
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        super().__init__(f"Analysis store is full (capacity {capacity})")
+
+
+class SearchUnavailableError(DomainError):
+    def __init__(self):
+        super().__init__("Search is not available with the configured analysis store")
+
+
+class JobNotFoundError(DomainError):
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        super().__init__(f"Batch job with id {job_id} not found")
+
+
+class BulkBatchFailedError(DomainError):
+    def __init__(self, batch_id: str, status: str):
+        self.batch_id = batch_id
+        self.status = status
+        super().__init__(f"Bulk batch {batch_id} finished with status {status}")
+
+
 class LLMServiceError(DomainError):
     def __init__(self, message: str):
         super().__init__(f"LLM service error: {message}")
@@ -32,4 +69,15 @@ class LLMTimeoutError(DomainError):
 
 class LLMRateLimitError(DomainError):
     def __init__(self):
-        super().__init__("LLM service rate limit exceeded")
\ No newline at end of file
+        super().__init__("LLM service rate limit exceeded")
+
+class LocalRateLimitError(LLMRateLimitError):
+    """Raised when our own rate limiter rejects a call before it reaches the provider."""
+
+    def __init__(self):
+        DomainError.__init__(self, "LLM rate limit budget exhausted")
+
+
+class CircuitOpenError(LLMServiceError):
+    def __init__(self):
+        super().__init__("circuit breaker is open, failing fast")
@@ -1,4 +1,6 @@
 from datetime import datetime, timezone
+from enum import Enum
+from typing import Optional
 from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
@@ -8,8 +10,96 @@ class TranscriptAnalysis(BaseModel):
     summary: str
     next_actions: list[str]
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Set when the analysis was copied from the one for a near-duplicate transcript.
+    reused_from: Optional[UUID] = None
+    # Name of the LLM that produced the analysis, when known.
+    model: Optional[str] = None
+
+
+class AnalysisPage(BaseModel):
+    analyses: list[TranscriptAnalysis]
+    next_cursor: Optional[str] = None
+
+
+class ScoredAnalysis(BaseModel):
+    analysis: TranscriptAnalysis
+    score: float
+
+
+class AnalysisSearchResults(BaseModel):
+    results: list[ScoredAnalysis]
+    total_matches: int
 
 
 class LLMAnalysisDTO(BaseModel):
     summary: str
-    action_items: list[str]
\ No newline at end of file
+    action_items: list[str]
+
+
+class ModelCompletion(BaseModel):
+    """An LLM analysis together with the model that served it, as kept in the analysis cache."""
+    response: LLMAnalysisDTO
+    model: Optional[str] = None
+
+
+class PackedLLMAnalysisItemDTO(LLMAnalysisDTO):
+    transcript_id: int
+
+
+class PackedLLMAnalysisDTO(BaseModel):
+    """Structured result of one LLM call analyzing several packed transcripts."""
+    analyses: list[PackedLLMAnalysisItemDTO]
+
+
+class AnalysisEstimate(BaseModel):
+    model: str
+    prompt_tokens: int
+    expected_output_tokens: int
+    tokens_exact: bool
+    predicted_latency_seconds: float
+    predicted_queue_seconds: float
+    compaction_tokens_saved: int = 0
+
+
+class BatchJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class BatchJobItemStatus(str, Enum):
+    PENDING = "pending"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class BatchJob(BaseModel):
+    id: UUID = Field(default_factory=uuid4)
+    status: BatchJobStatus = BatchJobStatus.PENDING
+    total_count: int
+    completed_count: int = 0
+    successful_count: int = 0
+    failed_count: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class BatchJobItem(BaseModel):
+    job_id: UUID
+    index: int
+    transcript: str
+    status: BatchJobItemStatus = BatchJobItemStatus.PENDING
+    analysis: Optional[TranscriptAnalysis] = None
+    error: Optional[str] = None
+
+
+class BulkBatchStatus(str, Enum):
+    VALIDATING = "validating"
+    IN_PROGRESS = "in_progress"
+    FINALIZING = "finalizing"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    EXPIRED = "expired"
+    CANCELLING = "cancelling"
+    CANCELLED = "cancelled"
@@ -1,3 +1,7 @@
+from app.ports.analysis_repository import AnalysisRepository, AnalysisRepositoryListener
+from app.ports.batch_llm import BatchLLm
+from app.ports.job_queue import BatchJobQueue
+from app.ports.job_repository import BatchJobRepository
 from app.ports.llm import LLm
 
-__all__ = ["LLm"]
\ No newline at end of file
+__all__ = ["AnalysisRepository", "AnalysisRepositoryListener", "BatchLLm", "BatchJobQueue", "BatchJobRepository", "LLm"]
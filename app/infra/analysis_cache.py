@@ -0,0 +1,109 @@
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import pydantic
+
+logger = logging.getLogger(__name__)
+
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def normalize_transcript(transcript: str) -> str:
+    return " ".join(transcript.split())
+
+
+def build_cache_key(transcript: str, model: str, system_prompt: str, user_prompt_template: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model, system_prompt, user_prompt_template, normalize_transcript(transcript)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    In-process LRU cache of LLM analysis results with TTL expiry and a memory budget.
+
+    Entries are keyed by `build_cache_key`, so a change of model or prompt text never
+    serves a stale result.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[pydantic.BaseModel, float, int]]" = OrderedDict()
+        self._current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[pydantic.BaseModel]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if self._clock() >= expires_at:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: pydantic.BaseModel) -> None:
+        size = len(value.model_dump_json()) + len(key) + ENTRY_OVERHEAD_BYTES
+        if size > self._max_bytes:
+            logger.warning(f"Analysis result of {size} bytes exceeds cache budget, not caching")
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, self._clock() + self._ttl_seconds, size)
+        self._current_bytes += size
+
+        while len(self._entries) > self._max_entries or self._current_bytes > self._max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._current_bytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._current_bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._current_bytes -= size
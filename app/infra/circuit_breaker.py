@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional, Type
+
+import openai
+import pydantic
+
+from app.domain.errors import CircuitOpenError, LLMRateLimitError, LLMServiceError, LLMTimeoutError
+from app.domain.ports import LLm
+from app.infra.llm_calls import complete, complete_async
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Whether an error says the LLM service is unhealthy: a timeout, a connection error or a
+    5xx, raw or wrapped by the adapters. Rate limits, 4xx responses and errors of our own
+    (unparseable output, refusals) do not count.
+    """
+    if isinstance(error, LLMServiceError):
+        error = error.__cause__
+    if isinstance(error, (LLMTimeoutError, asyncio.TimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    if isinstance(error, LLMServiceError):
+        error = error.__cause__
+    return isinstance(error, (LLMRateLimitError, openai.RateLimitError))
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for LLM calls.
+
+    While closed, the outcomes of the last `window_size` calls are kept; a call fails if it
+    raised an upstream error or took longer than `slow_call_seconds`. Once at least
+    `min_calls` are recorded and the failure rate reaches `failure_rate_threshold`, the
+    circuit opens and calls are rejected for `open_seconds`. It then half-opens and lets
+    `half_open_max_calls` probes through: if they all succeed the circuit closes, and the
+    first failing probe opens it again. Calls that end without a verdict on upstream
+    health (rate limited or cancelled) are `release`d instead of recorded.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_seconds = slow_call_seconds
+        self._window: Deque[bool] = deque(maxlen=window_size)
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state is CircuitState.OPEN
+
+    def allow(self) -> bool:
+        """Admits a call, or rejects it while open or when all half-open probes are taken."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes_in_flight < self._half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, failed: bool, latency: Optional[float] = None, probe: bool = False) -> None:
+        failed = failed or (latency is not None and latency > self._slow_call_seconds)
+        if probe:
+            if self._state is not CircuitState.HALF_OPEN:
+                return
+            self._probes_in_flight -= 1
+            if failed:
+                self._open()
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self._half_open_max_calls:
+                self._transition(CircuitState.CLOSED)
+            return
+
+        if self._state is not CircuitState.CLOSED:
+            return
+        self._window.append(failed)
+        if len(self._window) >= self._min_calls and self.failure_rate >= self._failure_rate_threshold:
+            self._open()
+
+    def release(self, probe: bool = False) -> None:
+        """Frees the slot of an admitted call without recording an outcome."""
+        if probe and self._state is CircuitState.HALF_OPEN:
+            self._probes_in_flight -= 1
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self._window) / len(self._window) if self._window else 0.0
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "state": self.state.value,
+            "failure_rate": round(self.failure_rate, 3),
+            "window_calls": len(self._window),
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
+
+    def _open(self) -> None:
+        logger.warning(f"LLM circuit breaker opened (failure rate {self.failure_rate:.2f}), failing fast for {self._open_seconds}s")
+        self.times_opened += 1
+        self._opened_at = self._clock()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state is not CircuitState.OPEN:
+            logger.info(f"LLM circuit breaker {state.value}")
+        self._state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._window.clear()
+
+
+class CircuitBreakerLLM(LLm):
+    """
+    Fails fast with `CircuitOpenError`, or calls `fallback`, while the circuit is open.
+    Wrap it in the retrying layer, not the other way around, so every attempt is recorded.
+    """
+
+    accepts_prompt_tokens = True
+
+    def __init__(self, inner: LLm, breaker: CircuitBreaker, fallback: Optional[LLm] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._inner = inner
+        self._breaker = breaker
+        self._fallback = fallback
+        self._clock = clock
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                       prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        probe = self._admit()
+        if probe is None:
+            return complete(self._fallback, system_prompt, user_prompt, dto, prompt_tokens)
+        start = self._clock()
+        try:
+            response = complete(self._inner, system_prompt, user_prompt, dto, prompt_tokens)
+        except Exception as e:
+            self._record_error(e, probe)
+            raise
+        self._breaker.record(False, self._clock() - start, probe=probe)
+        return response
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                                   prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        probe = self._admit()
+        if probe is None:
+            return await complete_async(self._fallback, system_prompt, user_prompt, dto, prompt_tokens)
+        start = self._clock()
+        try:
+            response = await complete_async(self._inner, system_prompt, user_prompt, dto, prompt_tokens)
+        except asyncio.CancelledError:
+            # A cancelled call says nothing about upstream health; just free a probe slot.
+            self._breaker.release(probe)
+            raise
+        except Exception as e:
+            self._record_error(e, probe)
+            raise
+        self._breaker.record(False, self._clock() - start, probe=probe)
+        return response
+
+    def _admit(self) -> Optional[bool]:
+        """Returns whether the call is a half-open probe, or None when it goes to the fallback."""
+        probe = self._breaker.state is CircuitState.HALF_OPEN
+        if self._breaker.allow():
+            return probe
+        if self._fallback is not None:
+            return None
+        raise CircuitOpenError()
+
+    def _record_error(self, error: Exception, probe: bool) -> None:
+        if is_rate_limited(error):
+            # The service answered, but a 429 does not show it has recovered either.
+            self._breaker.release(probe)
+        else:
+            self._breaker.record(is_upstream_failure(error), probe=probe)
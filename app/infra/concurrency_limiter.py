@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple, Type
+
+import openai
+import pydantic
+
+from app.domain.errors import LLMRateLimitError, LLMTimeoutError, LocalRateLimitError
+from app.domain.ports import LLm
+from app.infra.latency_model import LatencyModel
+from app.infra.rate_limiter import RateLimiter, estimate_tokens
+from app.infra.token_counter import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_ERRORS = (
+    LLMRateLimitError,
+    LLMTimeoutError,
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    asyncio.TimeoutError,
+)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Process-wide concurrency limit for LLM calls, tuned at runtime with AIMD.
+
+    Every successful call below the latency threshold grows the limit by roughly one
+    slot per round trip; a rate-limit, timeout or slow call shrinks it multiplicatively.
+    Decreases are rate limited by `decrease_cooldown` so that one burst of 429s only
+    backs off once.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 5,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_threshold: float = 30.0,
+        backoff_ratio: float = 0.5,
+        decrease_cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._latency_threshold = latency_threshold
+        self._backoff_ratio = backoff_ratio
+        self._decrease_cooldown = decrease_cooldown
+        self._clock = clock
+        self._last_decrease: Optional[float] = None
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.successes = 0
+        self.overloads = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self._min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before cancellation; give it back.
+                self._in_flight -= 1
+                self._wake_waiters()
+            elif waiter in self._waiters:
+                # A release may already have popped the cancelled waiter.
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        self._in_flight -= 1
+
+        if overloaded or (latency is not None and latency > self._latency_threshold):
+            self.overloads += 1
+            self._decrease()
+        elif latency is not None:
+            self.successes += 1
+            self._limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+
+        self._wake_waiters()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "min_limit": self._min_limit,
+            "max_limit": self._max_limit,
+            "successes": self.successes,
+            "overloads": self.overloads,
+        }
+
+    def _decrease(self) -> None:
+        now = self._clock()
+        if self._last_decrease is not None and now - self._last_decrease < self._decrease_cooldown:
+            return
+        self._last_decrease = now
+        previous = self.limit
+        self._limit = max(float(self._min_limit), self._limit * self._backoff_ratio)
+        logger.warning(f"LLM concurrency limit decreased from {previous} to {self.limit}")
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+
+
+class ConcurrencyLimitedLLM(LLm):
+    """
+    Runs completions through `limiter`. With a `rate_limiter`, the rate limit budget is
+    acquired before the concurrency slot so a throttled call never holds a slot while it
+    waits, and the charge is corrected with the usage the provider reports. The prompt is
+    counted only when no `prompt_tokens` count is passed down.
+    """
+
+    accepts_prompt_tokens = True
+
+    def __init__(self, inner: LLm, limiter: AdaptiveConcurrencyLimiter, latency_model: Optional[LatencyModel] = None,
+                 token_counter: Optional[TokenCounter] = None, rate_limiter: Optional[RateLimiter] = None):
+        self._inner = inner
+        self._limiter = limiter
+        self._latency_model = latency_model
+        self._token_counter = token_counter
+        self._rate_limiter = rate_limiter
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                       prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        if self._rate_limiter is None:
+            return self._inner.run_completion(system_prompt, user_prompt, dto)
+        if prompt_tokens is None:
+            prompt_tokens = self._count_tokens(system_prompt, user_prompt)
+        charged_tokens = self._rate_limiter.acquire_blocking(prompt_tokens)
+        if hasattr(self._inner, 'run_completion_with_usage'):
+            response, usage = self._inner.run_completion_with_usage(system_prompt, user_prompt, dto)
+            self._rate_limiter.record_usage(charged_tokens, usage)
+            return response
+        return self._inner.run_completion(system_prompt, user_prompt, dto)
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                                   prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        charged_tokens = None
+        if self._rate_limiter is not None:
+            if prompt_tokens is None:
+                prompt_tokens = self._count_tokens(system_prompt, user_prompt)
+            charged_tokens = await self._rate_limiter.acquire(prompt_tokens)
+
+        await self._limiter.acquire()
+        start = time.monotonic()
+        latency = None
+        overloaded = False
+        try:
+            response, usage = await self._call_async(system_prompt, user_prompt, dto)
+            latency = time.monotonic() - start
+            if charged_tokens is not None:
+                self._rate_limiter.record_usage(charged_tokens, usage)
+            if self._latency_model is not None:
+                if prompt_tokens is None:
+                    prompt_tokens = self._count_tokens(system_prompt, user_prompt)
+                self._latency_model.record(prompt_tokens, latency)
+            return response
+        except OVERLOAD_ERRORS as e:
+            # A budget rejection by our own rate limiter says nothing about the provider's load.
+            overloaded = not isinstance(e, LocalRateLimitError)
+            raise
+        finally:
+            self._limiter.release(latency=latency, overloaded=overloaded)
+
+    def _count_tokens(self, system_prompt: str, user_prompt: str) -> int:
+        if self._token_counter is None:
+            return estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        return self._token_counter.count_messages(system_prompt, user_prompt)
+
+    async def _call_async(self, system_prompt: str, user_prompt: str,
+                          dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        if hasattr(self._inner, 'run_completion_with_usage_async'):
+            return await self._inner.run_completion_with_usage_async(system_prompt, user_prompt, dto)
+        if hasattr(self._inner, 'run_completion_async'):
+            return await self._inner.run_completion_async(system_prompt, user_prompt, dto), None
+        return self._inner.run_completion(system_prompt, user_prompt, dto), None
@@ -1,11 +1,40 @@
 from functools import lru_cache
+from typing import Dict, List, Optional
 
-from app.configurations import EnvConfigs
+from app.configurations import EnvConfigs, RepositoryConfigs
+from app.domain.ports import AnalysisRepository, LLm
+from app.infra.analysis_cache import AnalysisCache
+from app.infra.circuit_breaker import CircuitBreaker, CircuitBreakerLLM
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitedLLM
+from app.infra.hedging import HedgingPolicy
+from app.infra.job_worker_pool import BatchJobWorkerPool
+from app.infra.latency_model import LatencyModel
+from app.infra.memory_job_repository import MemoryBatchJobRepository
 from app.infra.memory_repository import MemoryRepository
-from app.adapters.openai import OpenAIAdapter
+from app.infra.rate_limiter import RateLimiter
+from app.infra.near_duplicate_index import NearDuplicateIndex
+from app.infra.openai_adapter_impl import OpenAIAdapterImpl
+from app.infra.search_index import InvertedIndex
+from app.infra.shared_memory_repository import SharedMmapRepository
+from app.infra.retry import RetryingLLM, RetryPolicy
+from app.infra.single_flight import SingleFlight
+from app.infra.sqlite_job_repository import SqliteBatchJobRepository
+from app.infra.sqlite_repository import SqliteRepository
+from app.infra.token_counter import TokenCounter
+from app.infra.transcript_compaction import DEFAULT_NOISE_PATTERNS, TranscriptPreprocessor, default_preprocessor
+from app.ports.job_repository import BatchJobRepository
+from app.adapters.llm_pool import LLMClientPool, LLMPoolMember
+from app.adapters.model_router import ModelRoute, ModelRouter
+from app.adapters.openai_batch import OpenAIBatchAdapter
 from app.use_cases.analyze_batch import AnalyzeBatchUseCase
+from app.use_cases.analyze_long_transcript import AnalyzeLongTranscriptUseCase
 from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase
+from app.use_cases.bulk_analyze import BulkAnalyzeUseCase
+from app.use_cases.estimate_analysis import EstimateAnalysisUseCase
+from app.use_cases.batch_jobs import CancelBatchJobUseCase, GetBatchJobResultsUseCase, GetBatchJobUseCase, SubmitBatchJobUseCase
 from app.use_cases.get_analysis import GetAnalysisUseCase
+from app.use_cases.list_analyses import ListAnalysesUseCase
+from app.use_cases.search_analyses import SearchAnalysesUseCase
 
 
 @lru_cache()
@@ -14,23 +43,263 @@ def get_config() -> EnvConfigs:
 
 
 @lru_cache()
-def get_repository() -> MemoryRepository:
-    return MemoryRepository()
+def get_repository_config() -> RepositoryConfigs:
+    return RepositoryConfigs()
 
 
 @lru_cache()
-def get_llm_adapter() -> OpenAIAdapter:
+def get_search_index() -> InvertedIndex:
+    return InvertedIndex()
+
+
+@lru_cache()
+def get_repository() -> AnalysisRepository:
+    repository = _create_repository()
+    if repository.process_local:
+        repository.add_listener(get_search_index())
+    return repository
+
+
+def _create_repository() -> AnalysisRepository:
+    config = get_repository_config()
+    if config.REPOSITORY_BACKEND == "sqlite":
+        return SqliteRepository(
+            path=config.REPOSITORY_SQLITE_PATH,
+            batch_size=config.REPOSITORY_BATCH_SIZE,
+            flush_interval=config.REPOSITORY_FLUSH_INTERVAL_SECONDS
+        )
+    if config.REPOSITORY_BACKEND == "shared":
+        return SharedMmapRepository(
+            path=config.REPOSITORY_SHARED_PATH,
+            capacity=config.REPOSITORY_SHARED_CAPACITY
+        )
+    return MemoryRepository(
+        max_entries=config.REPOSITORY_MAX_ENTRIES,
+        max_bytes=config.REPOSITORY_MAX_BYTES,
+        ttl_seconds=config.REPOSITORY_TTL_SECONDS
+    )
+
+
+@lru_cache()
+def get_analysis_cache() -> AnalysisCache:
+    config = get_config()
+    return AnalysisCache(
+        max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES,
+        max_bytes=config.ANALYSIS_CACHE_MAX_BYTES,
+        ttl_seconds=config.ANALYSIS_CACHE_TTL_SECONDS
+    )
+
+
+@lru_cache()
+def get_near_duplicate_index() -> NearDuplicateIndex:
+    config = get_config()
+    return NearDuplicateIndex(
+        threshold=config.NEAR_DUPLICATE_THRESHOLD,
+        capacity=config.NEAR_DUPLICATE_CAPACITY
+    )
+
+
+@lru_cache()
+def get_transcript_preprocessor() -> TranscriptPreprocessor:
+    config = get_config()
+    return default_preprocessor(
+        noise_patterns=config.TRANSCRIPT_NOISE_PATTERNS if config.TRANSCRIPT_NOISE_PATTERNS is not None else DEFAULT_NOISE_PATTERNS,
+        token_counter=get_token_counter()
+    )
+
+
+@lru_cache()
+def get_single_flight() -> SingleFlight:
+    return SingleFlight()
+
+
+@lru_cache()
+def get_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    return _create_concurrency_limiter()
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    return _create_rate_limiter()
+
+
+def _create_concurrency_limiter() -> AdaptiveConcurrencyLimiter:
+    config = get_config()
+    return AdaptiveConcurrencyLimiter(
+        initial_limit=config.LLM_CONCURRENCY_INITIAL,
+        min_limit=config.LLM_CONCURRENCY_MIN,
+        max_limit=config.LLM_CONCURRENCY_MAX,
+        latency_threshold=config.LLM_LATENCY_THRESHOLD_SECONDS
+    )
+
+
+def _create_rate_limiter() -> RateLimiter:
+    config = get_config()
+    return RateLimiter(
+        requests_per_minute=config.OPENAI_RPM_LIMIT,
+        tokens_per_minute=config.OPENAI_TPM_LIMIT,
+        max_wait_seconds=config.OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS,
+        expected_output_tokens=config.OPENAI_EXPECTED_OUTPUT_TOKENS
+    )
+
+
+@lru_cache()
+def get_circuit_breaker() -> CircuitBreaker:
+    config = get_config()
+    return CircuitBreaker(
+        failure_rate_threshold=config.LLM_CIRCUIT_FAILURE_RATE,
+        slow_call_seconds=config.LLM_CIRCUIT_SLOW_CALL_SECONDS,
+        window_size=config.LLM_CIRCUIT_WINDOW_SIZE,
+        min_calls=config.LLM_CIRCUIT_MIN_CALLS,
+        open_seconds=config.LLM_CIRCUIT_OPEN_SECONDS,
+        half_open_max_calls=config.LLM_CIRCUIT_HALF_OPEN_CALLS
+    )
+
+
+@lru_cache()
+def get_retry_policy() -> RetryPolicy:
+    config = get_config()
+    return RetryPolicy(
+        max_attempts=config.OPENAI_RETRY_MAX_ATTEMPTS,
+        base_delay=config.OPENAI_RETRY_BASE_DELAY_SECONDS,
+        max_delay=config.OPENAI_RETRY_MAX_DELAY_SECONDS,
+        deadline_seconds=config.OPENAI_RETRY_DEADLINE_SECONDS
+    )
+
+
+@lru_cache()
+def get_hedging_policy() -> HedgingPolicy:
     config = get_config()
-    return OpenAIAdapter(
-        api_key=config.OPENAI_API_KEY,
-        model=config.OPENAI_MODEL
+    return HedgingPolicy(
+        percentile=config.OPENAI_HEDGING_PERCENTILE,
+        budget_ratio=config.OPENAI_HEDGING_BUDGET_RATIO,
+        min_samples=config.OPENAI_HEDGING_MIN_SAMPLES
     )
 
 
+@lru_cache()
+def get_token_counter() -> TokenCounter:
+    return TokenCounter(get_config().OPENAI_MODEL)
+
+
+@lru_cache()
+def get_latency_model() -> LatencyModel:
+    return LatencyModel()
+
+
+@lru_cache()
+def get_llm_adapter() -> LLm:
+    # Retries wrap everything else so backoff holds no concurrency slot and AIMD and the breaker see every attempt.
+    return RetryingLLM(get_model_router() or _create_primary_llm(), get_retry_policy(), get_token_counter())
+
+
+@lru_cache()
+def get_primary_adapter() -> LLm:
+    return _create_model_adapter(
+        get_config().OPENAI_MODEL, get_concurrency_limiter(), get_rate_limiter(), get_token_counter(), get_latency_model()
+    )
+
+
+def _create_primary_llm() -> LLm:
+    # The breaker sits outside the concurrency limiter so an open circuit never waits for a slot.
+    llm = get_primary_adapter()
+    if get_config().LLM_CIRCUIT_BREAKER_ENABLED:
+        return CircuitBreakerLLM(llm, get_circuit_breaker())
+    return llm
+
+
+def get_llm_pool() -> Optional[LLMClientPool]:
+    adapter = get_primary_adapter()
+    return adapter if isinstance(adapter, LLMClientPool) else None
+
+
+@lru_cache()
+def get_model_router() -> Optional[ModelRouter]:
+    config = get_config()
+    if not config.OPENAI_SMALL_MODEL and not config.OPENAI_FALLBACK_MODEL:
+        return None
+    routes = [ModelRoute(
+        config.OPENAI_MODEL,
+        _create_primary_llm(),
+        limiter=get_llm_pool() or get_concurrency_limiter(),
+        rate_limiter=get_llm_pool() or get_rate_limiter(),
+        breaker=get_circuit_breaker() if config.LLM_CIRCUIT_BREAKER_ENABLED else None
+    )]
+    if config.OPENAI_SMALL_MODEL:
+        routes.insert(0, _create_secondary_route(config.OPENAI_SMALL_MODEL, config.OPENAI_SMALL_MODEL_MAX_TOKENS))
+    fallback = _create_secondary_route(config.OPENAI_FALLBACK_MODEL) if config.OPENAI_FALLBACK_MODEL else None
+    return ModelRouter(routes, get_token_counter(), fallback=fallback, max_queue_depth=config.OPENAI_FALLBACK_QUEUE_DEPTH)
+
+
+def _create_secondary_route(model: str, max_prompt_tokens: int = 0) -> ModelRoute:
+    # Provider quotas are per model, so every model gets its own rate and concurrency limits.
+    rate_limiter = _create_rate_limiter()
+    limiter = _create_concurrency_limiter()
+    adapter = _create_model_adapter(model, limiter, rate_limiter, TokenCounter(model))
+    return ModelRoute(
+        model,
+        adapter,
+        max_prompt_tokens=max_prompt_tokens,
+        limiter=adapter if isinstance(adapter, LLMClientPool) else limiter,
+        rate_limiter=adapter if isinstance(adapter, LLMClientPool) else rate_limiter
+    )
+
+
+def _llm_endpoints() -> List[Dict[str, str]]:
+    config = get_config()
+    primary = {"name": "primary", "api_key": config.OPENAI_API_KEY, "base_url": config.OPENAI_BASE_URL}
+    return [primary] + list(config.OPENAI_POOL_ENDPOINTS or [])
+
+
+def _create_model_adapter(model: str, limiter: AdaptiveConcurrencyLimiter, rate_limiter: RateLimiter,
+                          token_counter: TokenCounter, latency_model: Optional[LatencyModel] = None) -> LLm:
+    """A rate and concurrency limited OpenAIAdapterImpl for `model`, or a pool of them for several endpoints."""
+    config = get_config()
+    endpoints = _llm_endpoints()
+    members = []
+    for position, endpoint in enumerate(endpoints):
+        # The first endpoint uses the given limiters; every other key has a quota, and so limits, of its own.
+        member_limiter = limiter if position == 0 else _create_concurrency_limiter()
+        member_rate_limiter = rate_limiter if position == 0 else _create_rate_limiter()
+        adapter = OpenAIAdapterImpl(
+            api_key=endpoint.get("api_key") or config.OPENAI_API_KEY,
+            model=model,
+            timeout=config.OPENAI_TIMEOUT_SECONDS,
+            hedging=get_hedging_policy() if config.OPENAI_HEDGING_ENABLED else None,
+            base_url=endpoint.get("base_url") or None,
+            max_retries=0
+        )
+        llm = ConcurrencyLimitedLLM(adapter, member_limiter, latency_model, token_counter, member_rate_limiter)
+        members.append(LLMPoolMember(endpoint.get("name") or f"endpoint-{position}", llm, member_rate_limiter, member_limiter))
+    if len(members) == 1:
+        return members[0].llm
+    return LLMClientPool(members, eject_seconds=config.OPENAI_POOL_EJECT_SECONDS)
+
+
 def get_analyze_transcript_use_case() -> AnalyzeTranscriptUseCase:
     return AnalyzeTranscriptUseCase(
         llm_port=get_llm_adapter(),
-        repository=get_repository()
+        repository=get_repository(),
+        cache=get_analysis_cache(),
+        model_name=get_config().OPENAI_MODEL,
+        single_flight=get_single_flight(),
+        token_counter=get_token_counter(),
+        max_tokens=get_config().MAX_TRANSCRIPT_TOKENS,
+        near_duplicates=get_near_duplicate_index() if get_config().NEAR_DUPLICATE_ENABLED else None,
+        preprocessor=get_transcript_preprocessor() if get_config().TRANSCRIPT_COMPACTION_ENABLED else None
+    )
+
+
+def get_estimate_analysis_use_case() -> EstimateAnalysisUseCase:
+    config = get_config()
+    return EstimateAnalysisUseCase(
+        token_counter=get_token_counter(),
+        latency_model=get_latency_model(),
+        model_name=config.OPENAI_MODEL,
+        expected_output_tokens=config.OPENAI_EXPECTED_OUTPUT_TOKENS,
+        max_tokens=config.MAX_TRANSCRIPT_TOKENS,
+        limiter=get_concurrency_limiter(),
+        preprocessor=get_transcript_preprocessor() if config.TRANSCRIPT_COMPACTION_ENABLED else None
     )
 
 
@@ -38,8 +307,88 @@ def get_get_analysis_use_case() -> GetAnalysisUseCase:
     return GetAnalysisUseCase(repository=get_repository())
 
 
+def get_list_analyses_use_case() -> ListAnalysesUseCase:
+    return ListAnalysesUseCase(repository=get_repository())
+
+
+def get_search_analyses_use_case() -> SearchAnalysesUseCase:
+    repository = get_repository()
+    # A per-process index can't follow writes made by other workers, so search is off for shared stores.
+    return SearchAnalysesUseCase(index=get_search_index() if repository.process_local else None, repository=repository)
+
+
 def get_analyze_batch_use_case() -> AnalyzeBatchUseCase:
     return AnalyzeBatchUseCase(
         llm_port=get_llm_adapter(),
-        repository=get_repository()
-    )
\ No newline at end of file
+        repository=get_repository(),
+        analyze_use_case=get_analyze_transcript_use_case(),
+        pack_token_budget=get_config().BATCH_PACK_TOKEN_BUDGET,
+        pack_max_items=get_config().BATCH_PACK_MAX_ITEMS,
+        token_counter=get_token_counter(),
+        model_name=get_config().OPENAI_MODEL
+    )
+
+
+def get_analyze_long_transcript_use_case() -> AnalyzeLongTranscriptUseCase:
+    config = get_config()
+    return AnalyzeLongTranscriptUseCase(
+        llm_port=get_llm_adapter(),
+        repository=get_repository(),
+        chunk_tokens=config.LONG_TRANSCRIPT_CHUNK_TOKENS,
+        overlap_turns=config.LONG_TRANSCRIPT_OVERLAP_TURNS,
+        reduce_tokens=config.LONG_TRANSCRIPT_REDUCE_TOKENS,
+        max_size=config.LONG_TRANSCRIPT_MAX_BYTES,
+        model_name=config.OPENAI_MODEL,
+        token_counter=get_token_counter()
+    )
+
+
+@lru_cache()
+def get_job_repository() -> BatchJobRepository:
+    config = get_config()
+    if config.JOB_SQLITE_PATH:
+        return SqliteBatchJobRepository(config.JOB_SQLITE_PATH)
+    return MemoryBatchJobRepository(retention_seconds=config.JOB_RETENTION_SECONDS)
+
+
+@lru_cache()
+def get_job_worker_pool() -> BatchJobWorkerPool:
+    return BatchJobWorkerPool(
+        repository=get_job_repository(),
+        analyze_use_case=get_analyze_transcript_use_case(),
+        worker_count=get_config().JOB_WORKER_COUNT,
+        claim_seconds=get_config().JOB_CLAIM_SECONDS
+    )
+
+
+def get_submit_batch_job_use_case() -> SubmitBatchJobUseCase:
+    return SubmitBatchJobUseCase(repository=get_job_repository(), worker_pool=get_job_worker_pool())
+
+
+def get_get_batch_job_use_case() -> GetBatchJobUseCase:
+    return GetBatchJobUseCase(repository=get_job_repository())
+
+
+def get_get_batch_job_results_use_case() -> GetBatchJobResultsUseCase:
+    return GetBatchJobResultsUseCase(repository=get_job_repository())
+
+
+def get_cancel_batch_job_use_case() -> CancelBatchJobUseCase:
+    return CancelBatchJobUseCase(repository=get_job_repository())
+
+
+@lru_cache()
+def get_batch_llm_adapter() -> OpenAIBatchAdapter:
+    config = get_config()
+    return OpenAIBatchAdapter(api_key=config.OPENAI_API_KEY, base_url=config.OPENAI_BASE_URL or None)
+
+
+def get_bulk_analyze_use_case() -> BulkAnalyzeUseCase:
+    config = get_config()
+    return BulkAnalyzeUseCase(
+        batch_llm=get_batch_llm_adapter(),
+        repository=get_repository(),
+        model_name=config.OPENAI_MODEL,
+        work_dir=config.BULK_WORK_DIR,
+        poll_interval=config.BULK_POLL_INTERVAL_SECONDS
+    )
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgingPolicy:
+    """
+    Fires a duplicate request when the first one is slower than a percentile of recent
+    latencies, returns whichever answers first and cancels the other.
+
+    Hedges are capped at `budget_ratio` of all requests so a slow provider never sees
+    more than that fraction of extra load. No hedging happens until `min_samples`
+    latencies have been observed.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        budget_ratio: float = 0.05,
+        min_samples: int = 20,
+        window_size: int = 1000,
+        min_delay: float = 0.5,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._percentile = percentile
+        self._budget_ratio = budget_ratio
+        self._min_samples = min_samples
+        self._min_delay = min_delay
+        self._clock = clock
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        if len(self._latencies) < self._min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self._percentile * len(ordered)) - 1)
+        return max(self._min_delay, ordered[index])
+
+    def record_latency(self, latency: float) -> None:
+        self._latencies.append(latency)
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.requests += 1
+        started_at = self._clock()
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(fn())
+        pending = {primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self._budget_allows():
+                    self.hedges += 1
+                    logger.info(f"Hedging LLM request after {delay:.2f}s")
+                    pending.add(asyncio.ensure_future(fn()))
+
+            first_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        self.record_latency(self._clock() - started_at)
+                        return task.result()
+                    first_error = first_error or error
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+            if not primary.done():
+                primary.cancel()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_ratio": self.hedges / self.requests if self.requests else 0.0,
+            "budget_ratio": self._budget_ratio,
+            "hedge_delay": self.hedge_delay(),
+            "samples": len(self._latencies),
+        }
+
+    def _budget_allows(self) -> bool:
+        return self.hedges + 1 <= self._budget_ratio * self.requests
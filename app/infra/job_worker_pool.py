@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.domain.models import BatchJobStatus, TranscriptAnalysis
+from app.ports.job_queue import BatchJobQueue
+from app.ports.job_repository import BatchJobRepository
+from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class BatchJobWorkerPool(BatchJobQueue):
+    """
+    Fixed pool of asyncio workers draining a queue of (job_id, item_index) entries
+    through `AnalyzeTranscriptUseCase`.
+
+    Only item references are queued; transcripts are loaded from the job repository
+    when a worker claims the item. The claim is atomic and holds for `claim_seconds`, so
+    an item queued by several pools (each process recovers pending items on start) still
+    runs once. Every `claim_seconds` the pool also queues pending items nobody holds,
+    which picks up the work of a process that died mid-item. LLM concurrency across
+    workers is still bounded by the limiter around the LLM port.
+    """
+
+    def __init__(self, repository: BatchJobRepository, analyze_use_case: AnalyzeTranscriptUseCase,
+                 worker_count: int = 4, claim_seconds: float = 600.0):
+        self._repository = repository
+        self._analyze_use_case = analyze_use_case
+        self._worker_count = worker_count
+        self._claim_seconds = claim_seconds
+        self._queue: "asyncio.Queue[Tuple[UUID, int]]" = asyncio.Queue()
+        self._queued: Set[Tuple[UUID, int]] = set()
+        self._workers: List[asyncio.Task] = []
+        self.processed = 0
+        self.skipped = 0
+
+    async def start(self) -> None:
+        if self._workers:
+            return
+        recovered = await self._recover()
+        if recovered:
+            logger.info(f"Recovered {recovered} pending batch job items")
+        self._workers = [asyncio.create_task(self._run_worker()) for _ in range(self._worker_count)]
+        self._workers.append(asyncio.create_task(self._run_recovery()))
+        logger.info(f"Started {self._worker_count} batch job workers")
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def enqueue(self, job_id: UUID, item_count: int) -> None:
+        for index in range(item_count):
+            self._put(job_id, index)
+
+    async def join(self) -> None:
+        await self._queue.join()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self._worker_count if self._workers else 0,
+            "queue_depth": self._queue.qsize(),
+            "processed": self.processed,
+            "skipped": self.skipped,
+        }
+
+    def _put(self, job_id: UUID, index: int) -> None:
+        if (job_id, index) not in self._queued:
+            self._queued.add((job_id, index))
+            self._queue.put_nowait((job_id, index))
+
+    async def _recover(self) -> int:
+        pending = await self._repository.list_pending_items()
+        for job_id, index in pending:
+            self._put(job_id, index)
+        return len(pending)
+
+    async def _run_recovery(self) -> None:
+        while True:
+            await asyncio.sleep(self._claim_seconds)
+            try:
+                await self._recover()
+            except Exception as e:
+                logger.error(f"Batch job recovery failed: {str(e)}")
+
+    async def _run_worker(self) -> None:
+        while True:
+            job_id, index = await self._queue.get()
+            self._queued.discard((job_id, index))
+            try:
+                await self._process(job_id, index)
+            except Exception as e:
+                logger.error(f"Batch job worker failed - job_id: {job_id}, index: {index}, error: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, job_id: UUID, index: int) -> None:
+        job = await self._repository.get_job(job_id)
+        if job is None or job.status in (BatchJobStatus.CANCELLED, BatchJobStatus.COMPLETED):
+            self.skipped += 1
+            return
+        if job.status == BatchJobStatus.PENDING:
+            await self._repository.update_job_status(job_id, BatchJobStatus.RUNNING)
+
+        item = await self._repository.claim_item(job_id, index, self._claim_seconds)
+        if item is None:
+            # Done already, or another worker (maybe in another process) holds it.
+            self.skipped += 1
+            return
+
+        analysis: Optional[TranscriptAnalysis] = None
+        error: Optional[str] = None
+        try:
+            analysis = await self._analyze_use_case.execute(item.transcript)
+        except Exception as e:
+            error = str(e)
+        job = await self._repository.record_item_result(job_id, index, analysis=analysis, error=error)
+        self.processed += 1
+        if job is not None and job.status == BatchJobStatus.COMPLETED:
+            logger.info(
+                f"Batch job completed - job_id: {job_id}, total: {job.total_count}, "
+                f"successful: {job.successful_count}"
+            )
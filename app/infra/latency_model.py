@@ -0,0 +1,52 @@
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+
+class LatencyModel:
+    """
+    Predicts LLM call latency from the prompt token count.
+
+    Fits `latency = intercept + slope * prompt_tokens` by least squares over a window of
+    recent successful calls. Until `min_samples` calls have been seen, or while all
+    prompts have the same size, the configured priors are used instead.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 500,
+        min_samples: int = 10,
+        prior_intercept: float = 2.0,
+        prior_seconds_per_token: float = 0.0005
+    ):
+        self._samples: Deque[Tuple[int, float]] = deque(maxlen=window_size)
+        self._min_samples = min_samples
+        self._prior_intercept = prior_intercept
+        self._prior_seconds_per_token = prior_seconds_per_token
+
+    def record(self, prompt_tokens: int, latency: float) -> None:
+        self._samples.append((prompt_tokens, latency))
+
+    def coefficients(self) -> Tuple[float, float]:
+        count = len(self._samples)
+        if count < self._min_samples:
+            return self._prior_intercept, self._prior_seconds_per_token
+        mean_x = sum(x for x, _ in self._samples) / count
+        mean_y = sum(y for _, y in self._samples) / count
+        variance = sum((x - mean_x) ** 2 for x, _ in self._samples)
+        if variance == 0:
+            return mean_y, 0.0
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in self._samples) / variance
+        slope = max(0.0, slope)
+        return max(0.0, mean_y - slope * mean_x), slope
+
+    def predict(self, prompt_tokens: int) -> float:
+        intercept, slope = self.coefficients()
+        return intercept + slope * prompt_tokens
+
+    def stats(self) -> Dict[str, float]:
+        intercept, slope = self.coefficients()
+        return {
+            "samples": len(self._samples),
+            "intercept_seconds": intercept,
+            "seconds_per_prompt_token": slope,
+        }
@@ -0,0 +1,30 @@
+from typing import Any, Dict, Optional, Type
+
+import pydantic
+
+from app.domain.ports import LLm
+
+
+def token_kwargs(llm: LLm, prompt_tokens: Optional[int]) -> Dict[str, Any]:
+    # Only our own wrappers take a precomputed count; adapters and test doubles get the plain signature.
+    if prompt_tokens is None or getattr(llm, "accepts_prompt_tokens", False) is not True:
+        return {}
+    return {"prompt_tokens": prompt_tokens}
+
+
+def complete(llm: LLm, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+             prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+    return llm.run_completion(system_prompt, user_prompt, dto, **token_kwargs(llm, prompt_tokens))
+
+
+async def complete_async(llm: LLm, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                         prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+    """
+    Runs a completion on `llm`, natively async when it can be, handing `prompt_tokens`
+    down to wrappers that set `accepts_prompt_tokens` so the prompt is counted only once
+    per call however many layers look at it.
+    """
+    kwargs = token_kwargs(llm, prompt_tokens)
+    if hasattr(llm, 'run_completion_async'):
+        return await llm.run_completion_async(system_prompt, user_prompt, dto, **kwargs)
+    return llm.run_completion(system_prompt, user_prompt, dto, **kwargs)
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+from typing import Dict, Type
+from uuid import uuid4
+
+import pydantic
+
+from app.domain.errors import BulkBatchFailedError
+from app.domain.models import BulkBatchStatus
+from app.ports.batch_llm import BatchLLm
+from app.ports.llm import LLm
+
+logger = logging.getLogger(__name__)
+
+
+class LocalFileBatchLLm(BatchLLm):
+    """
+    File-based stand-in for a provider batch API, for tests and local runs.
+
+    Request lines are answered one by one through a regular `LLm` port in a background
+    task, and the output file follows the provider's batch output format.
+    """
+
+    def __init__(self, llm: LLm, dto: Type[pydantic.BaseModel], work_dir: str):
+        self._llm = llm
+        self._dto = dto
+        self._work_dir = work_dir
+        self._statuses: Dict[str, BulkBatchStatus] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        os.makedirs(work_dir, exist_ok=True)
+
+    async def submit(self, request_file: str) -> str:
+        batch_id = f"batch_{uuid4().hex}"
+        self._statuses[batch_id] = BulkBatchStatus.IN_PROGRESS
+        self._tasks[batch_id] = asyncio.create_task(self._process(batch_id, request_file))
+        return batch_id
+
+    async def get_status(self, batch_id: str) -> BulkBatchStatus:
+        return self._statuses[batch_id]
+
+    async def download_results(self, batch_id: str, destination: str) -> None:
+        if self._statuses.get(batch_id) != BulkBatchStatus.COMPLETED:
+            raise BulkBatchFailedError(batch_id, str(self._statuses.get(batch_id)))
+        await asyncio.to_thread(shutil.copyfile, self._output_path(batch_id), destination)
+
+    async def _process(self, batch_id: str, request_file: str) -> None:
+        try:
+            with open(request_file, encoding="utf-8") as requests, \
+                    open(self._output_path(batch_id), "w", encoding="utf-8") as output:
+                for line in requests:
+                    if line.strip():
+                        output.write(json.dumps(await self._answer(json.loads(line))) + "\n")
+            self._statuses[batch_id] = BulkBatchStatus.COMPLETED
+        except Exception as e:
+            logger.error(f"Local batch {batch_id} failed: {str(e)}")
+            self._statuses[batch_id] = BulkBatchStatus.FAILED
+
+    async def _answer(self, request: dict) -> dict:
+        messages = {message["role"]: message["content"] for message in request["body"]["messages"]}
+        result = {"id": f"batch_req_{uuid4().hex}", "custom_id": request["custom_id"], "response": None, "error": None}
+        try:
+            parsed = await self._llm.run_completion_async(messages["system"], messages["user"], self._dto)
+        except Exception as e:
+            result["error"] = {"code": type(e).__name__, "message": str(e)}
+            return result
+        result["response"] = {
+            "status_code": 200,
+            "body": {"choices": [{"index": 0, "message": {"role": "assistant", "content": parsed.model_dump_json()}}]},
+        }
+        return result
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self._work_dir, f"{batch_id}_output.jsonl")
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.models import BatchJob, BatchJobItem, BatchJobItemStatus, BatchJobStatus, TranscriptAnalysis
+from app.ports.job_repository import BatchJobRepository
+
+TERMINAL_STATUSES = (BatchJobStatus.COMPLETED, BatchJobStatus.CANCELLED)
+
+
+class MemoryBatchJobRepository(BatchJobRepository):
+    """
+    In-process job store. Completed and cancelled jobs are dropped `retention_seconds`
+    after they finish, so the store does not grow with every job ever submitted; a
+    `retention_seconds` of 0 keeps them for the life of the process.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time, retention_seconds: float = 0.0):
+        self._jobs: Dict[UUID, BatchJob] = {}
+        self._items: Dict[UUID, List[BatchJobItem]] = {}
+        # (job_id, index) -> time the worker's lease on the item runs out.
+        self._claims: Dict[Tuple[UUID, int], float] = {}
+        # job_id -> time the job finished, in finishing order, so expired jobs are at the front.
+        self._finished: Dict[UUID, float] = {}
+        self._clock = clock
+        self._retention_seconds = retention_seconds
+        self._lock = asyncio.Lock()
+
+    async def create_job(self, job: BatchJob, transcripts: List[str]) -> None:
+        async with self._lock:
+            self._expire()
+            self._jobs[job.id] = job
+            self._items[job.id] = [
+                BatchJobItem(job_id=job.id, index=index, transcript=transcript)
+                for index, transcript in enumerate(transcripts)
+            ]
+
+    async def get_job(self, job_id: UUID) -> Optional[BatchJob]:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    async def update_job_status(self, job_id: UUID, status: BatchJobStatus) -> Optional[BatchJob]:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status not in TERMINAL_STATUSES:
+                job.status = status
+                job.updated_at = datetime.now(timezone.utc)
+                self._mark_finished(job)
+            return job.model_copy()
+
+    async def get_item(self, job_id: UUID, index: int) -> Optional[BatchJobItem]:
+        async with self._lock:
+            items = self._items.get(job_id)
+            if items is None or not 0 <= index < len(items):
+                return None
+            return items[index].model_copy()
+
+    async def claim_item(self, job_id: UUID, index: int, lease_seconds: float) -> Optional[BatchJobItem]:
+        async with self._lock:
+            items = self._items.get(job_id)
+            if items is None or not 0 <= index < len(items) or items[index].status != BatchJobItemStatus.PENDING:
+                return None
+            now = self._clock()
+            if self._claims.get((job_id, index), 0.0) > now:
+                return None
+            self._claims[(job_id, index)] = now + lease_seconds
+            return items[index].model_copy()
+
+    async def record_item_result(self, job_id: UUID, index: int, analysis: Optional[TranscriptAnalysis] = None,
+                                 error: Optional[str] = None) -> Optional[BatchJob]:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            item = self._items[job_id][index]
+            if item.status != BatchJobItemStatus.PENDING:
+                return job.model_copy()
+
+            self._claims.pop((job_id, index), None)
+            item.analysis = analysis
+            item.error = error
+            item.status = BatchJobItemStatus.SUCCEEDED if analysis is not None else BatchJobItemStatus.FAILED
+            job.completed_count += 1
+            if analysis is not None:
+                job.successful_count += 1
+            else:
+                job.failed_count += 1
+            if job.completed_count == job.total_count and job.status != BatchJobStatus.CANCELLED:
+                job.status = BatchJobStatus.COMPLETED
+            job.updated_at = datetime.now(timezone.utc)
+            self._mark_finished(job)
+            return job.model_copy()
+
+    async def list_items(self, job_id: UUID, offset: int, limit: int) -> List[BatchJobItem]:
+        async with self._lock:
+            items = self._items.get(job_id, [])
+            return [item.model_copy() for item in items[offset:offset + limit]]
+
+    async def list_pending_items(self) -> List[Tuple[UUID, int]]:
+        async with self._lock:
+            self._expire()
+            now = self._clock()
+            return [
+                (job_id, item.index)
+                for job_id, items in self._items.items()
+                if self._jobs[job_id].status not in TERMINAL_STATUSES
+                for item in items
+                if item.status == BatchJobItemStatus.PENDING and self._claims.get((job_id, item.index), 0.0) <= now
+            ]
+
+    def _mark_finished(self, job: BatchJob) -> None:
+        if job.status in TERMINAL_STATUSES and job.id not in self._finished:
+            self._finished[job.id] = self._clock()
+
+    def _expire(self) -> None:
+        if self._retention_seconds <= 0:
+            return
+        cutoff = self._clock() - self._retention_seconds
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at > cutoff:
+                break
+            del self._finished[job_id]
+            del self._jobs[job_id]
+            for item in self._items.pop(job_id):
+                self._claims.pop((job_id, item.index), None)
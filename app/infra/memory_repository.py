@@ -1,27 +1,165 @@
 import asyncio
-from typing import Dict, Optional
+import bisect
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 from uuid import UUID
 
 from app.domain.models import TranscriptAnalysis
+from app.ports.analysis_repository import AnalysisRepository
 
+ENTRY_OVERHEAD_BYTES = 512
 
-class MemoryRepository:
-    def __init__(self):
-        self._storage: Dict[UUID, TranscriptAnalysis] = {}
+
+def estimate_analysis_size(analysis: TranscriptAnalysis) -> int:
+    return (
+        len(analysis.summary.encode("utf-8"))
+        + sum(len(action.encode("utf-8")) for action in analysis.next_actions)
+        + ENTRY_OVERHEAD_BYTES
+    )
+
+
+class MemoryRepository(AnalysisRepository):
+    """
+    Bounded in-process store of analyses with LRU and TTL eviction.
+
+    Everything runs on the event loop and no method awaits between reading and updating
+    the dict, so reads need no lock; only writes are serialized. A `ttl_seconds` of 0
+    keeps entries until they are evicted. `get_all` returns a snapshot that is rebuilt
+    only after the store has changed. A sorted (created_at, id) index, updated on every
+    insert and removal, serves `list_page` in O(log n + limit).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._storage: "OrderedDict[UUID, Tuple[TranscriptAnalysis, float, int]]" = OrderedDict()
+        # Saves in write order; with a fixed TTL this is also expiry order, so expired
+        # entries are always at the left end.
+        self._expiry_queue: Deque[Tuple[float, UUID]] = deque()
+        self._created_index: List[Tuple[datetime, UUID]] = []
+        self._current_bytes = 0
+        self._snapshot: Optional[Tuple[TranscriptAnalysis, ...]] = None
         self._lock = asyncio.Lock()
+        self.evictions = 0
+        self.expirations = 0
 
     async def save(self, analysis: TranscriptAnalysis) -> None:
+        await self.save_many([analysis])
+
+    async def save_many(self, analyses: List[TranscriptAnalysis]) -> None:
         async with self._lock:
-            self._storage[analysis.id] = analysis
+            for analysis in analyses:
+                self._insert(analysis)
+            self._snapshot = None
+            self._expire()
+            self._evict()
+            self._compact_expiry_queue()
 
     async def get_by_id(self, analysis_id: UUID) -> Optional[TranscriptAnalysis]:
-        async with self._lock:
-            return self._storage.get(analysis_id)
+        entry = self._storage.get(analysis_id)
+        if entry is None:
+            return None
+        analysis, expires_at, _ = entry
+        if self._clock() >= expires_at:
+            self._remove(analysis_id)
+            self.expirations += 1
+            return None
+        self._storage.move_to_end(analysis_id)
+        return analysis
 
-    async def get_all(self) -> list[TranscriptAnalysis]:
-        async with self._lock:
-            return list(self._storage.values())
+    async def get_all(self) -> Sequence[TranscriptAnalysis]:
+        self._expire()
+        if self._snapshot is None:
+            self._snapshot = tuple(analysis for analysis, _, _ in self._storage.values())
+        return self._snapshot
 
     async def count(self) -> int:
-        async with self._lock:
-            return len(self._storage)
\ No newline at end of file
+        self._expire()
+        return len(self._storage)
+
+    async def list_page(self, limit: int, before: Optional[Tuple[datetime, UUID]] = None,
+                        created_from: Optional[datetime] = None,
+                        created_to: Optional[datetime] = None) -> List[TranscriptAnalysis]:
+        self._expire()
+        position = len(self._created_index)
+        if before is not None:
+            position = bisect.bisect_left(self._created_index, before)
+        if created_to is not None:
+            position = min(position, bisect.bisect_left(self._created_index, (created_to,)))
+        page: List[TranscriptAnalysis] = []
+        while position > 0 and len(page) < limit:
+            position -= 1
+            created_at, analysis_id = self._created_index[position]
+            if created_from is not None and created_at < created_from:
+                break
+            page.append(self._storage[analysis_id][0])
+        return page
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": len(self._storage),
+            "max_entries": self._max_entries,
+            "bytes": self._current_bytes,
+            "max_bytes": self._max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _insert(self, analysis: TranscriptAnalysis) -> None:
+        size = estimate_analysis_size(analysis)
+        expires_at = self._clock() + self._ttl_seconds if self._ttl_seconds > 0 else float("inf")
+        if analysis.id in self._storage:
+            self._remove(analysis.id)
+        self._storage[analysis.id] = (analysis, expires_at, size)
+        bisect.insort(self._created_index, (analysis.created_at, analysis.id))
+        self._current_bytes += size
+        self._notify_saved(analysis)
+        if self._ttl_seconds > 0:
+            self._expiry_queue.append((expires_at, analysis.id))
+
+    def _evict(self) -> None:
+        while self._storage and (len(self._storage) > self._max_entries or self._current_bytes > self._max_bytes):
+            oldest = next(iter(self._storage))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _expire(self) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        now = self._clock()
+        while self._expiry_queue and now >= self._expiry_queue[0][0]:
+            expires_at, analysis_id = self._expiry_queue.popleft()
+            entry = self._storage.get(analysis_id)
+            # Skip queue entries of analyses that were evicted or saved again since.
+            if entry is not None and entry[1] == expires_at:
+                self._remove(analysis_id)
+                self.expirations += 1
+
+    def _compact_expiry_queue(self) -> None:
+        # Evicted and re-saved analyses leave stale queue entries that only expiry would
+        # drop; rebuild once they outnumber live entries, which keeps the cost amortized O(1).
+        if len(self._expiry_queue) <= 2 * len(self._storage):
+            return
+        self._expiry_queue = deque(
+            (expires_at, analysis_id) for expires_at, analysis_id in self._expiry_queue
+            if analysis_id in self._storage and self._storage[analysis_id][1] == expires_at
+        )
+
+    def _remove(self, analysis_id: UUID) -> None:
+        analysis, _, size = self._storage.pop(analysis_id)
+        position = bisect.bisect_left(self._created_index, (analysis.created_at, analysis_id))
+        del self._created_index[position]
+        self._current_bytes -= size
+        self._notify_removed(analysis)
+        self._snapshot = None
@@ -0,0 +1,128 @@
+import re
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+
+# Multipliers combining consecutive token hashes into an order-sensitive shingle hash.
+SHINGLE_MULTIPLIERS = (np.uint32(0x9E3779B1), np.uint32(0x85EBCA77), np.uint32(0xC2B2AE3D))
+TIMESTAMP_PATTERN = re.compile(r"\[?\b\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?\b\]?")
+TOKEN_PATTERN = re.compile(r"\w+")
+FILLER_WORDS = frozenset({"um", "uh", "erm", "hmm", "ah", "oh", "mm", "mhm", "uhm"})
+# Signature rows allocated by the first add; storage then doubles up to `capacity`.
+MIN_ROWS = 1024
+
+
+def shingle_hashes(transcript: str, shingle_size: int = 3) -> np.ndarray:
+    """Distinct hashes of the word shingles of a transcript, ignoring timestamps, filler words and case."""
+    tokens = [
+        token for token in TOKEN_PATTERN.findall(TIMESTAMP_PATTERN.sub(" ", transcript.lower()))
+        if token not in FILLER_WORDS
+    ]
+    token_hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in tokens), dtype=np.uint32,
+                               count=len(tokens))
+    if len(tokens) < shingle_size:
+        return np.unique(token_hashes) if len(tokens) else np.zeros(1, dtype=np.uint32)
+    count = len(tokens) - shingle_size + 1
+    shingles = np.zeros(count, dtype=np.uint32)
+    for offset in range(shingle_size):
+        shingles ^= token_hashes[offset:offset + count] * SHINGLE_MULTIPLIERS[offset % len(SHINGLE_MULTIPLIERS)]
+    return np.unique(shingles)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH index from transcript signatures to the analysis produced for them.
+
+    Signatures are `num_perm` MinHash values over word shingles, computed for all
+    permutations at once with NumPy. They are split into `bands` bands of equal size;
+    transcripts sharing any band become candidates, and candidates are scored together by
+    the fraction of equal signature values (estimated Jaccard similarity). The index holds
+    at most `capacity` signatures and overwrites the oldest when full; signature storage
+    grows with use, so an index that is never added to costs next to nothing.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128, bands: int = 16, capacity: int = 100_000,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        generator = np.random.default_rng(seed)
+        # x -> a * x + b (mod 2**32) with odd `a` is a permutation of the 32-bit hash space.
+        self._a = generator.integers(0, 1 << 32, size=num_perm, dtype=np.uint32) | np.uint32(1)
+        self._b = generator.integers(0, 1 << 32, size=num_perm, dtype=np.uint32)
+        self._threshold = threshold
+        self._bands = bands
+        self._rows = num_perm // bands
+        self._capacity = capacity
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._analysis_ids: List[UUID] = []
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = {}
+        self._next_slot = 0
+        self._size = 0
+        self.queries = 0
+        self.matches = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def signature(self, transcript: str) -> np.ndarray:
+        permuted = np.outer(self._a, shingle_hashes(transcript))
+        permuted += self._b[:, None]
+        return permuted.min(axis=1)
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[UUID, float]]:
+        """Returns the most similar indexed analysis at or above the threshold, if any."""
+        self.queries += 1
+        candidates: Set[int] = set()
+        for key in self._band_keys(signature):
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None
+        slots = np.fromiter(candidates, dtype=np.int64)
+        similarities = (self._signatures[slots] == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        if similarities[best] < self._threshold:
+            return None
+        self.matches += 1
+        return self._analysis_ids[slots[best]], float(similarities[best])
+
+    def add(self, signature: np.ndarray, analysis_id: UUID) -> None:
+        slot = self._next_slot
+        if slot < self._size:
+            for key in self._band_keys(self._signatures[slot]):
+                bucket = self._buckets[key]
+                bucket.discard(slot)
+                if not bucket:
+                    del self._buckets[key]
+            self._analysis_ids[slot] = analysis_id
+        else:
+            self._size += 1
+            self._analysis_ids.append(analysis_id)
+            if slot == len(self._signatures):
+                self._grow()
+        self._signatures[slot] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(slot)
+        self._next_slot = (slot + 1) % self._capacity
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "entries": self._size,
+            "capacity": self._capacity,
+            "threshold": self._threshold,
+            "queries": self.queries,
+            "matches": self.matches,
+        }
+
+    def _grow(self) -> None:
+        rows = min(self._capacity, max(MIN_ROWS, 2 * len(self._signatures)))
+        signatures = np.zeros((rows, self._signatures.shape[1]), dtype=np.uint32)
+        signatures[:len(self._signatures)] = self._signatures
+        self._signatures = signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self._rows:(band + 1) * self._rows].tobytes())
+            for band in range(self._bands)
+        ]
@@ -1,71 +1,105 @@
 import asyncio
 import logging
-from typing import Type
+from typing import Optional, Tuple, Type
 
 import openai
 import pydantic
 
-from app.domain.errors import LLMServiceError, LLMTimeoutError, LLMRateLimitError
+from app.domain.errors import DomainError, LLMServiceError, LLMTimeoutError, LLMRateLimitError
 from app.domain.ports import LLm
+from app.infra.hedging import HedgingPolicy
 
 logger = logging.getLogger(__name__)
 
 
 class OpenAIAdapterImpl(LLm):
-    def __init__(self, api_key: str, model: str, timeout: float = 30.0):
+    def __init__(self, api_key: str, model: str, timeout: float = 30.0, hedging: Optional[HedgingPolicy] = None,
+                 base_url: Optional[str] = None, max_retries: int = openai.DEFAULT_MAX_RETRIES):
+        # Pass max_retries=0 when a RetryingLLM wraps this adapter so attempts don't multiply.
         self._model = model
         self._timeout = timeout
-        self._client = openai.OpenAI(api_key=api_key)
-        self._aclient = openai.AsyncOpenAI(api_key=api_key)
+        self._hedging = hedging
+        self._client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+        self._aclient = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
 
     def run_completion(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel]) -> pydantic.BaseModel:
+        return self.run_completion_with_usage(system_prompt, user_prompt, dto)[0]
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel]) -> pydantic.BaseModel:
+        return (await self.run_completion_with_usage_async(system_prompt, user_prompt, dto))[0]
+
+    def run_completion_with_usage(self, system_prompt: str, user_prompt: str,
+                                  dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        """Like `run_completion`, but also returns the token usage the API billed."""
         try:
-            completion = self._client.beta.chat.completions.parse(
-                model=self._model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                response_format=dto,
-                timeout=self._timeout
-            )
-            return completion.choices[0].message.parsed
+            return self._parse(system_prompt, user_prompt, dto)
+        except DomainError:
+            raise
         except openai.RateLimitError as e:
             logger.error(f"OpenAI rate limit exceeded: {e}")
-            raise LLMRateLimitError()
+            raise LLMRateLimitError() from e
         except openai.APITimeoutError as e:
             logger.error(f"OpenAI request timed out: {e}")
-            raise LLMTimeoutError()
+            raise LLMTimeoutError() from e
         except openai.APIError as e:
             logger.error(f"OpenAI API error: {e}")
-            raise LLMServiceError(str(e))
+            raise LLMServiceError(str(e)) from e
         except Exception as e:
             logger.error(f"Unexpected error in OpenAI completion: {e}")
-            raise LLMServiceError(f"Unexpected error: {str(e)}")
+            raise LLMServiceError(f"Unexpected error: {str(e)}") from e
 
-    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel]) -> pydantic.BaseModel:
+    async def run_completion_with_usage_async(self, system_prompt: str, user_prompt: str,
+                                              dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
         try:
-            completion = await asyncio.wait_for(
-                self._aclient.beta.chat.completions.parse(
-                    model=self._model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    response_format=dto
-                ),
-                timeout=self._timeout
-            )
-            return completion.choices[0].message.parsed
+            return await self._attempt_async(system_prompt, user_prompt, dto)
+        except DomainError:
+            raise
         except asyncio.TimeoutError:
             logger.error("OpenAI request timed out")
             raise LLMTimeoutError()
         except openai.RateLimitError as e:
             logger.error(f"OpenAI rate limit exceeded: {e}")
-            raise LLMRateLimitError()
+            raise LLMRateLimitError() from e
+        except openai.APITimeoutError as e:
+            logger.error(f"OpenAI request timed out: {e}")
+            raise LLMTimeoutError() from e
         except openai.APIError as e:
             logger.error(f"OpenAI API error: {e}")
-            raise LLMServiceError(str(e))
+            raise LLMServiceError(str(e)) from e
         except Exception as e:
             logger.error(f"Unexpected error in OpenAI completion: {e}")
-            raise LLMServiceError(f"Unexpected error: {str(e)}")
\ No newline at end of file
+            raise LLMServiceError(f"Unexpected error: {str(e)}") from e
+
+    def _parse(self, system_prompt: str, user_prompt: str,
+               dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        completion = self._client.beta.chat.completions.parse(
+            model=self._model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            response_format=dto,
+            timeout=self._timeout
+        )
+        return completion.choices[0].message.parsed, completion.usage
+
+    async def _attempt_async(self, system_prompt: str, user_prompt: str,
+                             dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        if self._hedging is not None:
+            return await self._hedging.run(lambda: self._parse_async(system_prompt, user_prompt, dto))
+        return await self._parse_async(system_prompt, user_prompt, dto)
+
+    async def _parse_async(self, system_prompt: str, user_prompt: str,
+                           dto: Type[pydantic.BaseModel]) -> Tuple[pydantic.BaseModel, Optional[object]]:
+        completion = await asyncio.wait_for(
+            self._aclient.beta.chat.completions.parse(
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                response_format=dto
+            ),
+            timeout=self._timeout
+        )
+        return completion.choices[0].message.parsed, completion.usage
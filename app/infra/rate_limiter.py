@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.domain.errors import LocalRateLimitError
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        self._capacity = capacity
+        self._refill_per_second = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def time_until_available(self, amount: float) -> float:
+        self._refill()
+        if self._tokens >= amount:
+            return 0.0
+        return (amount - self._tokens) / self._refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self._tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        self._refill()
+        self._tokens = min(self._capacity, self._tokens + amount)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._refill_per_second)
+
+
+class RateLimiter:
+    """
+    Client-side admission control against the provider's requests-per-minute and
+    tokens-per-minute budgets.
+
+    Each call is charged one request plus its estimated prompt and output tokens up
+    front; `record_usage` later corrects the token bucket with what the API actually
+    billed. Callers wait up to `max_wait_seconds` for capacity before failing with
+    `LocalRateLimitError`. A limit of 0 disables that bucket.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_wait_seconds: float = 10.0,
+        expected_output_tokens: int = 400,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0, clock) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, clock) if tokens_per_minute > 0 else None
+        self._max_wait_seconds = max_wait_seconds
+        self._expected_output_tokens = expected_output_tokens
+        self._clock = clock
+        self._sleep = sleep
+        self.admitted = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+
+    async def acquire(self, prompt_tokens: int) -> int:
+        charge = prompt_tokens + self._expected_output_tokens
+        deadline = self._clock() + self._max_wait_seconds
+        waited = False
+        while True:
+            wait = self._time_until_admitted(charge)
+            if wait <= 0:
+                self._admit(charge)
+                return charge
+            if self._clock() + wait > deadline:
+                self.rejected += 1
+                logger.warning(f"Rate limit budget exhausted, rejecting request of ~{charge} tokens")
+                raise LocalRateLimitError()
+            if not waited:
+                self.throttled += 1
+                waited = True
+            self.total_wait_seconds += wait
+            await self._sleep(wait)
+
+    def acquire_blocking(self, prompt_tokens: int) -> int:
+        charge = prompt_tokens + self._expected_output_tokens
+        deadline = self._clock() + self._max_wait_seconds
+        while True:
+            wait = self._time_until_admitted(charge)
+            if wait <= 0:
+                self._admit(charge)
+                return charge
+            if self._clock() + wait > deadline:
+                self.rejected += 1
+                raise LocalRateLimitError()
+            self.total_wait_seconds += wait
+            time.sleep(wait)
+
+    def time_until_admitted(self, prompt_tokens: int) -> float:
+        """Seconds a call with `prompt_tokens` would currently wait for budget; 0 when admitted right away."""
+        return self._time_until_admitted(prompt_tokens + self._expected_output_tokens)
+
+    def record_usage(self, charged_tokens: int, usage: Optional[object]) -> None:
+        total_tokens = getattr(usage, "total_tokens", None)
+        if self._tokens is None or total_tokens is None:
+            return
+        self._tokens.adjust(charged_tokens - total_tokens)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests_available": self._requests.available if self._requests else None,
+            "tokens_available": self._tokens.available if self._tokens else None,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+        }
+
+    def _time_until_admitted(self, charge: int) -> float:
+        wait = 0.0
+        if self._requests is not None:
+            wait = max(wait, self._requests.time_until_available(1))
+        if self._tokens is not None:
+            wait = max(wait, self._tokens.time_until_available(min(charge, self._tokens.capacity)))
+        return wait
+
+    def _admit(self, charge: int) -> None:
+        if self._requests is not None:
+            self._requests.consume(1)
+        if self._tokens is not None:
+            self._tokens.consume(charge)
+        self.admitted += 1
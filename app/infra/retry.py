@@ -0,0 +1,228 @@
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+import openai
+import pydantic
+
+from app.domain.errors import LLMRateLimitError, LLMServiceError, LLMTimeoutError, LocalRateLimitError
+from app.domain.ports import LLm
+from app.infra.llm_calls import complete, complete_async, token_kwargs
+from app.infra.token_counter import TokenCounter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    asyncio.TimeoutError,
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Whether `error` is transient: a provider 429, a timeout, a connection error or a 5xx,
+    raw or as mapped to a domain error by the adapters. Rejections by our own rate
+    limiter have already waited as long as allowed and are not retried.
+    """
+    if isinstance(error, LocalRateLimitError):
+        return False
+    if isinstance(error, (LLMRateLimitError, LLMTimeoutError)):
+        return True
+    if isinstance(error, LLMServiceError):
+        return isinstance(error.__cause__, RETRYABLE_ERRORS)
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def parse_retry_after(error: BaseException) -> Optional[float]:
+    # Domain errors keep the provider error, and its response, as their cause.
+    response = getattr(error, "response", None) or getattr(error.__cause__, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retries transient LLM failures (429, timeouts, connection errors and 5xx).
+
+    Delays follow decorrelated jitter, `min(max_delay, uniform(base_delay, previous * 3))`,
+    and are raised to the provider's Retry-After when it asks for longer. No retry is
+    scheduled if it would end past `deadline_seconds` from the first attempt.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        deadline_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+        uniform: Callable[[float, float], float] = random.uniform
+    ):
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._deadline_seconds = deadline_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._uniform = uniform
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.exhausted = 0
+        self.deadline_exceeded = 0
+        self.errors_by_type: Counter = Counter()
+        self.attempts_per_call: Counter = Counter()
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        started_at = self._clock()
+        delay = self._base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts += 1
+            try:
+                result = await fn()
+            except Exception as e:
+                if not is_retryable(e):
+                    self.attempts_per_call[attempt] += 1
+                    raise
+                delay = self._next_delay(e, attempt, started_at, delay)
+                await self._sleep(delay)
+                continue
+            self.attempts_per_call[attempt] += 1
+            return result
+
+    def call(self, fn: Callable[[], T]) -> T:
+        self.calls += 1
+        started_at = self._clock()
+        delay = self._base_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            self.attempts += 1
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_retryable(e):
+                    self.attempts_per_call[attempt] += 1
+                    raise
+                delay = self._next_delay(e, attempt, started_at, delay)
+                time.sleep(delay)
+                continue
+            self.attempts_per_call[attempt] += 1
+            return result
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+            "deadline_exceeded": self.deadline_exceeded,
+            "errors_by_type": dict(self.errors_by_type),
+            "attempts_per_call": {str(k): v for k, v in sorted(self.attempts_per_call.items())},
+        }
+
+    def _next_delay(self, error: BaseException, attempt: int, started_at: float, previous_delay: float) -> float:
+        """Returns the delay before the next attempt, or re-raises `error` if none is allowed."""
+        self.errors_by_type[type(error).__name__] += 1
+
+        if attempt >= self._max_attempts:
+            self.exhausted += 1
+            self.attempts_per_call[attempt] += 1
+            logger.error(f"LLM call failed after {attempt} attempts: {error}")
+            raise error
+
+        delay = min(self._max_delay, self._uniform(self._base_delay, previous_delay * 3))
+        retry_after = parse_retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        elapsed = self._clock() - started_at
+        if elapsed + delay > self._deadline_seconds:
+            self.deadline_exceeded += 1
+            self.attempts_per_call[attempt] += 1
+            logger.error(f"LLM retry budget of {self._deadline_seconds}s exhausted after {attempt} attempts: {error}")
+            raise error
+
+        self.retries += 1
+        logger.warning(f"Retrying LLM call in {delay:.2f}s (attempt {attempt}/{self._max_attempts}): {type(error).__name__}")
+        return delay
+
+
+class RetryingLLM(LLm):
+    """
+    Retries completions of `inner` with `policy`. It belongs above the concurrency
+    limiter and circuit breaker: backoff then holds no slot, and every failed attempt
+    is seen by AIMD and the breaker instead of only the last one. With a
+    `token_counter`, the prompt is counted here once and the count reused by every
+    attempt and every layer below.
+    """
+
+    accepts_prompt_tokens = True
+
+    def __init__(self, inner: LLm, policy: RetryPolicy, token_counter: Optional[TokenCounter] = None):
+        self._inner = inner
+        self._policy = policy
+        self._token_counter = token_counter
+
+    def run_completion(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                       prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        prompt_tokens = self._count_tokens(system_prompt, user_prompt, prompt_tokens)
+        return self._policy.call(lambda: complete(self._inner, system_prompt, user_prompt, dto, prompt_tokens))
+
+    async def run_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                                   prompt_tokens: Optional[int] = None) -> pydantic.BaseModel:
+        prompt_tokens = self._count_tokens(system_prompt, user_prompt, prompt_tokens)
+        return await self._policy.call_async(
+            lambda: complete_async(self._inner, system_prompt, user_prompt, dto, prompt_tokens)
+        )
+
+    async def run_routed_completion_async(self, system_prompt: str, user_prompt: str, dto: Type[pydantic.BaseModel],
+                                          prompt_tokens: Optional[int] = None) -> Tuple[pydantic.BaseModel, Optional[str]]:
+        """Retried `run_routed_completion_async` of a routing `inner`; the model is None for other ports."""
+        if not hasattr(self._inner, 'run_routed_completion_async'):
+            return await self.run_completion_async(system_prompt, user_prompt, dto, prompt_tokens), None
+        prompt_tokens = self._count_tokens(system_prompt, user_prompt, prompt_tokens)
+        return await self._policy.call_async(
+            lambda: self._inner.run_routed_completion_async(
+                system_prompt, user_prompt, dto, **token_kwargs(self._inner, prompt_tokens)
+            )
+        )
+
+    def _count_tokens(self, system_prompt: str, user_prompt: str, prompt_tokens: Optional[int]) -> Optional[int]:
+        if prompt_tokens is not None or self._token_counter is None:
+            return prompt_tokens
+        return self._token_counter.count_messages(system_prompt, user_prompt)
@@ -0,0 +1,164 @@
+import heapq
+import logging
+import math
+import re
+from typing import Dict, List, Set, Tuple
+from uuid import UUID
+
+from app.domain.models import TranscriptAnalysis
+from app.ports.analysis_repository import AnalysisRepository, AnalysisRepositoryListener
+
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+# Position gap between fields so a phrase never matches across the summary and an action.
+FIELD_GAP = 16
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def parse_query(query: str) -> Tuple[List[str], List[List[str]]]:
+    """Splits a query into bare terms and quoted phrases."""
+    terms: List[str] = []
+    phrases: List[List[str]] = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                phrases.append(tokens)
+            else:
+                terms.extend(tokens)
+        else:
+            terms.extend(tokenize(word))
+    return terms, phrases
+
+
+class InvertedIndex(AnalysisRepositoryListener):
+    """
+    Incremental positional index over analysis summaries and next actions.
+
+    Registered as a repository listener, so it follows saves, evictions and expiries. That
+    only works for process-local repositories: the index lives in this process and never
+    hears about other processes' writes. Results are ranked with BM25 over all query
+    terms; every quoted phrase must occur.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[UUID, List[int]]] = {}
+        self._doc_terms: Dict[UUID, Tuple[str, ...]] = {}
+        self._doc_lengths: Dict[UUID, int] = {}
+        self._total_length = 0
+        self.queries = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def on_saved(self, analysis: TranscriptAnalysis) -> None:
+        self.add(analysis)
+
+    def on_removed(self, analysis: TranscriptAnalysis) -> None:
+        self.remove(analysis.id)
+
+    async def backfill(self, repository: AnalysisRepository, page_size: int = 1000) -> int:
+        """Indexes the analyses already in `repository`, one `list_page` at a time; returns the index size."""
+        before = None
+        while True:
+            page = await repository.list_page(page_size, before=before)
+            for analysis in page:
+                self.add(analysis)
+            if len(page) < page_size:
+                logger.info(f"Search index built with {len(self)} analyses")
+                return len(self)
+            before = (page[-1].created_at, page[-1].id)
+
+    def add(self, analysis: TranscriptAnalysis) -> None:
+        if analysis.id in self._doc_lengths:
+            self.remove(analysis.id)
+        positions: Dict[str, List[int]] = {}
+        position = 0
+        for field in [analysis.summary, *analysis.next_actions]:
+            for token in tokenize(field):
+                positions.setdefault(token, []).append(position)
+                position += 1
+            position += FIELD_GAP
+        for term, term_positions in positions.items():
+            self._postings.setdefault(term, {})[analysis.id] = term_positions
+        length = sum(len(term_positions) for term_positions in positions.values())
+        self._doc_terms[analysis.id] = tuple(positions)
+        self._doc_lengths[analysis.id] = length
+        self._total_length += length
+
+    def remove(self, analysis_id: UUID) -> None:
+        terms = self._doc_terms.pop(analysis_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(analysis_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[analysis_id]
+            if not postings:
+                del self._postings[term]
+
+    def search(self, query: str, limit: int) -> Tuple[List[Tuple[UUID, float]], int]:
+        """Returns the top `limit` (analysis_id, score) pairs and the total number of matches."""
+        self.queries += 1
+        terms, phrases = parse_query(query)
+        all_terms = terms + [token for phrase in phrases for token in phrase]
+        if not all_terms:
+            return [], 0
+
+        candidates: Set[UUID]
+        if phrases:
+            candidates = self._phrase_matches(phrases[0])
+            for phrase in phrases[1:]:
+                candidates &= self._phrase_matches(phrase)
+        else:
+            candidates = set()
+            for term in terms:
+                candidates.update(self._postings.get(term, ()))
+
+        scores = {analysis_id: self._score(analysis_id, all_terms) for analysis_id in candidates}
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return top, len(scores)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "documents": len(self._doc_lengths),
+            "terms": len(self._postings),
+            "queries": self.queries,
+        }
+
+    def _phrase_matches(self, phrase: List[str]) -> Set[UUID]:
+        postings = [self._postings.get(term) for term in phrase]
+        if not all(postings):
+            return set()
+        smallest = min(postings, key=len)
+        matches = set()
+        for analysis_id in smallest:
+            if not all(analysis_id in term_postings for term_postings in postings):
+                continue
+            following = [set(term_postings[analysis_id]) for term_postings in postings[1:]]
+            for start in postings[0][analysis_id]:
+                if all(start + offset + 1 in positions for offset, positions in enumerate(following)):
+                    matches.add(analysis_id)
+                    break
+        return matches
+
+    def _score(self, analysis_id: UUID, terms: List[str]) -> float:
+        document_count = len(self._doc_lengths)
+        average_length = self._total_length / document_count
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[analysis_id] / average_length)
+        score = 0.0
+        for term in set(terms):
+            postings = self._postings.get(term)
+            if not postings or analysis_id not in postings:
+                continue
+            frequency = len(postings[analysis_id])
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            score += idf * frequency * (BM25_K1 + 1) / (frequency + length_norm)
+        return score
@@ -0,0 +1,224 @@
+import asyncio
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.domain.errors import AnalysisStoreFullError
+from app.domain.models import TranscriptAnalysis
+from app.ports.analysis_repository import AnalysisRepository
+
+MAGIC = b"TAIDX001"
+HEADER = struct.Struct("<8sQQ")  # magic, capacity, count
+HEADER_SIZE = 64
+SLOT = struct.Struct("<16sQI4x")  # analysis id, record offset, record length
+ORDER = struct.Struct("<q16s")  # created_at in microseconds since the epoch (UTC), analysis id
+EMPTY_KEY = bytes(16)
+MAX_LOAD_FACTOR = 0.9
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _order_key(created_at: datetime, analysis_id: bytes = b"") -> Tuple[int, bytes]:
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return (created_at - EPOCH) // timedelta(microseconds=1), analysis_id
+
+
+class SharedMmapRepository(AnalysisRepository):
+    """
+    Analysis store shared by all worker processes on one host.
+
+    An open-addressing hash table of fixed capacity is memory-mapped from `<path>.idx` and
+    maps analysis ids to records appended to `<path>.dat`. A lookup is a hash probe in
+    shared memory plus one `pread`, under a shared `flock`; writes take the exclusive lock.
+    Every process opening the same path sees the same analyses without sticky sessions.
+    Locking and file I/O run in worker threads so a busy lock never stalls the event loop.
+
+    `<path>.ord` holds every (created_at, id) pair sorted, so `list_page` binary-searches
+    it and reads only the records of the page. Keeping it sorted makes an insert a
+    `memmove` of the entries after it. Both index files are created with the store.
+
+    The data file is append-only: saving an existing id again leaves the old record
+    behind as garbage. Listeners only hear about saves made by this process.
+    """
+
+    process_local = False
+
+    def __init__(self, path: str, capacity: int = 1 << 20):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of two")
+        super().__init__()
+        self._index_fd = os.open(f"{path}.idx", os.O_RDWR | os.O_CREAT, 0o644)
+        self._order_fd = os.open(f"{path}.ord", os.O_RDWR | os.O_CREAT, 0o644)
+        self._data_fd = os.open(f"{path}.dat", os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        # flock is held per open file, so it does not keep this process's threads apart.
+        self._thread_lock = threading.Lock()
+        with self._locked(fcntl.LOCK_EX):
+            if os.fstat(self._index_fd).st_size == 0:
+                os.ftruncate(self._index_fd, HEADER_SIZE + capacity * SLOT.size)
+                os.ftruncate(self._order_fd, capacity * ORDER.size)
+                os.pwrite(self._index_fd, HEADER.pack(MAGIC, capacity, 0), 0)
+            magic, self._capacity, _ = HEADER.unpack(os.pread(self._index_fd, HEADER.size, 0))
+        if magic != MAGIC:
+            raise ValueError(f"{path}.idx is not an analysis index")
+        self._index = mmap.mmap(self._index_fd, HEADER_SIZE + self._capacity * SLOT.size)
+        self._order = mmap.mmap(self._order_fd, self._capacity * ORDER.size)
+
+    async def save(self, analysis: TranscriptAnalysis) -> None:
+        await self.save_many([analysis])
+
+    async def save_many(self, analyses: List[TranscriptAnalysis]) -> None:
+        records = [
+            (analysis.id.bytes, analysis.created_at, analysis.model_dump_json().encode("utf-8"))
+            for analysis in analyses
+        ]
+        await asyncio.to_thread(self._write_records, records)
+        for analysis in analyses:
+            self._notify_saved(analysis)
+
+    async def get_by_id(self, analysis_id: UUID) -> Optional[TranscriptAnalysis]:
+        record = await asyncio.to_thread(self._read_record, analysis_id.bytes)
+        return TranscriptAnalysis.model_validate_json(record) if record is not None else None
+
+    async def get_all(self) -> Sequence[TranscriptAnalysis]:
+        records = await asyncio.to_thread(self._read_all_records)
+        analyses = [TranscriptAnalysis.model_validate_json(record) for record in records]
+        analyses.sort(key=lambda analysis: (analysis.created_at, analysis.id))
+        return analyses
+
+    async def list_page(self, limit: int, before: Optional[Tuple[datetime, UUID]] = None,
+                        created_from: Optional[datetime] = None,
+                        created_to: Optional[datetime] = None) -> List[TranscriptAnalysis]:
+        records = await asyncio.to_thread(self._read_page, limit, before, created_from, created_to)
+        return [TranscriptAnalysis.model_validate_json(record) for record in records]
+
+    async def count(self) -> int:
+        return HEADER.unpack_from(self._index, 0)[2]
+
+    async def close(self) -> None:
+        self._index.close()
+        self._order.close()
+        os.close(self._index_fd)
+        os.close(self._order_fd)
+        os.close(self._data_fd)
+
+    def stats(self) -> Dict[str, float]:
+        _, capacity, count = HEADER.unpack_from(self._index, 0)
+        return {
+            "entries": count,
+            "capacity": capacity,
+            "load_factor": count / capacity,
+            "data_bytes": os.fstat(self._data_fd).st_size,
+        }
+
+    def _write_records(self, records: List[Tuple[bytes, datetime, bytes]]) -> None:
+        with self._locked(fcntl.LOCK_EX):
+            _, capacity, count = HEADER.unpack_from(self._index, 0)
+            try:
+                for key, created_at, record in records:
+                    slot = self._probe(key)
+                    stored_key, stored_offset, stored_length = self._slot(slot)
+                    is_new = stored_key == EMPTY_KEY
+                    if is_new and count + 1 > capacity * MAX_LOAD_FACTOR:
+                        raise AnalysisStoreFullError(capacity)
+                    order_key = _order_key(created_at, key)
+                    if is_new:
+                        self._order_insert(order_key, count)
+                    else:
+                        previous = TranscriptAnalysis.model_validate_json(os.pread(self._data_fd, stored_length, stored_offset))
+                        previous_key = _order_key(previous.created_at, key)
+                        if previous_key != order_key:
+                            self._order_remove(previous_key, count)
+                            self._order_insert(order_key, count - 1)
+                    offset = os.lseek(self._data_fd, 0, os.SEEK_END)
+                    os.write(self._data_fd, record)
+                    SLOT.pack_into(self._index, HEADER_SIZE + slot * SLOT.size, key, offset, len(record))
+                    count += int(is_new)
+            finally:
+                HEADER.pack_into(self._index, 0, MAGIC, capacity, count)
+
+    def _read_record(self, key: bytes) -> Optional[bytes]:
+        with self._locked(fcntl.LOCK_SH):
+            stored_key, offset, length = self._slot(self._probe(key))
+            if stored_key != key:
+                return None
+            return os.pread(self._data_fd, length, offset)
+
+    def _read_all_records(self) -> List[bytes]:
+        with self._locked(fcntl.LOCK_SH):
+            return [os.pread(self._data_fd, length, offset) for offset, length in self._occupied_slots()]
+
+    def _read_page(self, limit: int, before: Optional[Tuple[datetime, UUID]], created_from: Optional[datetime],
+                   created_to: Optional[datetime]) -> List[bytes]:
+        with self._locked(fcntl.LOCK_SH):
+            count = HEADER.unpack_from(self._index, 0)[2]
+            high = count
+            if before is not None:
+                high = self._order_search(_order_key(before[0], before[1].bytes), count)
+            if created_to is not None:
+                high = min(high, self._order_search(_order_key(created_to), count))
+            low = self._order_search(_order_key(created_from), count) if created_from is not None else 0
+            records = []
+            for position in range(high - 1, max(low, high - limit) - 1, -1):
+                key = ORDER.unpack_from(self._order, position * ORDER.size)[1]
+                _, offset, length = self._slot(self._probe(key))
+                records.append(os.pread(self._data_fd, length, offset))
+            return records
+
+    def _order_search(self, order_key: Tuple[int, bytes], count: int) -> int:
+        """Position of the first entry of the ordered index not below `order_key`."""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if ORDER.unpack_from(self._order, middle * ORDER.size) < order_key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _order_insert(self, order_key: Tuple[int, bytes], count: int) -> None:
+        position = self._order_search(order_key, count)
+        start = position * ORDER.size
+        self._order.move(start + ORDER.size, start, (count - position) * ORDER.size)
+        ORDER.pack_into(self._order, start, *order_key)
+
+    def _order_remove(self, order_key: Tuple[int, bytes], count: int) -> None:
+        position = self._order_search(order_key, count)
+        start = position * ORDER.size
+        self._order.move(start, start + ORDER.size, (count - position - 1) * ORDER.size)
+
+    @contextmanager
+    def _locked(self, operation: int) -> Iterator[None]:
+        with self._thread_lock:
+            fcntl.flock(self._index_fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._index_fd, fcntl.LOCK_UN)
+
+    def _slot(self, slot: int) -> tuple:
+        return SLOT.unpack_from(self._index, HEADER_SIZE + slot * SLOT.size)
+
+    def _probe(self, key: bytes) -> int:
+        """Returns the slot holding `key`, or the empty slot where it would be inserted."""
+        mask = self._capacity - 1
+        slot = int.from_bytes(key[:8], "little") & mask
+        while True:
+            stored_key = self._index[HEADER_SIZE + slot * SLOT.size:HEADER_SIZE + slot * SLOT.size + 16]
+            if stored_key == key or stored_key == EMPTY_KEY:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _occupied_slots(self) -> Iterator[tuple]:
+        table = memoryview(self._index)[HEADER_SIZE:HEADER_SIZE + self._capacity * SLOT.size]
+        try:
+            for stored_key, offset, length in SLOT.iter_unpack(table):
+                if stored_key != EMPTY_KEY:
+                    yield offset, length
+        finally:
+            table.release()
@@ -0,0 +1,206 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.models import BatchJob, BatchJobItem, BatchJobItemStatus, BatchJobStatus, TranscriptAnalysis
+from app.ports.job_repository import BatchJobRepository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total_count INTEGER NOT NULL,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    successful_count INTEGER NOT NULL DEFAULT 0,
+    failed_count INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS batch_job_items (
+    job_id TEXT NOT NULL,
+    item_index INTEGER NOT NULL,
+    transcript TEXT NOT NULL,
+    status TEXT NOT NULL,
+    analysis TEXT,
+    error TEXT,
+    claimed_until REAL,
+    PRIMARY KEY (job_id, item_index)
+);
+CREATE INDEX IF NOT EXISTS idx_batch_job_items_status ON batch_job_items (status);
+"""
+
+JOB_COLUMNS = "id, status, total_count, completed_count, successful_count, failed_count, created_at, updated_at"
+
+
+class SqliteBatchJobRepository(BatchJobRepository):
+    """
+    Batch job store in a local SQLite database (WAL mode), so jobs survive restarts.
+
+    sqlite3 calls are blocking, so each operation runs in a worker thread behind a lock.
+    Item claims are a conditional UPDATE on `claimed_until` (wall-clock seconds), which
+    SQLite serializes across every process sharing the file.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    async def create_job(self, job: BatchJob, transcripts: List[str]) -> None:
+        await asyncio.to_thread(self._create_job, job, transcripts)
+
+    async def get_job(self, job_id: UUID) -> Optional[BatchJob]:
+        return await asyncio.to_thread(self._get_job, job_id)
+
+    async def update_job_status(self, job_id: UUID, status: BatchJobStatus) -> Optional[BatchJob]:
+        return await asyncio.to_thread(self._update_job_status, job_id, status)
+
+    async def get_item(self, job_id: UUID, index: int) -> Optional[BatchJobItem]:
+        return await asyncio.to_thread(self._get_item, job_id, index)
+
+    async def claim_item(self, job_id: UUID, index: int, lease_seconds: float) -> Optional[BatchJobItem]:
+        return await asyncio.to_thread(self._claim_item, job_id, index, lease_seconds)
+
+    async def record_item_result(self, job_id: UUID, index: int, analysis: Optional[TranscriptAnalysis] = None,
+                                 error: Optional[str] = None) -> Optional[BatchJob]:
+        return await asyncio.to_thread(self._record_item_result, job_id, index, analysis, error)
+
+    async def list_items(self, job_id: UUID, offset: int, limit: int) -> List[BatchJobItem]:
+        return await asyncio.to_thread(self._list_items, job_id, offset, limit)
+
+    async def list_pending_items(self) -> List[Tuple[UUID, int]]:
+        return await asyncio.to_thread(self._list_pending_items)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _create_job(self, job: BatchJob, transcripts: List[str]) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO batch_jobs ({JOB_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (str(job.id), job.status.value, job.total_count, job.completed_count, job.successful_count,
+                 job.failed_count, job.created_at.isoformat(), job.updated_at.isoformat())
+            )
+            self._connection.executemany(
+                "INSERT INTO batch_job_items (job_id, item_index, transcript, status) VALUES (?, ?, ?, ?)",
+                [(str(job.id), index, transcript, BatchJobItemStatus.PENDING.value)
+                 for index, transcript in enumerate(transcripts)]
+            )
+
+    def _get_job(self, job_id: UUID) -> Optional[BatchJob]:
+        with self._lock:
+            return self._fetch_job(job_id)
+
+    def _update_job_status(self, job_id: UUID, status: BatchJobStatus) -> Optional[BatchJob]:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE batch_jobs SET status = ?, updated_at = ? WHERE id = ? AND status NOT IN (?, ?)",
+                (status.value, datetime.now(timezone.utc).isoformat(), str(job_id),
+                 BatchJobStatus.COMPLETED.value, BatchJobStatus.CANCELLED.value)
+            )
+            return self._fetch_job(job_id)
+
+    def _get_item(self, job_id: UUID, index: int) -> Optional[BatchJobItem]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT job_id, item_index, transcript, status, analysis, error FROM batch_job_items "
+                "WHERE job_id = ? AND item_index = ?",
+                (str(job_id), index)
+            ).fetchone()
+        return self._to_item(row) if row else None
+
+    def _claim_item(self, job_id: UUID, index: int, lease_seconds: float) -> Optional[BatchJobItem]:
+        now = self._clock()
+        with self._lock, self._connection:
+            claimed = self._connection.execute(
+                "UPDATE batch_job_items SET claimed_until = ? "
+                "WHERE job_id = ? AND item_index = ? AND status = ? AND (claimed_until IS NULL OR claimed_until <= ?)",
+                (now + lease_seconds, str(job_id), index, BatchJobItemStatus.PENDING.value, now)
+            ).rowcount
+            if not claimed:
+                return None
+            row = self._connection.execute(
+                "SELECT job_id, item_index, transcript, status, analysis, error FROM batch_job_items "
+                "WHERE job_id = ? AND item_index = ?",
+                (str(job_id), index)
+            ).fetchone()
+        return self._to_item(row)
+
+    def _record_item_result(self, job_id: UUID, index: int, analysis: Optional[TranscriptAnalysis],
+                            error: Optional[str]) -> Optional[BatchJob]:
+        status = BatchJobItemStatus.SUCCEEDED if analysis is not None else BatchJobItemStatus.FAILED
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE batch_job_items SET status = ?, analysis = ?, error = ?, claimed_until = NULL "
+                "WHERE job_id = ? AND item_index = ? AND status = ?",
+                (status.value, analysis.model_dump_json() if analysis else None, error,
+                 str(job_id), index, BatchJobItemStatus.PENDING.value)
+            ).rowcount
+            if updated:
+                succeeded = int(analysis is not None)
+                self._connection.execute(
+                    "UPDATE batch_jobs SET completed_count = completed_count + 1, "
+                    "successful_count = successful_count + ?, failed_count = failed_count + ?, "
+                    "status = CASE WHEN completed_count + 1 = total_count AND status != ? THEN ? ELSE status END, "
+                    "updated_at = ? WHERE id = ?",
+                    (succeeded, 1 - succeeded, BatchJobStatus.CANCELLED.value, BatchJobStatus.COMPLETED.value,
+                     datetime.now(timezone.utc).isoformat(), str(job_id))
+                )
+            return self._fetch_job(job_id)
+
+    def _list_items(self, job_id: UUID, offset: int, limit: int) -> List[BatchJobItem]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT job_id, item_index, transcript, status, analysis, error FROM batch_job_items "
+                "WHERE job_id = ? AND item_index >= ? ORDER BY item_index LIMIT ?",
+                (str(job_id), offset, limit)
+            ).fetchall()
+        return [self._to_item(row) for row in rows]
+
+    def _list_pending_items(self) -> List[Tuple[UUID, int]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT i.job_id, i.item_index FROM batch_job_items i JOIN batch_jobs j ON j.id = i.job_id "
+                "WHERE i.status = ? AND j.status NOT IN (?, ?) AND (i.claimed_until IS NULL OR i.claimed_until <= ?) "
+                "ORDER BY j.created_at, i.item_index",
+                (BatchJobItemStatus.PENDING.value, BatchJobStatus.COMPLETED.value, BatchJobStatus.CANCELLED.value,
+                 self._clock())
+            ).fetchall()
+        return [(UUID(job_id), index) for job_id, index in rows]
+
+    def _fetch_job(self, job_id: UUID) -> Optional[BatchJob]:
+        row = self._connection.execute(
+            f"SELECT {JOB_COLUMNS} FROM batch_jobs WHERE id = ?", (str(job_id),)
+        ).fetchone()
+        if row is None:
+            return None
+        return BatchJob(
+            id=UUID(row[0]),
+            status=BatchJobStatus(row[1]),
+            total_count=row[2],
+            completed_count=row[3],
+            successful_count=row[4],
+            failed_count=row[5],
+            created_at=datetime.fromisoformat(row[6]),
+            updated_at=datetime.fromisoformat(row[7])
+        )
+
+    @staticmethod
+    def _to_item(row: tuple) -> BatchJobItem:
+        job_id, index, transcript, status, analysis, error = row
+        return BatchJobItem(
+            job_id=UUID(job_id),
+            index=index,
+            transcript=transcript,
+            status=BatchJobItemStatus(status),
+            analysis=TranscriptAnalysis.model_validate_json(analysis) if analysis else None,
+            error=error
+        )
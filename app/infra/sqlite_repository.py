@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.domain.models import TranscriptAnalysis
+from app.ports.analysis_repository import AnalysisRepository
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    next_actions TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    reused_from TEXT,
+    model TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses (created_at);
+"""
+
+COLUMNS = "id, summary, next_actions, created_at, reused_from, model"
+
+
+def _utc_isoformat(value: datetime) -> str:
+    # created_at is compared as text, which only sorts correctly when every value has the same offset.
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc).isoformat()
+    return value.astimezone(timezone.utc).isoformat()
+
+
+class SqliteRepository(AnalysisRepository):
+    """
+    Analysis store in a local SQLite database (WAL mode) with write-behind batching.
+
+    `save` only puts the analysis in an in-memory pending map; a background task commits
+    pending analyses in one transaction per batch, so request handlers never wait on the
+    disk. Reads check the pending map first and use a separate connection, which WAL lets
+    run alongside the writer. Once `max_pending` analyses are waiting, `save` waits for
+    the next commit instead of growing the buffer further.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 0.05, max_pending: int = 10_000):
+        super().__init__()
+        self._writer = self._connect(path)
+        self._writer.executescript(SCHEMA)
+        self._reader = self._connect(path)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending: Dict[UUID, TranscriptAnalysis] = {}
+        # Taken from `_pending` but not committed yet; still served to readers.
+        self._in_flight: Dict[UUID, TranscriptAnalysis] = {}
+        self._wakeup = asyncio.Event()
+        self._flushed = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self.flushed_count = 0
+        self.flush_batches = 0
+        self.flush_errors = 0
+
+    async def save(self, analysis: TranscriptAnalysis) -> None:
+        await self.save_many([analysis])
+
+    async def save_many(self, analyses: List[TranscriptAnalysis]) -> None:
+        self._ensure_flusher()
+        while len(self._pending) >= self._max_pending:
+            self._wakeup.set()
+            self._flushed.clear()
+            await self._flushed.wait()
+        for analysis in analyses:
+            self._pending[analysis.id] = analysis
+            self._notify_saved(analysis)
+        self._wakeup.set()
+
+    async def get_by_id(self, analysis_id: UUID) -> Optional[TranscriptAnalysis]:
+        analysis = self._pending.get(analysis_id) or self._in_flight.get(analysis_id)
+        if analysis is not None:
+            return analysis
+        return await asyncio.to_thread(self._get_by_id, analysis_id)
+
+    async def get_all(self) -> Sequence[TranscriptAnalysis]:
+        await self.flush()
+        return await asyncio.to_thread(self._get_all)
+
+    async def count(self) -> int:
+        await self.flush()
+        return await asyncio.to_thread(self._count)
+
+    async def list_page(self, limit: int, before: Optional[Tuple[datetime, UUID]] = None,
+                        created_from: Optional[datetime] = None,
+                        created_to: Optional[datetime] = None) -> List[TranscriptAnalysis]:
+        await self.flush()
+        return await asyncio.to_thread(self._list_page, limit, before, created_from, created_to)
+
+    async def flush(self) -> None:
+        """Commits every pending analysis before returning."""
+        while self._pending:
+            await self._commit(self._take_batch(), raise_errors=True)
+        while self._in_flight:
+            self._flushed.clear()
+            await self._flushed.wait()
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        with self._write_lock, self._read_lock:
+            self._writer.close()
+            self._reader.close()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self._pending),
+            "flushed": self.flushed_count,
+            "flush_batches": self.flush_batches,
+            "flush_errors": self.flush_errors,
+        }
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._run_flusher())
+
+    async def _run_flusher(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Give concurrent saves a moment to join the same transaction.
+            await asyncio.sleep(self._flush_interval)
+            while self._pending:
+                if not await self._commit(self._take_batch()):
+                    await asyncio.sleep(self._flush_interval)
+
+    def _take_batch(self) -> List[TranscriptAnalysis]:
+        batch = []
+        for analysis_id in list(self._pending)[:self._batch_size]:
+            analysis = self._pending.pop(analysis_id)
+            self._in_flight[analysis_id] = analysis
+            batch.append(analysis)
+        return batch
+
+    async def _commit(self, batch: List[TranscriptAnalysis], raise_errors: bool = False) -> bool:
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+            return True
+        except Exception as e:
+            self.flush_errors += 1
+            logger.error(f"Failed to persist {len(batch)} analyses: {str(e)}")
+            for analysis in batch:
+                self._pending.setdefault(analysis.id, analysis)
+            if raise_errors:
+                raise
+            return False
+        finally:
+            for analysis in batch:
+                if self._in_flight.get(analysis.id) is analysis:
+                    del self._in_flight[analysis.id]
+            self._flushed.set()
+
+    def _write_batch(self, batch: List[TranscriptAnalysis]) -> None:
+        rows = [
+            (str(analysis.id), analysis.summary, json.dumps(analysis.next_actions), _utc_isoformat(analysis.created_at),
+             str(analysis.reused_from) if analysis.reused_from else None, analysis.model)
+            for analysis in batch
+        ]
+        with self._write_lock, self._writer:
+            self._writer.executemany(f"INSERT OR REPLACE INTO analyses ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.flushed_count += len(batch)
+        self.flush_batches += 1
+
+    def _get_by_id(self, analysis_id: UUID) -> Optional[TranscriptAnalysis]:
+        with self._read_lock:
+            row = self._reader.execute(f"SELECT {COLUMNS} FROM analyses WHERE id = ?", (str(analysis_id),)).fetchone()
+        return self._to_analysis(row) if row else None
+
+    def _get_all(self) -> List[TranscriptAnalysis]:
+        with self._read_lock:
+            rows = self._reader.execute(f"SELECT {COLUMNS} FROM analyses ORDER BY created_at, id").fetchall()
+        return [self._to_analysis(row) for row in rows]
+
+    def _list_page(self, limit: int, before: Optional[Tuple[datetime, UUID]], created_from: Optional[datetime],
+                   created_to: Optional[datetime]) -> List[TranscriptAnalysis]:
+        # Keyset pagination over idx_analyses_created_at; timestamps are stored as UTC ISO strings.
+        conditions, parameters = [], []
+        if before is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            parameters.extend([_utc_isoformat(before[0]), str(before[1])])
+        if created_from is not None:
+            conditions.append("created_at >= ?")
+            parameters.append(_utc_isoformat(created_from))
+        if created_to is not None:
+            conditions.append("created_at < ?")
+            parameters.append(_utc_isoformat(created_to))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT {COLUMNS} FROM analyses {where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*parameters, limit)
+            ).fetchall()
+        return [self._to_analysis(row) for row in rows]
+
+    def _count(self) -> int:
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @staticmethod
+    def _to_analysis(row: Tuple) -> TranscriptAnalysis:
+        return TranscriptAnalysis(
+            id=UUID(row[0]),
+            summary=row[1],
+            next_actions=json.loads(row[2]),
+            created_at=datetime.fromisoformat(row[3]),
+            reused_from=UUID(row[4]) if row[4] else None,
+            model=row[5]
+        )
@@ -0,0 +1,71 @@
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from app.infra.rate_limiter import estimate_tokens
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "o200k_base"
+# Chat formatting overhead per message and per reply, as documented for the chat models.
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Optional[Any]:
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        # Unknown models raise KeyError; known ones fail too when the encoding can't be downloaded.
+        pass
+    try:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable for model {model}, falling back to estimates: {str(e)}")
+        return None
+
+
+class TokenCounter:
+    """
+    Local prompt token counts for one model.
+
+    Uses the model's `tiktoken` encoding when the optional `tokenizer` extra is installed
+    and the encoding can be loaded (once per model, then shared), and the
+    characters-per-token heuristic otherwise.
+    """
+
+    def __init__(self, model: str):
+        self._model = model
+        self.counted = 0
+
+    @property
+    def exact(self) -> bool:
+        return _get_encoding(self._model) is not None
+
+    def count(self, text: str) -> int:
+        self.counted += 1
+        encoding = _get_encoding(self._model)
+        if encoding is None:
+            return estimate_tokens(text)
+        return len(encoding.encode(text, disallowed_special=()))
+
+    def count_messages(self, system_prompt: str, user_prompt: str) -> int:
+        return (
+            self.count(system_prompt) + self.count(user_prompt)
+            + 2 * TOKENS_PER_MESSAGE + TOKENS_PER_REPLY
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self._model,
+            "exact": self.exact,
+            "counted": self.counted,
+        }
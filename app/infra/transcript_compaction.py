@@ -0,0 +1,146 @@
+import re
+from collections import Counter
+from functools import cached_property
+from typing import Callable, Dict, Optional, Sequence
+
+from app.infra.rate_limiter import estimate_tokens
+from app.infra.token_counter import TokenCounter
+
+TranscriptStep = Callable[[str], str]
+
+# A speaker name: a capitalized word and up to four more, without sentence punctuation.
+SPEAKER_NAME = r"[A-Z][^\s:?!]*(?:[ \t]+[^\s:?!]+){0,4}"
+# Labels people write in notes that look like a speaker header but are not one.
+NOT_SPEAKERS = r"(?i:note|notes|action|action items?|agenda|decision|question|answer|summary|update|todo|subject|follow[- ]up)"
+
+# Default noise: bracketed timestamps, timestamps leading a speaker's turn and spoken filler
+# words. A line-leading time followed by anything else ("10:30 we agreed...") is content.
+DEFAULT_NOISE_PATTERNS = (
+    r"\[\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?\]",
+    rf"(?m)^\d{{1,2}}:\d{{2}}(?::\d{{2}})?(?:[.,]\d+)?[ \t]+(?={SPEAKER_NAME}:[ \t])",
+    r"(?i)\b(?:um+|uh+|erm|uhm)\b,?",
+)
+SPEAKER_HEADER_PATTERN = re.compile(rf"^(?!{NOT_SPEAKERS}:)({SPEAKER_NAME}):[ \t]", re.MULTILINE)
+HORIZONTAL_WHITESPACE = re.compile(r"[ \t\u00a0]+")
+BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_whitespace(transcript: str) -> str:
+    """Collapses runs of spaces and tabs, trims every line and keeps at most one blank line."""
+    lines = (HORIZONTAL_WHITESPACE.sub(" ", line).strip() for line in transcript.splitlines())
+    return BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+class NoiseFilter:
+    """Removes every match of the given regular expressions."""
+
+    def __init__(self, patterns: Sequence[str] = DEFAULT_NOISE_PATTERNS):
+        self._patterns = [re.compile(pattern) for pattern in patterns]
+
+    def __call__(self, transcript: str) -> str:
+        for pattern in self._patterns:
+            transcript = pattern.sub("", transcript)
+        return transcript
+
+
+class SpeakerAliaser:
+    """
+    Replaces long speaker headers that repeat on many turns (`Mark Foster | MCC, ACTC:`)
+    with short tags (`S1:`) and prepends a legend mapping tags back to names. A speaker is
+    aliased only when that saves more characters than its legend line costs.
+    """
+
+    def __init__(self, min_turns: int = 2):
+        self._min_turns = min_turns
+
+    def __call__(self, transcript: str) -> str:
+        turns = Counter(name.strip() for name in SPEAKER_HEADER_PATTERN.findall(transcript))
+        aliases: Dict[str, str] = {}
+        for name, count in turns.most_common():
+            tag = f"S{len(aliases) + 1}"
+            legend_cost = len(f"{tag} = {name}\n")
+            if count >= self._min_turns and (len(name) - len(tag)) * count > legend_cost:
+                aliases[name] = tag
+        if not aliases:
+            return transcript
+
+        def replace(match: re.Match) -> str:
+            tag = aliases.get(match.group(1).strip())
+            return f"{tag}: " if tag else match.group(0)
+
+        legend = "\n".join(f"{tag} = {name}" for name, tag in aliases.items())
+        return f"Speakers:\n{legend}\n\n{SPEAKER_HEADER_PATTERN.sub(replace, transcript)}"
+
+
+class CompactedTranscript:
+    """Compaction result; token counts are only computed when read, e.g. by the dry run."""
+
+    def __init__(self, original: str, text: str, count: Callable[[str], int]):
+        self.original = original
+        self.text = text
+        self.chars_saved = len(original) - len(text)
+        self._count = count
+
+    @cached_property
+    def original_tokens(self) -> int:
+        return self._count(self.original)
+
+    @cached_property
+    def compacted_tokens(self) -> int:
+        return self._count(self.text)
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+
+class TranscriptPreprocessor:
+    """
+    Pipeline of transcript-to-transcript steps applied before a transcript is put into
+    a prompt. Keeps running totals of the characters it saved; counting tokens on every
+    request would tokenize each transcript twice more, so the totals stay in characters.
+    """
+
+    def __init__(self, steps: Sequence[TranscriptStep], token_counter: Optional[TokenCounter] = None):
+        self._steps = list(steps)
+        self._token_counter = token_counter
+        self.processed = 0
+        self.original_chars = 0
+        self.chars_saved = 0
+
+    def compact(self, transcript: str) -> CompactedTranscript:
+        """Runs the pipeline without recording it in the stats, e.g. for estimates."""
+        compacted = transcript
+        for step in self._steps:
+            compacted = step(compacted)
+        # A step that empties the transcript would leave the LLM nothing to analyze.
+        if not compacted.strip():
+            compacted = transcript
+        return CompactedTranscript(transcript, compacted, self._count)
+
+    def process(self, transcript: str) -> CompactedTranscript:
+        result = self.compact(transcript)
+        self.processed += 1
+        self.original_chars += len(transcript)
+        self.chars_saved += result.chars_saved
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "processed": self.processed,
+            "chars_saved": self.chars_saved,
+            "saved_ratio": self.chars_saved / self.original_chars if self.original_chars else 0.0,
+        }
+
+    def _count(self, text: str) -> int:
+        if self._token_counter is not None:
+            return self._token_counter.count(text)
+        return estimate_tokens(text)
+
+
+def default_preprocessor(noise_patterns: Sequence[str] = DEFAULT_NOISE_PATTERNS,
+                         token_counter: Optional[TokenCounter] = None) -> TranscriptPreprocessor:
+    return TranscriptPreprocessor(
+        [NoiseFilter(noise_patterns), normalize_whitespace, SpeakerAliaser()],
+        token_counter=token_counter
+    )
@@ -1,10 +1,15 @@
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
+from app.api.middleware import NonStreamingGZipMiddleware
 from app.api.routes import router
+from app.infra.di import get_job_repository, get_job_worker_pool, get_repository, get_search_index
+from app.infra.job_worker_pool import BatchJobWorkerPool
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,8 +22,28 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting FastAPI application")
+    # Persistent backends may already hold analyses; index them before serving searches.
+    repository = get_repository()
+    if repository.process_local:
+        await get_search_index().backfill(repository)
+    worker_pool = await start_job_workers()
     yield
     logger.info("Shutting down FastAPI application")
+    if worker_pool is not None:
+        await worker_pool.stop()
+        await get_job_repository().close()
+    await get_repository().close()
+
+
+async def start_job_workers() -> Optional[BatchJobWorkerPool]:
+    """Starts the batch job workers, unless the LLM settings they need are missing."""
+    try:
+        worker_pool = get_job_worker_pool()
+    except ValidationError as e:
+        logger.warning(f"Batch job workers not started, LLM settings are incomplete: {str(e)}")
+        return None
+    await worker_pool.start()
+    return worker_pool
 
 
 app = FastAPI(
@@ -32,7 +57,7 @@ app = FastAPI(
     - Dependency injection
     - Port and adapter pattern
     - Comprehensive error handling
-    - Thread-safe in-memory storage
+    - Bounded in-memory or SQLite storage
     """,
     version="1.0.0",
     lifespan=lifespan
@@ -46,6 +71,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(NonStreamingGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 app.include_router(router, prefix="/api/v1")
 
 
@@ -1 +1,5 @@
-from app.ports.llm import LLm
\ No newline at end of file
+from app.ports.analysis_repository import AnalysisRepository, AnalysisRepositoryListener
+from app.ports.batch_llm import BatchLLm
+from app.ports.job_queue import BatchJobQueue
+from app.ports.job_repository import BatchJobRepository
+from app.ports.llm import LLm
@@ -0,0 +1,72 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from app.domain.models import TranscriptAnalysis
+
+
+class AnalysisRepositoryListener:
+    """Notified synchronously when this process stores or drops an analysis."""
+
+    def on_saved(self, analysis: TranscriptAnalysis) -> None:
+        pass
+
+    def on_removed(self, analysis: TranscriptAnalysis) -> None:
+        pass
+
+
+class AnalysisRepository(ABC):
+    # Whether every change to the store goes through this instance, so its listeners see
+    # all of them; false for stores other processes write to.
+    process_local = True
+
+    def __init__(self):
+        self._listeners: List[AnalysisRepositoryListener] = []
+
+    def add_listener(self, listener: AnalysisRepositoryListener) -> None:
+        self._listeners.append(listener)
+
+    def _notify_saved(self, analysis: TranscriptAnalysis) -> None:
+        for listener in self._listeners:
+            listener.on_saved(analysis)
+
+    def _notify_removed(self, analysis: TranscriptAnalysis) -> None:
+        for listener in self._listeners:
+            listener.on_removed(analysis)
+
+    @abstractmethod
+    async def save(self, analysis: TranscriptAnalysis) -> None:
+        pass
+
+    @abstractmethod
+    async def save_many(self, analyses: List[TranscriptAnalysis]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, analysis_id: UUID) -> Optional[TranscriptAnalysis]:
+        pass
+
+    @abstractmethod
+    async def get_all(self) -> Sequence[TranscriptAnalysis]:
+        pass
+
+    @abstractmethod
+    async def count(self) -> int:
+        pass
+
+    @abstractmethod
+    async def list_page(self, limit: int, before: Optional[Tuple[datetime, UUID]] = None,
+                        created_from: Optional[datetime] = None,
+                        created_to: Optional[datetime] = None) -> List[TranscriptAnalysis]:
+        """
+        Returns up to `limit` analyses, newest first by (created_at, id), strictly older than
+        the `before` key, with `created_from <= created_at < created_to`.
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict[str, float]:
+        pass
+
+    async def close(self) -> None:
+        """Flushes buffered writes and releases resources; a no-op for stores without either."""
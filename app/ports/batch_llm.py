@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from app.domain.models import BulkBatchStatus
+
+
+class BatchLLm(ABC):
+    @abstractmethod
+    async def submit(self, request_file: str) -> str:
+        """Submits a JSONL file of chat completion requests and returns the batch id."""
+
+    @abstractmethod
+    async def get_status(self, batch_id: str) -> BulkBatchStatus:
+        pass
+
+    @abstractmethod
+    async def download_results(self, batch_id: str, destination: str) -> None:
+        """Writes the JSONL output file of a completed batch to `destination`."""
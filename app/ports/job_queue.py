@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+
+class BatchJobQueue(ABC):
+    @abstractmethod
+    def enqueue(self, job_id: UUID, item_count: int) -> None:
+        """Schedules items `0..item_count - 1` of a stored job for processing."""
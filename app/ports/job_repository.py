@@ -0,0 +1,49 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from app.domain.models import BatchJob, BatchJobItem, BatchJobStatus, TranscriptAnalysis
+
+
+class BatchJobRepository(ABC):
+    @abstractmethod
+    async def create_job(self, job: BatchJob, transcripts: List[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def get_job(self, job_id: UUID) -> Optional[BatchJob]:
+        pass
+
+    @abstractmethod
+    async def update_job_status(self, job_id: UUID, status: BatchJobStatus) -> Optional[BatchJob]:
+        pass
+
+    @abstractmethod
+    async def get_item(self, job_id: UUID, index: int) -> Optional[BatchJobItem]:
+        pass
+
+    @abstractmethod
+    async def claim_item(self, job_id: UUID, index: int, lease_seconds: float) -> Optional[BatchJobItem]:
+        """
+        Atomically reserves a pending item for `lease_seconds`, so only one worker in any
+        process runs it; None when the item is done or another worker's lease is still live.
+        """
+
+    @abstractmethod
+    async def record_item_result(self, job_id: UUID, index: int, analysis: Optional[TranscriptAnalysis] = None,
+                                 error: Optional[str] = None) -> Optional[BatchJob]:
+        """Stores the outcome of one item, updates the job counters and completes the job when all items are done."""
+
+    @abstractmethod
+    async def list_items(self, job_id: UUID, offset: int, limit: int) -> List[BatchJobItem]:
+        pass
+
+    @abstractmethod
+    async def list_pending_items(self) -> List[Tuple[UUID, int]]:
+        """
+        Returns (job_id, index) of unprocessed, unclaimed (or lease-expired) items of jobs
+        that are neither completed nor cancelled.
+        """
+
+    async def close(self) -> None:
+        """Releases the store's resources; a no-op for stores without any."""
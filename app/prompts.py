@@ -1,11 +1,35 @@
 SYSTEM_PROMPT = """You are an expert business coach skilled in analyzing conversation transcripts.
-                    Your job is to provide insightful, concise summaries and recommend clear, actionable next steps
-                    to help clients achieve their goals effectively."""
+Your job is to provide insightful, concise summaries and recommend clear, actionable next steps
+to help clients achieve their goals effectively."""
 
 RAW_USER_PROMPT = """Given the transcript below, generate:
-                    1. A brief, insightful summary highlighting key points discussed.
-                    2. A clear, structured list of recommended next actions.
+1. A brief, insightful summary highlighting key points discussed.
+2. A clear, structured list of recommended next actions.
 
-                    Transcript:
-                    {transcript}"""
+Transcript:
+{transcript}"""
 
+CHUNK_USER_PROMPT = """The transcript below is part {part} of {total} of a longer conversation.
+Based only on this part, generate:
+1. A brief summary of the key points discussed in this part.
+2. A list of the next actions agreed or implied in this part.
+
+Transcript part:
+{transcript}"""
+
+REDUCE_USER_PROMPT = """Below are partial analyses of consecutive parts of one long conversation.
+Merge them into a single analysis and generate:
+1. A brief, insightful summary of the whole conversation.
+2. A clear, structured list of recommended next actions, without duplicates.
+
+Partial analyses:
+{partials}"""
+
+PACKED_USER_PROMPT = """Below are {count} separate, unrelated transcripts, each wrapped in a <transcript id="..."> tag.
+Analyze each transcript on its own and, for every one, generate:
+1. A brief, insightful summary highlighting key points discussed.
+2. A clear, structured list of recommended next actions.
+
+Return exactly one analysis per transcript, with transcript_id set to the id of its tag.
+
+{transcripts}"""
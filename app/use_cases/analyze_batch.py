@@ -1,56 +1,249 @@
 import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import List, Union
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
-from app.domain.models import TranscriptAnalysis
-from app.domain.ports import LLm
-from app.infra.memory_repository import MemoryRepository
-from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase
+from app.domain.errors import CircuitOpenError, DomainError, LLMRateLimitError, LLMTimeoutError
+from app.domain.models import PackedLLMAnalysisDTO, TranscriptAnalysis
+from app.domain.ports import AnalysisRepository, LLm
+from app.infra.analysis_cache import normalize_transcript
+from app.infra.circuit_breaker import is_upstream_failure
+from app.infra.rate_limiter import estimate_tokens
+from app.infra.token_counter import TokenCounter
+from app.prompts import SYSTEM_PROMPT, PACKED_USER_PROMPT
+from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase, complete_routed_analysis, save_analyses, validate_transcript
 
 logger = logging.getLogger(__name__)
 
-MAX_CONCURRENT_REQUESTS = 5
-
 
 class BatchAnalysisResult:
-    def __init__(self, transcript: str, analysis: TranscriptAnalysis = None, error: str = None):
+    def __init__(self, transcript: str, analysis: TranscriptAnalysis = None, error: str = None, index: int = None):
         self.transcript = transcript
+        self.index = index
         self.analysis = analysis
         self.error = error
         self.success = analysis is not None
 
 
+class BatchAnalysisResults(List[BatchAnalysisResult]):
+    """Results in input order; `deduplicated_count` is the number of LLM calls saved by deduplication."""
+
+    def __init__(self, results: List[BatchAnalysisResult] = (), deduplicated_count: int = 0):
+        super().__init__(results)
+        self.deduplicated_count = deduplicated_count
+
+
+def group_duplicates(transcripts: List[str]) -> Dict[str, List[int]]:
+    """Maps each distinct transcript, ignoring whitespace differences, to its input positions."""
+    positions: Dict[str, List[int]] = {}
+    for index, transcript in enumerate(transcripts):
+        positions.setdefault(normalize_transcript(transcript), []).append(index)
+    return positions
+
+
+def count_saved_calls(groups: Sequence[List[int]], transcripts: List[str]) -> int:
+    """LLM calls saved by deduplication; duplicates of transcripts that fail validation saved nothing."""
+    saved = 0
+    for positions in groups:
+        try:
+            validate_transcript(transcripts[positions[0]])
+        except DomainError:
+            continue
+        saved += len(positions) - 1
+    return saved
+
+
+def plan_packs(token_counts: Sequence[Tuple[int, int]], token_budget: int,
+               max_items: int) -> Tuple[List[List[int]], List[int]]:
+    """
+    Greedily groups (index, tokens) items, in order, into packs of at most `token_budget`
+    tokens and `max_items` items. Items above half the budget, and packs that would hold a
+    single item, are returned separately for individual calls.
+    """
+    packs: List[List[int]] = []
+    singles: List[int] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, tokens in token_counts:
+        if tokens * 2 > token_budget:
+            singles.append(index)
+            continue
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        packs.append(current)
+    singles.extend(pack[0] for pack in packs if len(pack) == 1)
+    return [pack for pack in packs if len(pack) > 1], singles
+
+
 class AnalyzeBatchUseCase:
-    def __init__(self, llm_port: LLm, repository: MemoryRepository):
+    """
+    Analyzes a list of transcripts concurrently.
+
+    With a `pack_token_budget`, `execute` packs short transcripts into one structured LLM
+    call each, up to that many transcript tokens and `pack_max_items` transcripts, saving
+    the per-request round trip and the repeated system prompt. Packed calls bypass the
+    single-transcript cache; any transcript whose packed result is missing, ambiguous or
+    unparseable is analyzed again on its own, while rate limits, timeouts and upstream
+    failures of a packed call fail each of its transcripts.
+    """
+
+    def __init__(self, llm_port: LLm, repository: AnalysisRepository,
+                 analyze_use_case: Optional[AnalyzeTranscriptUseCase] = None, pack_token_budget: int = 0,
+                 pack_max_items: int = 10, token_counter: Optional[TokenCounter] = None, model_name: str = ""):
         self._llm_port = llm_port
         self._repository = repository
-        self._analyze_use_case = AnalyzeTranscriptUseCase(llm_port, repository)
+        self._analyze_use_case = analyze_use_case or AnalyzeTranscriptUseCase(llm_port, repository, model_name=model_name)
+        self._model_name = model_name
+        self._pack_token_budget = pack_token_budget
+        self._pack_max_items = pack_max_items
+        self._token_counter = token_counter
 
-    async def execute(self, transcripts: List[str]) -> List[BatchAnalysisResult]:
+    async def execute(self, transcripts: List[str]) -> BatchAnalysisResults:
         logger.info(f"Starting batch analysis for {len(transcripts)} transcripts")
         start_time = datetime.now(timezone.utc)
         
-        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        groups = list(group_duplicates(transcripts).values())
+        unique_results = await self._analyze_unique([positions[0] for positions in groups], transcripts)
+        # Duplicates share the analysis of their first occurrence, which is stored once.
+        await save_analyses(self._repository, [result.analysis for result in unique_results if result.success])
         
-        async def analyze_single(transcript: str) -> BatchAnalysisResult:
-            async with semaphore:
-                try:
-                    analysis = await self._analyze_use_case.execute(transcript)
-                    return BatchAnalysisResult(transcript=transcript, analysis=analysis)
-                except Exception as e:
-                    logger.error(f"Failed to analyze transcript: {str(e)}")
-                    return BatchAnalysisResult(transcript=transcript, error=str(e))
-        
-        tasks = [analyze_single(transcript) for transcript in transcripts]
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+        results: List[Optional[BatchAnalysisResult]] = [None] * len(transcripts)
+        for positions, result in zip(groups, unique_results):
+            for index in positions:
+                results[index] = self._for_position(result, index, transcripts[index])
         
         duration = (datetime.now(timezone.utc) - start_time).total_seconds()
         successful_count = sum(1 for result in results if result.success)
+        deduplicated_count = count_saved_calls(groups, transcripts)
         
         logger.info(
             f"Batch analysis completed - total: {len(transcripts)}, "
-            f"successful: {successful_count}, duration: {duration}s"
+            f"successful: {successful_count}, deduplicated: {deduplicated_count}, duration: {duration}s"
+        )
+        
+        return BatchAnalysisResults(results, deduplicated_count)
+
+    async def execute_stream(self, transcripts: List[str]) -> AsyncIterator[BatchAnalysisResult]:
+        """
+        Yields each result as soon as it completes, in completion order; `result.index` is its input position.
+        
+        Duplicate transcripts are analyzed once and their results are yielded together.
+        """
+        logger.info(f"Starting streaming batch analysis for {len(transcripts)} transcripts")
+        start_time = datetime.now(timezone.utc)
+        
+        groups = group_duplicates(transcripts)
+        tasks = [
+            asyncio.ensure_future(self._analyze_single(positions[0], transcripts[positions[0]]))
+            for positions in groups.values()
+        ]
+        duplicate_positions = {positions[0]: positions for positions in groups.values()}
+        successful_count = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                unique_result = await next_result
+                for index in duplicate_positions[unique_result.index]:
+                    result = self._for_position(unique_result, index, transcripts[index])
+                    successful_count += int(result.success)
+                    yield result
+        finally:
+            # The client may disconnect mid-stream; don't leave orphaned LLM calls behind.
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+        
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        logger.info(
+            f"Streaming batch analysis completed - total: {len(transcripts)}, "
+            f"successful: {successful_count}, deduplicated: {count_saved_calls(list(groups.values()), transcripts)}, "
+            f"duration: {duration}s"
         )
+
+    async def _analyze_unique(self, indices: List[int], transcripts: List[str]) -> List[BatchAnalysisResult]:
+        """Analyzes the transcripts at `indices` without persisting; results follow the order of `indices`."""
+        if not self._pack_token_budget:
+            tasks = [self._analyze_single(index, transcripts[index], persist=False) for index in indices]
+            return await asyncio.gather(*tasks, return_exceptions=False)
         
-        return results
\ No newline at end of file
+        token_counts = []
+        singles = []
+        for index in indices:
+            try:
+                validate_transcript(transcripts[index])
+                token_counts.append((index, self._count_tokens(transcripts[index])))
+            except DomainError:
+                # Invalid transcripts fail on their own with the usual per-item error.
+                singles.append(index)
+        packs, unpacked = plan_packs(token_counts, self._pack_token_budget, self._pack_max_items)
+        outcomes = await asyncio.gather(
+            *[self._analyze_pack(pack, transcripts) for pack in packs],
+            *[self._analyze_single(index, transcripts[index], persist=False) for index in singles + unpacked]
+        )
+        by_index: Dict[int, BatchAnalysisResult] = {}
+        for outcome in outcomes:
+            for result in outcome if isinstance(outcome, list) else [outcome]:
+                by_index[result.index] = result
+        logger.info(f"Packed {sum(len(pack) for pack in packs)} transcripts into {len(packs)} LLM calls")
+        return [by_index[index] for index in indices]
+
+    async def _analyze_pack(self, pack: List[int], transcripts: List[str]) -> List[BatchAnalysisResult]:
+        user_prompt = PACKED_USER_PROMPT.format(
+            count=len(pack),
+            transcripts="\n\n".join(
+                f'<transcript id="{position}">\n{transcripts[index]}\n</transcript>'
+                for position, index in enumerate(pack)
+            )
+        )
+        try:
+            response, model = await complete_routed_analysis(self._llm_port, SYSTEM_PROMPT, user_prompt, PackedLLMAnalysisDTO)
+            id_counts = Counter(item.transcript_id for item in response.analyses)
+            items = {item.transcript_id: item for item in response.analyses if id_counts[item.transcript_id] == 1}
+        except Exception as e:
+            if isinstance(e, (LLMRateLimitError, LLMTimeoutError, CircuitOpenError)) or is_upstream_failure(e):
+                # Splitting the pack would only multiply calls to a throttled or failing service.
+                logger.error(f"Packed analysis of {len(pack)} transcripts failed: {str(e)}")
+                return [BatchAnalysisResult(transcript=transcripts[index], error=str(e), index=index) for index in pack]
+            logger.error(f"Packed analysis of {len(pack)} transcripts could not be used: {str(e)}")
+            items = {}
+        
+        results = []
+        retry = []
+        for position, index in enumerate(pack):
+            item = items.get(position)
+            if item is None or not item.summary.strip():
+                retry.append(index)
+                continue
+            analysis = TranscriptAnalysis(summary=item.summary, next_actions=item.action_items,
+                                          model=model or self._model_name or None)
+            results.append(BatchAnalysisResult(transcript=transcripts[index], analysis=analysis, index=index))
+        if retry:
+            logger.warning(f"Analyzing {len(retry)} of {len(pack)} packed transcripts individually")
+            results.extend(await asyncio.gather(
+                *[self._analyze_single(index, transcripts[index], persist=False) for index in retry]
+            ))
+        return results
+
+    def _count_tokens(self, transcript: str) -> int:
+        if self._token_counter is not None:
+            return self._token_counter.count(transcript)
+        return estimate_tokens(transcript)
+
+    @staticmethod
+    def _for_position(result: BatchAnalysisResult, index: int, transcript: str) -> BatchAnalysisResult:
+        if result.index == index:
+            return result
+        return BatchAnalysisResult(transcript=transcript, analysis=result.analysis, error=result.error, index=index)
+
+    async def _analyze_single(self, index: int, transcript: str, persist: bool = True) -> BatchAnalysisResult:
+        # LLM concurrency is bounded process-wide by the limiter wrapped around the LLM port.
+        try:
+            analysis = await self._analyze_use_case.execute(transcript, persist=persist)
+            return BatchAnalysisResult(transcript=transcript, analysis=analysis, index=index)
+        except Exception as e:
+            logger.error(f"Failed to analyze transcript: {str(e)}")
+            return BatchAnalysisResult(transcript=transcript, error=str(e), index=index)
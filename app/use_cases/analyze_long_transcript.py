@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, Optional, Tuple
+from uuid import uuid4
+
+from app.domain.errors import EmptyTranscriptError, TranscriptTooLargeError
+from app.domain.models import LLMAnalysisDTO, TranscriptAnalysis
+from app.domain.ports import AnalysisRepository, LLm
+from app.infra.rate_limiter import estimate_tokens
+from app.infra.token_counter import TokenCounter
+from app.prompts import SYSTEM_PROMPT, RAW_USER_PROMPT, CHUNK_USER_PROMPT, REDUCE_USER_PROMPT
+from app.use_cases.analyze_transcript import complete_routed_analysis, save_analyses
+
+logger = logging.getLogger(__name__)
+
+MAX_LONG_TRANSCRIPT_SIZE = 5 * 1024 * 1024  # 5MB
+
+SPEAKER_TURN_PATTERN = re.compile(r"^[^\s:][^:\n]{0,79}:\s")
+
+
+def split_speaker_turns(transcript: str) -> List[str]:
+    turns: List[str] = []
+    current: List[str] = []
+    for line in transcript.splitlines():
+        if SPEAKER_TURN_PATTERN.match(line) and current:
+            turns.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if current:
+        turns.append("\n".join(current).strip())
+    return [turn for turn in turns if turn]
+
+
+def split_to_fit(text: str, tokens: int, max_tokens: int, count: Callable[[str], int]) -> List[Tuple[str, int]]:
+    """Hard-splits `text` of `tokens` tokens into equal slices of at most `max_tokens`, with their counts."""
+    parts = -(-tokens // max_tokens)
+    while True:
+        size = -(-len(text) // parts)
+        pieces = [(text[start:start + size], count(text[start:start + size])) for start in range(0, len(text), size)]
+        if all(piece_tokens <= max_tokens for _, piece_tokens in pieces):
+            return pieces
+        parts += 1
+
+
+def chunk_turns(turns: List[str], max_tokens: int, overlap_turns: int,
+                token_counter: Optional[TokenCounter] = None) -> List[str]:
+    """Packs consecutive turns into chunks of at most `max_tokens`, repeating the last `overlap_turns` turns."""
+    count = token_counter.count if token_counter is not None else estimate_tokens
+    pieces: List[Tuple[str, int]] = []
+    for turn in turns:
+        turn_tokens = count(turn)
+        if turn_tokens <= max_tokens:
+            pieces.append((turn, turn_tokens))
+        else:
+            pieces.extend(split_to_fit(turn, turn_tokens, max_tokens, count))
+
+    chunks: List[str] = []
+    current: List[Tuple[str, int]] = []
+    current_tokens = 0
+    for piece, piece_tokens in pieces:
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append("\n\n".join(text for text, _ in current))
+            current = current[-overlap_turns:] if overlap_turns else []
+            current_tokens = sum(tokens for _, tokens in current)
+            while current and current_tokens + piece_tokens > max_tokens:
+                current_tokens -= current.pop(0)[1]
+        current.append((piece, piece_tokens))
+        current_tokens += piece_tokens
+    if current:
+        chunks.append("\n\n".join(text for text, _ in current))
+    return chunks
+
+
+async def gather_or_cancel(calls: List[Awaitable]) -> list:
+    """Like `asyncio.gather`, but cancels the calls still running as soon as one fails."""
+    tasks = [asyncio.ensure_future(call) for call in calls]
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def dedupe_actions(actions: List[str]) -> List[str]:
+    seen = set()
+    unique: List[str] = []
+    for action in actions:
+        key = " ".join(re.sub(r"[^\w\s]", " ", action.lower()).split())
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(action.strip())
+    return unique
+
+
+class AnalyzeLongTranscriptUseCase:
+    """
+    Map-reduce analysis for transcripts above `MAX_TRANSCRIPT_SIZE`.
+
+    The transcript is split on speaker turns into token-bounded, overlapping chunks that
+    are summarized in parallel (bounded by the shared LLM concurrency limiter). Partial
+    results are merged level by level, each reduce call taking as many partials as fit
+    in `reduce_tokens`, so latency grows with the depth of the tree rather than the
+    transcript length.
+    """
+
+    def __init__(self, llm_port: LLm, repository: AnalysisRepository, chunk_tokens: int = 6000,
+                 overlap_turns: int = 2, reduce_tokens: int = 6000, max_size: int = MAX_LONG_TRANSCRIPT_SIZE,
+                 model_name: str = "", token_counter: Optional[TokenCounter] = None):
+        self._llm_port = llm_port
+        self._repository = repository
+        self._chunk_tokens = chunk_tokens
+        self._overlap_turns = overlap_turns
+        self._reduce_tokens = reduce_tokens
+        self._max_size = max_size
+        self._model_name = model_name
+        self._token_counter = token_counter
+
+    async def execute(self, transcript: str) -> TranscriptAnalysis:
+        correlation_id = uuid4()
+        logger.info(f"Starting long transcript analysis - correlation_id: {correlation_id}")
+        start_time = datetime.now(timezone.utc)
+
+        if not transcript or not transcript.strip():
+            raise EmptyTranscriptError()
+        size = len(transcript.encode('utf-8'))
+        if size > self._max_size:
+            raise TranscriptTooLargeError(size, self._max_size)
+
+        # Tokenizing megabytes of text is CPU-bound, so it runs off the event loop.
+        chunks = await asyncio.to_thread(
+            chunk_turns, split_speaker_turns(transcript), self._chunk_tokens, self._overlap_turns, self._token_counter
+        )
+        if len(chunks) == 1:
+            result, model = await complete_routed_analysis(
+                self._llm_port, SYSTEM_PROMPT, RAW_USER_PROMPT.format(transcript=chunks[0])
+            )
+            depth = 1
+        else:
+            # One failed chunk fails the analysis; don't keep spending on the others.
+            partials = await gather_or_cancel([
+                complete_routed_analysis(
+                    self._llm_port,
+                    SYSTEM_PROMPT,
+                    CHUNK_USER_PROMPT.format(part=index + 1, total=len(chunks), transcript=chunk)
+                )
+                for index, chunk in enumerate(chunks)
+            ])
+            (result, model), depth = await self._reduce([partial for partial, _ in partials])
+
+        analysis = TranscriptAnalysis(
+            id=correlation_id,
+            summary=result.summary,
+            next_actions=dedupe_actions(result.action_items),
+            created_at=datetime.now(timezone.utc),
+            # The model that wrote the final summary; map calls may have been routed elsewhere.
+            model=model or self._model_name or None
+        )
+        await save_analyses(self._repository, [analysis])
+
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        logger.info(
+            f"Long transcript analysis completed - correlation_id: {correlation_id}, chunks: {len(chunks)}, "
+            f"depth: {depth}, duration: {duration}s"
+        )
+        return analysis
+
+    async def _reduce(self, partials: List[LLMAnalysisDTO]) -> tuple:
+        """Returns the final (analysis, serving model) pair and the depth of the tree."""
+        depth = 1
+        while True:
+            groups = self._group_partials(partials)
+            depth += 1
+            reduced = await gather_or_cancel([
+                complete_routed_analysis(
+                    self._llm_port,
+                    SYSTEM_PROMPT,
+                    REDUCE_USER_PROMPT.format(partials=self._format_partials(group))
+                )
+                for group in groups
+            ])
+            if len(reduced) == 1:
+                return reduced[0], depth
+            partials = [partial for partial, _ in reduced]
+
+    def _group_partials(self, partials: List[LLMAnalysisDTO]) -> List[List[LLMAnalysisDTO]]:
+        groups: List[List[LLMAnalysisDTO]] = []
+        current: List[LLMAnalysisDTO] = []
+        current_tokens = 0
+        for partial in partials:
+            partial_tokens = self._count(self._format_partials([partial]))
+            # Always merge at least two partials per group so every level shrinks the tree.
+            if len(current) >= 2 and current_tokens + partial_tokens > self._reduce_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(partial)
+            current_tokens += partial_tokens
+        if len(current) == 1 and groups:
+            groups[-1].append(current[0])
+        elif current:
+            groups.append(current)
+        return groups
+
+    def _count(self, text: str) -> int:
+        if self._token_counter is not None:
+            return self._token_counter.count(text)
+        return estimate_tokens(text)
+
+    @staticmethod
+    def _format_partials(partials: List[LLMAnalysisDTO]) -> str:
+        return "\n\n".join(
+            f"Summary: {partial.summary}\nActions:\n" + "\n".join(f"- {action}" for action in partial.action_items)
+            for partial in partials
+        )
@@ -1,26 +1,108 @@
+import asyncio
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from uuid import uuid4
+from typing import Iterator, List, Optional, Tuple
+from uuid import UUID, uuid4
 
 import openai
+from pydantic import BaseModel
 
-from app.domain.errors import EmptyTranscriptError, TranscriptTooLargeError, LLMServiceError, LLMTimeoutError, LLMRateLimitError
-from app.domain.models import TranscriptAnalysis, LLMAnalysisDTO
-from app.domain.ports import LLm
-from app.infra.memory_repository import MemoryRepository
+from app.domain.errors import AnalysisStoreFullError, EmptyTranscriptError, TranscriptTooLargeError, TranscriptTooManyTokensError, LLMServiceError, LLMTimeoutError, LLMRateLimitError
+from app.domain.models import TranscriptAnalysis, LLMAnalysisDTO, ModelCompletion
+from app.domain.ports import AnalysisRepository, LLm
+from app.infra.analysis_cache import AnalysisCache, build_cache_key
+from app.infra.near_duplicate_index import NearDuplicateIndex
+from app.infra.single_flight import SingleFlight
+from app.infra.token_counter import TokenCounter
+from app.infra.transcript_compaction import TranscriptPreprocessor
 from app.prompts import SYSTEM_PROMPT, RAW_USER_PROMPT
 
 logger = logging.getLogger(__name__)
 
-MAX_TRANSCRIPT_SIZE = 100 * 1024  # 100KB
+MAX_TRANSCRIPT_SIZE = 100 * 1024  # 100KB of UTF-8
+
+
+def validate_transcript(transcript: str, token_counter: Optional[TokenCounter] = None, max_tokens: int = 0) -> Optional[int]:
+    """Raises on empty or oversized transcripts; returns the token count when a counter is given."""
+    if not transcript or not transcript.strip():
+        raise EmptyTranscriptError()
+    
+    size = len(transcript.encode('utf-8'))
+    if size > MAX_TRANSCRIPT_SIZE:
+        raise TranscriptTooLargeError(size, MAX_TRANSCRIPT_SIZE)
+    
+    if token_counter is None:
+        return None
+    tokens = token_counter.count(transcript)
+    if max_tokens and tokens > max_tokens:
+        raise TranscriptTooManyTokensError(tokens, max_tokens)
+    return tokens
+
+
+async def save_analyses(repository: AnalysisRepository, analyses: List[TranscriptAnalysis]) -> None:
+    """Stores analyses whose LLM calls are already paid for; a full store is logged instead of failing the request."""
+    if not analyses:
+        return
+    try:
+        await repository.save_many(analyses)
+    except AnalysisStoreFullError as e:
+        logger.error(f"{len(analyses)} analyses returned without being stored: {str(e)}")
+
+
+async def complete_analysis(llm_port: LLm, system_prompt: str, user_prompt: str,
+                            dto: type[BaseModel] = LLMAnalysisDTO) -> BaseModel:
+    with translate_llm_errors():
+        if hasattr(llm_port, 'run_completion_async'):
+            return await llm_port.run_completion_async(
+                system_prompt, user_prompt, dto
+            )
+        return llm_port.run_completion(
+            system_prompt, user_prompt, dto
+        )
+
+
+async def complete_routed_analysis(llm_port: LLm, system_prompt: str, user_prompt: str,
+                                   dto: type[BaseModel] = LLMAnalysisDTO) -> Tuple[BaseModel, Optional[str]]:
+    """Like `complete_analysis`, but also returns the serving model when the port routes between models."""
+    if not hasattr(llm_port, 'run_routed_completion_async'):
+        return await complete_analysis(llm_port, system_prompt, user_prompt, dto), None
+    with translate_llm_errors():
+        return await llm_port.run_routed_completion_async(system_prompt, user_prompt, dto)
+
+
+@contextmanager
+def translate_llm_errors() -> Iterator[None]:
+    try:
+        yield
+    except openai.RateLimitError as e:
+        logger.error(f"OpenAI rate limit exceeded: {e}")
+        raise LLMRateLimitError()
+    except openai.APITimeoutError as e:
+        logger.error(f"OpenAI request timed out: {e}")
+        raise LLMTimeoutError()
+    except openai.APIError as e:
+        logger.error(f"OpenAI API error: {e}")
+        raise LLMServiceError(str(e))
 
 
 class AnalyzeTranscriptUseCase:
-    def __init__(self, llm_port: LLm, repository: MemoryRepository):
+    def __init__(self, llm_port: LLm, repository: AnalysisRepository, cache: Optional[AnalysisCache] = None,
+                 model_name: str = "", single_flight: Optional[SingleFlight] = None,
+                 token_counter: Optional[TokenCounter] = None, max_tokens: int = 0,
+                 near_duplicates: Optional[NearDuplicateIndex] = None,
+                 preprocessor: Optional[TranscriptPreprocessor] = None):
         self._llm_port = llm_port
         self._repository = repository
+        self._cache = cache
+        self._model_name = model_name
+        self._single_flight = single_flight
+        self._token_counter = token_counter
+        self._max_tokens = max_tokens
+        self._near_duplicates = near_duplicates
+        self._preprocessor = preprocessor
 
-    async def execute(self, transcript: str) -> TranscriptAnalysis:
+    async def execute(self, transcript: str, bypass_cache: bool = False, persist: bool = True) -> TranscriptAnalysis:
         correlation_id = str(uuid4())
         logger.info(f"Starting transcript analysis - correlation_id: {correlation_id}")
         
@@ -29,30 +111,41 @@ class AnalyzeTranscriptUseCase:
         try:
             self._validate_transcript(transcript)
             
-            user_prompt = RAW_USER_PROMPT.format(transcript=transcript)
+            completion = None
+            cache_key = None
+            if self._cache is not None or self._single_flight is not None:
+                cache_key = build_cache_key(transcript, self._model_name, SYSTEM_PROMPT, RAW_USER_PROMPT)
+            
+            if self._cache is not None and not bypass_cache:
+                completion = self._cache.get(cache_key)
+                if completion is not None:
+                    logger.info(f"Analysis cache hit - correlation_id: {correlation_id}")
+            
+            signature = None
+            if completion is None and self._near_duplicates is not None and not bypass_cache:
+                signature = await asyncio.to_thread(self._near_duplicates.signature, transcript)
+                reused = await self._find_near_duplicate(signature, correlation_id)
+                if reused is not None:
+                    if persist:
+                        await save_analyses(self._repository, [reused])
+                    return reused
             
-            try:
-                if hasattr(self._llm_port, 'run_completion_async'):
-                    llm_response = await self._llm_port.run_completion_async(
-                        SYSTEM_PROMPT, user_prompt, LLMAnalysisDTO
-                    )
+            if completion is None:
+                user_prompt = self._build_user_prompt(transcript, correlation_id)
+                if self._single_flight is not None:
+                    completion = await self._single_flight.do(cache_key, lambda: self._complete(user_prompt))
                 else:
-                    llm_response = self._llm_port.run_completion(
-                        SYSTEM_PROMPT, user_prompt, LLMAnalysisDTO
-                    )
-            except openai.RateLimitError as e:
-                logger.error(f"OpenAI rate limit exceeded: {e}")
-                raise LLMRateLimitError()
-            except openai.APITimeoutError as e:
-                logger.error(f"OpenAI request timed out: {e}")
-                raise LLMTimeoutError()
-            except openai.APIError as e:
-                logger.error(f"OpenAI API error: {e}")
-                raise LLMServiceError(str(e))
+                    completion = await self._complete(user_prompt)
+                if self._cache is not None:
+                    self._cache.set(cache_key, completion)
             
-            analysis = self._map_to_domain_model(llm_response, correlation_id)
+            analysis = self._map_to_domain_model(completion, correlation_id)
+            if signature is not None:
+                self._near_duplicates.add(signature, analysis.id)
             
-            await self._repository.save(analysis)
+            # Callers passing persist=False store the analysis themselves, e.g. with save_many.
+            if persist:
+                await save_analyses(self._repository, [analysis])
             
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             logger.info(f"Transcript analysis completed - correlation_id: {correlation_id}, duration: {duration}s")
@@ -64,21 +157,51 @@ class AnalyzeTranscriptUseCase:
             logger.error(f"Transcript analysis failed - correlation_id: {correlation_id}, duration: {duration}s, error: {str(e)}")
             raise
 
+    async def _find_near_duplicate(self, signature: object, correlation_id: str) -> Optional[TranscriptAnalysis]:
+        match = self._near_duplicates.query(signature)
+        if match is None:
+            return None
+        original_id, similarity = match
+        # The original may have been evicted from the repository since it was indexed.
+        original = await self._repository.get_by_id(original_id)
+        if original is None:
+            return None
+        logger.info(f"Reusing analysis {original_id} of a near-duplicate transcript (similarity {similarity:.2f}) - correlation_id: {correlation_id}")
+        return TranscriptAnalysis(
+            id=UUID(correlation_id),
+            summary=original.summary,
+            next_actions=original.next_actions,
+            created_at=datetime.now(timezone.utc),
+            reused_from=original.id,
+            model=original.model
+        )
+
+    def _build_user_prompt(self, transcript: str, correlation_id: str) -> str:
+        if self._preprocessor is None:
+            return RAW_USER_PROMPT.format(transcript=transcript)
+        compacted = self._preprocessor.process(transcript)
+        logger.info(
+            f"Transcript compacted from {len(transcript)} to {len(compacted.text)} characters "
+            f"- correlation_id: {correlation_id}"
+        )
+        return RAW_USER_PROMPT.format(transcript=compacted.text)
+
+    async def _complete(self, user_prompt: str) -> ModelCompletion:
+        response, model = await complete_routed_analysis(self._llm_port, SYSTEM_PROMPT, user_prompt)
+        return ModelCompletion(response=response, model=model or self._model_name or None)
+
     def _validate_transcript(self, transcript: str) -> None:
-        if not transcript or not transcript.strip():
-            raise EmptyTranscriptError()
-        
-        if len(transcript.encode('utf-8')) > MAX_TRANSCRIPT_SIZE:
-            raise TranscriptTooLargeError(
-                len(transcript.encode('utf-8')), 
-                MAX_TRANSCRIPT_SIZE
-            )
+        if self._max_tokens:
+            validate_transcript(transcript, self._token_counter, self._max_tokens)
+        else:
+            validate_transcript(transcript)
 
-    def _map_to_domain_model(self, llm_response: LLMAnalysisDTO, correlation_id: str) -> TranscriptAnalysis:
+    def _map_to_domain_model(self, completion: ModelCompletion, correlation_id: str) -> TranscriptAnalysis:
         from uuid import UUID
         return TranscriptAnalysis(
             id=UUID(correlation_id),
-            summary=llm_response.summary,
-            next_actions=llm_response.action_items,
-            created_at=datetime.now(timezone.utc)
+            summary=completion.response.summary,
+            next_actions=list(completion.response.action_items),
+            created_at=datetime.now(timezone.utc),
+            model=completion.model
         )
\ No newline at end of file
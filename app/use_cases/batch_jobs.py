@@ -0,0 +1,58 @@
+import logging
+from typing import List, Tuple
+from uuid import UUID
+
+from app.domain.errors import JobNotFoundError
+from app.domain.models import BatchJob, BatchJobItem, BatchJobStatus
+from app.ports.job_queue import BatchJobQueue
+from app.ports.job_repository import BatchJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class SubmitBatchJobUseCase:
+    def __init__(self, repository: BatchJobRepository, worker_pool: BatchJobQueue):
+        self._repository = repository
+        self._worker_pool = worker_pool
+
+    async def execute(self, transcripts: List[str]) -> BatchJob:
+        job = BatchJob(total_count=len(transcripts))
+        await self._repository.create_job(job, transcripts)
+        self._worker_pool.enqueue(job.id, len(transcripts))
+        logger.info(f"Batch job submitted - job_id: {job.id}, total: {job.total_count}")
+        return job
+
+
+class GetBatchJobUseCase:
+    def __init__(self, repository: BatchJobRepository):
+        self._repository = repository
+
+    async def execute(self, job_id: UUID) -> BatchJob:
+        job = await self._repository.get_job(job_id)
+        if job is None:
+            raise JobNotFoundError(str(job_id))
+        return job
+
+
+class GetBatchJobResultsUseCase:
+    def __init__(self, repository: BatchJobRepository):
+        self._repository = repository
+
+    async def execute(self, job_id: UUID, offset: int, limit: int) -> Tuple[BatchJob, List[BatchJobItem]]:
+        job = await self._repository.get_job(job_id)
+        if job is None:
+            raise JobNotFoundError(str(job_id))
+        items = await self._repository.list_items(job_id, offset, limit)
+        return job, items
+
+
+class CancelBatchJobUseCase:
+    def __init__(self, repository: BatchJobRepository):
+        self._repository = repository
+
+    async def execute(self, job_id: UUID) -> BatchJob:
+        job = await self._repository.update_job_status(job_id, BatchJobStatus.CANCELLED)
+        if job is None:
+            raise JobNotFoundError(str(job_id))
+        logger.info(f"Batch job cancel requested - job_id: {job_id}, status: {job.status.value}")
+        return job
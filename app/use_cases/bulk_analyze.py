@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Type
+from uuid import UUID, uuid4
+
+import pydantic
+
+from app.domain.errors import BulkBatchFailedError
+from app.domain.models import BulkBatchStatus, LLMAnalysisDTO, TranscriptAnalysis
+from app.domain.ports import AnalysisRepository
+from app.ports.batch_llm import BatchLLm
+from app.prompts import SYSTEM_PROMPT, RAW_USER_PROMPT
+from app.use_cases.analyze_transcript import validate_transcript
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (
+    BulkBatchStatus.COMPLETED,
+    BulkBatchStatus.FAILED,
+    BulkBatchStatus.EXPIRED,
+    BulkBatchStatus.CANCELLED,
+)
+CUSTOM_ID_PREFIX = "transcript-"
+INGEST_BATCH_SIZE = 500
+
+
+def build_response_format(dto: Type[pydantic.BaseModel]) -> dict:
+    schema = dto.model_json_schema()
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": dto.__name__, "strict": True, "schema": schema},
+    }
+
+
+class BulkAnalysisReport:
+    def __init__(self):
+        self.batch_id: Optional[str] = None
+        self.total_count = 0
+        self.analysis_ids: Dict[int, UUID] = {}
+        self.errors: Dict[int, str] = {}
+
+    @property
+    def successful_count(self) -> int:
+        return len(self.analysis_ids)
+
+    @property
+    def failed_count(self) -> int:
+        return len(self.errors)
+
+
+class BulkAnalyzeUseCase:
+    """
+    Offline analysis of many transcripts through a provider batch API.
+
+    Prompts are written to a JSONL request file, submitted through the `BatchLLm` port
+    and polled until the batch finishes; the output file is then parsed line by line
+    into `TranscriptAnalysis` records in the repository. None of this uses the realtime
+    concurrency or rate-limit budget.
+    """
+
+    def __init__(self, batch_llm: BatchLLm, repository: AnalysisRepository, model_name: str, work_dir: str,
+                 poll_interval: float = 60.0):
+        self._batch_llm = batch_llm
+        self._repository = repository
+        self._model_name = model_name
+        self._work_dir = work_dir
+        self._poll_interval = poll_interval
+
+    async def execute(self, transcripts: Iterable[str]) -> BulkAnalysisReport:
+        run_id = uuid4().hex
+        start_time = datetime.now(timezone.utc)
+        os.makedirs(self._work_dir, exist_ok=True)
+        request_path = os.path.join(self._work_dir, f"bulk-{run_id}-requests.jsonl")
+        output_path = os.path.join(self._work_dir, f"bulk-{run_id}-output.jsonl")
+
+        report = BulkAnalysisReport()
+        try:
+            request_count = await asyncio.to_thread(self._write_requests, transcripts, request_path, report)
+            if request_count == 0:
+                logger.info("Bulk analysis skipped - no valid transcripts")
+                return report
+
+            report.batch_id = await self._batch_llm.submit(request_path)
+            logger.info(f"Bulk batch submitted - batch_id: {report.batch_id}, requests: {request_count}")
+
+            status = await self._wait_for_completion(report.batch_id)
+            if status != BulkBatchStatus.COMPLETED:
+                raise BulkBatchFailedError(report.batch_id, status.value)
+
+            await self._batch_llm.download_results(report.batch_id, output_path)
+            await self._ingest_results(output_path, report)
+        finally:
+            await asyncio.to_thread(self._remove_work_files, request_path, output_path)
+
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        logger.info(
+            f"Bulk analysis completed - batch_id: {report.batch_id}, total: {report.total_count}, "
+            f"successful: {report.successful_count}, duration: {duration}s"
+        )
+        return report
+
+    def _write_requests(self, transcripts: Iterable[str], request_path: str, report: BulkAnalysisReport) -> int:
+        response_format = build_response_format(LLMAnalysisDTO)
+        request_count = 0
+        with open(request_path, "w", encoding="utf-8") as requests:
+            for index, transcript in enumerate(transcripts):
+                report.total_count += 1
+                try:
+                    validate_transcript(transcript)
+                except Exception as e:
+                    report.errors[index] = str(e)
+                    continue
+                request = {
+                    "custom_id": f"{CUSTOM_ID_PREFIX}{index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": self._model_name,
+                        "messages": [
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": RAW_USER_PROMPT.format(transcript=transcript)},
+                        ],
+                        "response_format": response_format,
+                    },
+                }
+                requests.write(json.dumps(request) + "\n")
+                request_count += 1
+        return request_count
+
+    async def _wait_for_completion(self, batch_id: str) -> BulkBatchStatus:
+        while True:
+            status = await self._batch_llm.get_status(batch_id)
+            if status in TERMINAL_STATUSES:
+                return status
+            await asyncio.sleep(self._poll_interval)
+
+    async def _ingest_results(self, output_path: str, report: BulkAnalysisReport) -> None:
+        with open(output_path, encoding="utf-8") as output:
+            while True:
+                # Read off the event loop, one save_many worth of lines at a time.
+                lines = await asyncio.to_thread(list, itertools.islice(output, INGEST_BATCH_SIZE))
+                if not lines:
+                    break
+                analyses: List[TranscriptAnalysis] = []
+                for line in lines:
+                    if not line.strip():
+                        continue
+                    index = None
+                    try:
+                        record = json.loads(line)
+                        index = int(record["custom_id"][len(CUSTOM_ID_PREFIX):])
+                        analysis = self._parse_record(record, self._model_name)
+                    except Exception as e:
+                        # A line without a readable custom_id can't be matched to its transcript;
+                        # that transcript is reported below as having no result.
+                        if index is None:
+                            logger.warning(f"Skipping malformed bulk output line - batch_id: {report.batch_id}, error: {str(e)}")
+                        else:
+                            report.errors[index] = str(e)
+                        continue
+                    analyses.append(analysis)
+                    report.analysis_ids[index] = analysis.id
+                if analyses:
+                    await self._repository.save_many(analyses)
+        for index in range(report.total_count):
+            if index not in report.analysis_ids and index not in report.errors:
+                report.errors[index] = "No result in batch output"
+
+    @staticmethod
+    def _remove_work_files(*paths: str) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _parse_record(record: dict, model_name: str) -> TranscriptAnalysis:
+        if record.get("error"):
+            raise ValueError(record["error"].get("message", "Batch request failed"))
+        response = record["response"]
+        if response["status_code"] != 200:
+            raise ValueError(f"Batch request failed with status {response['status_code']}")
+        content = response["body"]["choices"][0]["message"]["content"]
+        llm_response = LLMAnalysisDTO.model_validate_json(content)
+        return TranscriptAnalysis(summary=llm_response.summary, next_actions=llm_response.action_items,
+                                  model=response["body"].get("model") or model_name or None)
@@ -0,0 +1,60 @@
+import logging
+from typing import Optional
+
+from app.domain.models import AnalysisEstimate
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter
+from app.infra.latency_model import LatencyModel
+from app.infra.token_counter import TokenCounter
+from app.infra.transcript_compaction import TranscriptPreprocessor
+from app.prompts import SYSTEM_PROMPT, RAW_USER_PROMPT
+from app.use_cases.analyze_transcript import validate_transcript
+
+logger = logging.getLogger(__name__)
+
+
+class EstimateAnalysisUseCase:
+    """
+    Dry run of `AnalyzeTranscriptUseCase`: validates the transcript and predicts token usage
+    and latency without calling the LLM.
+
+    The queue estimate assumes the calls already waiting on the concurrency limiter are
+    drained `limit` at a time, each taking about as long as this one.
+    """
+
+    def __init__(self, token_counter: TokenCounter, latency_model: LatencyModel, model_name: str,
+                 expected_output_tokens: int, max_tokens: int = 0,
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+                 preprocessor: Optional[TranscriptPreprocessor] = None):
+        self._token_counter = token_counter
+        self._latency_model = latency_model
+        self._model_name = model_name
+        self._expected_output_tokens = expected_output_tokens
+        self._max_tokens = max_tokens
+        self._limiter = limiter
+        self._preprocessor = preprocessor
+
+    async def execute(self, transcript: str) -> AnalysisEstimate:
+        validate_transcript(transcript, self._token_counter, self._max_tokens)
+
+        tokens_saved = 0
+        if self._preprocessor is not None:
+            compacted = self._preprocessor.compact(transcript)
+            transcript, tokens_saved = compacted.text, compacted.tokens_saved
+        prompt_tokens = self._token_counter.count_messages(
+            SYSTEM_PROMPT, RAW_USER_PROMPT.format(transcript=transcript)
+        )
+        latency = self._latency_model.predict(prompt_tokens)
+        queue_seconds = 0.0
+        if self._limiter is not None and self._limiter.queue_depth:
+            queue_seconds = latency * self._limiter.queue_depth / self._limiter.limit
+
+        logger.info(f"Analysis estimate - prompt_tokens: {prompt_tokens}, predicted_latency: {latency:.2f}s")
+        return AnalysisEstimate(
+            model=self._model_name,
+            prompt_tokens=prompt_tokens,
+            expected_output_tokens=self._expected_output_tokens,
+            tokens_exact=self._token_counter.exact,
+            predicted_latency_seconds=latency,
+            predicted_queue_seconds=queue_seconds,
+            compaction_tokens_saved=tokens_saved
+        )
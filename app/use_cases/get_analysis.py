@@ -3,13 +3,13 @@ from uuid import UUID
 
 from app.domain.errors import AnalysisNotFoundError
 from app.domain.models import TranscriptAnalysis
-from app.infra.memory_repository import MemoryRepository
+from app.domain.ports import AnalysisRepository
 
 logger = logging.getLogger(__name__)
 
 
 class GetAnalysisUseCase:
-    def __init__(self, repository: MemoryRepository):
+    def __init__(self, repository: AnalysisRepository):
         self._repository = repository
 
     async def execute(self, analysis_id: UUID) -> TranscriptAnalysis:
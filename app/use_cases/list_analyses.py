@@ -0,0 +1,49 @@
+import base64
+import logging
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+from app.domain.errors import InvalidCursorError
+from app.domain.models import AnalysisPage, TranscriptAnalysis
+from app.domain.ports import AnalysisRepository
+
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(analysis: TranscriptAnalysis) -> str:
+    key = f"{analysis.created_at.astimezone(timezone.utc).isoformat()}|{analysis.id}"
+    return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        created_at, analysis_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return _as_utc(datetime.fromisoformat(created_at)), UUID(analysis_id)
+    except ValueError:
+        raise InvalidCursorError(cursor)
+
+
+def _as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class ListAnalysesUseCase:
+    def __init__(self, repository: AnalysisRepository):
+        self._repository = repository
+
+    async def execute(self, limit: int, cursor: Optional[str] = None, created_from: Optional[datetime] = None,
+                      created_to: Optional[datetime] = None) -> AnalysisPage:
+        before = decode_cursor(cursor) if cursor else None
+        # One extra row tells whether another page exists without counting the rest.
+        analyses = await self._repository.list_page(
+            limit + 1,
+            before=before,
+            created_from=_as_utc(created_from) if created_from else None,
+            created_to=_as_utc(created_to) if created_to else None
+        )
+        next_cursor = encode_cursor(analyses[limit - 1]) if len(analyses) > limit else None
+        logger.info(f"Listed analyses - count: {min(len(analyses), limit)}, has_more: {next_cursor is not None}")
+        return AnalysisPage(analyses=analyses[:limit], next_cursor=next_cursor)
@@ -0,0 +1,34 @@
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.domain.errors import SearchUnavailableError
+from app.domain.models import AnalysisSearchResults, ScoredAnalysis
+from app.domain.ports import AnalysisRepository
+from app.infra.search_index import InvertedIndex
+
+logger = logging.getLogger(__name__)
+
+
+class SearchAnalysesUseCase:
+    """Searches `index`; without one (the repository is not process-local) every search fails."""
+
+    def __init__(self, index: Optional[InvertedIndex], repository: AnalysisRepository):
+        self._index = index
+        self._repository = repository
+
+    async def execute(self, query: str, limit: int) -> AnalysisSearchResults:
+        if self._index is None:
+            raise SearchUnavailableError()
+        start_time = datetime.now(timezone.utc)
+        
+        top, total_matches = self._index.search(query, limit)
+        results = []
+        for analysis_id, score in top:
+            analysis = await self._repository.get_by_id(analysis_id)
+            if analysis is not None:
+                results.append(ScoredAnalysis(analysis=analysis, score=score))
+        
+        duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        logger.info(f"Analysis search completed - matches: {total_matches}, duration: {duration}s")
+        return AnalysisSearchResults(results=results, total_matches=total_matches)
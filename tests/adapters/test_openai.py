@@ -1,7 +1,17 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
 from app import configurations
 import pydantic
 from tests.adapters import mock_data
 from app.adapters import openai
+from app.adapters.openai_batch import OpenAIBatchAdapter
+from app.domain.errors import LLMTimeoutError
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitedLLM
+from app.infra.openai_adapter_impl import OpenAIAdapterImpl
+from app.infra.rate_limiter import RateLimiter
+from app.infra.retry import RetryingLLM, RetryPolicy
 
 
 class Response(pydantic.BaseModel):
@@ -29,3 +39,101 @@ def test_openai_adapter() -> None:
     print(serialized_response)
     assert "summary" in serialized_response.keys()
     assert "action_items" in serialized_response.keys()
+
+
+def _stub_completion(parsed: pydantic.BaseModel, total_tokens: int = 100) -> Mock:
+    completion = Mock()
+    completion.choices = [Mock(message=Mock(parsed=parsed))]
+    completion.usage = Mock(total_tokens=total_tokens)
+    return completion
+
+
+@pytest.mark.asyncio
+async def test_limited_openai_adapter_charges_rate_limiter() -> None:
+    rate_limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=10000, expected_output_tokens=100)
+    openai_adapter = openai.OpenAIAdapter("test-key", "test-model")
+    llm = ConcurrencyLimitedLLM(openai_adapter, AdaptiveConcurrencyLimiter(), rate_limiter=rate_limiter)
+    expected = Response(summary="Summary", action_items=["Action"])
+    openai_adapter._aclient = Mock()
+    openai_adapter._aclient.beta.chat.completions.parse = AsyncMock(return_value=_stub_completion(expected, 150))
+
+    response = await llm.run_completion_async("system", "user prompt", Response)
+
+    assert response == expected
+    assert rate_limiter.stats()["admitted"] == 1
+    assert rate_limiter.stats()["tokens_available"] == pytest.approx(10000 - 150, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_impl_maps_error_then_retries() -> None:
+    async def no_sleep(seconds: float) -> None:
+        pass
+
+    retry_policy = RetryPolicy(max_attempts=3, sleep=no_sleep)
+    adapter = OpenAIAdapterImpl("test-key", "test-model", max_retries=0)
+    adapter._aclient = Mock()
+    adapter._aclient.beta.chat.completions.parse = AsyncMock(side_effect=asyncio.TimeoutError())
+
+    with pytest.raises(LLMTimeoutError):
+        await RetryingLLM(adapter, retry_policy).run_completion_async("system", "user prompt", Response)
+
+    assert adapter._aclient.beta.chat.completions.parse.call_count == 3
+    assert retry_policy.stats()["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_runs_requests_through_hedge() -> None:
+    hedged = []
+
+    async def hedge(fn):
+        hedged.append(fn)
+        return await fn()
+
+    openai_adapter = openai.OpenAIAdapter("test-key", "test-model", hedging=hedge)
+    expected = Response(summary="Summary", action_items=["Action"])
+    openai_adapter._aclient = Mock()
+    openai_adapter._aclient.beta.chat.completions.parse = AsyncMock(return_value=_stub_completion(expected))
+
+    response = await openai_adapter.run_completion_async("system", "user prompt", Response)
+
+    assert response == expected
+    assert len(hedged) == 1
+
+
+def test_openai_adapter_uses_base_url() -> None:
+    openai_adapter = openai.OpenAIAdapter("test-key", "test-model", base_url="http://localhost:8080/v1")
+
+    assert str(openai_adapter._aclient.base_url) == "http://localhost:8080/v1/"
+    assert str(openai_adapter._client.base_url) == "http://localhost:8080/v1/"
+
+
+class _StreamedFile:
+    def __init__(self, content: bytes) -> None:
+        self._content = content
+
+    async def __aenter__(self) -> "_StreamedFile":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    async def iter_bytes(self):
+        yield self._content
+
+
+@pytest.mark.asyncio
+async def test_batch_download_includes_error_file(tmp_path) -> None:
+    files = {
+        "file-out": b'{"custom_id": "transcript-0", "response": {"status_code": 200}}',
+        "file-err": b'{"custom_id": "transcript-1", "response": {"status_code": 500}}\n',
+    }
+    adapter = OpenAIBatchAdapter("test-key")
+    adapter._aclient = Mock()
+    adapter._aclient.batches.retrieve = AsyncMock(return_value=Mock(output_file_id="file-out", error_file_id="file-err"))
+    adapter._aclient.files.with_streaming_response.content = lambda file_id: _StreamedFile(files[file_id])
+    destination = tmp_path / "output.jsonl"
+
+    await adapter.download_results("batch-1", str(destination))
+
+    lines = destination.read_text().splitlines()
+    assert [line.split('"')[3] for line in lines] == ["transcript-0", "transcript-1"]
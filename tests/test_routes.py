@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
 
 from fastapi.testclient import TestClient
@@ -50,7 +51,7 @@ def mock_get_use_case():
 
 @pytest.fixture
 def mock_batch_use_case():
-    from app.use_cases.analyze_batch import BatchAnalysisResult
+    from app.use_cases.analyze_batch import BatchAnalysisResult, BatchAnalysisResults
     
     mock = AsyncMock()
     
@@ -67,7 +68,7 @@ def mock_batch_use_case():
                 results.append(BatchAnalysisResult(transcript=transcript, analysis=analysis))
             else:  # Error case
                 results.append(BatchAnalysisResult(transcript=transcript, error="Empty transcript"))
-        return results
+        return BatchAnalysisResults(results)
     
     mock.execute.side_effect = create_mock_results
     return mock
@@ -87,6 +88,22 @@ class TestAnalyzeEndpoint:
         assert data["next_actions"] == ["Mock action 1", "Mock action 2"]
         assert "created_at" in data
 
+    def test_reused_analysis_is_flagged(self, client):
+        from app.infra import di
+        
+        original_id = uuid4()
+        use_case = AsyncMock()
+        use_case.execute.return_value = TranscriptAnalysis(summary="Reused", next_actions=[], reused_from=original_id)
+        app.dependency_overrides[di.get_analyze_transcript_use_case] = lambda: use_case
+        try:
+            response = client.get("/api/v1/analyze?transcript=Near duplicate transcript")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert response.json()["reused"] is True
+        assert response.json()["reused_from"] == str(original_id)
+
     @patch('app.infra.di.get_analyze_transcript_use_case')
     def test_empty_transcript_error(self, mock_get_use_case, client):
         mock_use_case = AsyncMock()
@@ -176,6 +193,88 @@ class TestGetAnalysisEndpoint:
         
         assert response.status_code == 422
 
+    def test_fields_projection(self, client, mock_get_use_case):
+        from app.infra import di
+        
+        app.dependency_overrides[di.get_get_analysis_use_case] = lambda: mock_get_use_case
+        try:
+            projected = client.get(f"/api/v1/analyses/{uuid4()}?fields=id,summary")
+            unknown = client.get(f"/api/v1/analyses/{uuid4()}?fields=id,transcript")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert projected.status_code == 200
+        assert projected.json() == {
+            "id": str(mock_get_use_case.execute.return_value.id),
+            "summary": "Retrieved summary"
+        }
+        assert unknown.status_code == 422
+
+
+class TestListAnalysesEndpoint:
+    def test_list_pages(self, client):
+        from app.infra import di
+        from app.infra.memory_repository import MemoryRepository
+        from app.use_cases.list_analyses import ListAnalysesUseCase
+        
+        repository = MemoryRepository()
+        asyncio.run(repository.save_many([
+            TranscriptAnalysis(summary=f"Test {i}", next_actions=[], created_at=datetime(2024, 1, 1, i, tzinfo=timezone.utc))
+            for i in range(3)
+        ]))
+        app.dependency_overrides[di.get_list_analyses_use_case] = lambda: ListAnalysesUseCase(repository)
+        try:
+            first = client.get("/api/v1/analyses?limit=2")
+            second = client.get(f"/api/v1/analyses?limit=2&cursor={first.json()['next_cursor']}")
+            invalid = client.get("/api/v1/analyses?cursor=bogus")
+            too_large = client.get("/api/v1/analyses?limit=1000")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert first.status_code == 200
+        assert len(first.json()["results"]) == 2
+        assert [item["summary"] for item in second.json()["results"]] == ["Test 0"]
+        assert second.json()["next_cursor"] is None
+        assert invalid.status_code == 422
+        assert too_large.status_code == 422
+
+
+class TestSearchAnalysesEndpoint:
+    def test_search(self, client):
+        from app.infra import di
+        from app.infra.memory_repository import MemoryRepository
+        from app.infra.search_index import InvertedIndex
+        from app.use_cases.search_analyses import SearchAnalysesUseCase
+        
+        index = InvertedIndex()
+        repository = MemoryRepository()
+        repository.add_listener(index)
+        asyncio.run(repository.save(TranscriptAnalysis(summary="Quarterly pricing review", next_actions=["Email finance"])))
+        app.dependency_overrides[di.get_search_analyses_use_case] = lambda: SearchAnalysesUseCase(index, repository)
+        try:
+            response = client.get("/api/v1/analyses/search?q=pricing")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_matches"] == 1
+        assert data["results"][0]["analysis"]["summary"] == "Quarterly pricing review"
+        assert data["results"][0]["score"] > 0
+
+    def test_search_unavailable(self, client):
+        from app.infra import di
+        from app.infra.memory_repository import MemoryRepository
+        from app.use_cases.search_analyses import SearchAnalysesUseCase
+        
+        app.dependency_overrides[di.get_search_analyses_use_case] = lambda: SearchAnalysesUseCase(None, MemoryRepository())
+        try:
+            response = client.get("/api/v1/analyses/search?q=pricing")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 501
+
 
 class TestBatchAnalysisEndpoint:
     @patch('app.infra.di.get_analyze_batch_use_case')
@@ -228,6 +327,28 @@ class TestBatchAnalysisEndpoint:
         assert results[1]["error"] == "Empty transcript"
         assert results[2]["success"] is True
 
+    def test_batch_without_transcripts_is_gzipped(self, client, mock_batch_use_case):
+        from app.infra import di
+        
+        transcripts = [f"Transcript number {i} " * 50 for i in range(10)]
+        app.dependency_overrides[di.get_analyze_batch_use_case] = lambda: mock_batch_use_case
+        try:
+            response = client.post(
+                "/api/v1/analyses/batch?include_transcript=false&fields=id,summary",
+                json={"transcripts": transcripts},
+                headers={"Accept-Encoding": "gzip"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        results = response.json()["results"]
+        assert [result["index"] for result in results] == list(range(10))
+        assert all("transcript" not in result for result in results)
+        assert set(results[0]["analysis"]) == {"id", "summary"}
+        assert response.json()["deduplicated_count"] == 0
+
     def test_empty_transcripts_list(self, client):
         request_data = {"transcripts": []}
         
@@ -235,6 +356,56 @@ class TestBatchAnalysisEndpoint:
         
         assert response.status_code == 422
 
+    def test_stream_ndjson(self, client):
+        import json
+        from app.infra.di import get_analyze_batch_use_case
+        from app.use_cases.analyze_batch import BatchAnalysisResult
+        
+        class StreamingUseCase:
+            async def execute_stream(self, transcripts):
+                yield BatchAnalysisResult(transcript=transcripts[1], error="Empty transcript", index=1)
+                yield BatchAnalysisResult(
+                    transcript=transcripts[0],
+                    analysis=TranscriptAnalysis(summary="Summary", next_actions=["Action"]),
+                    index=0
+                )
+        
+        app.dependency_overrides[get_analyze_batch_use_case] = StreamingUseCase
+        try:
+            response = client.post("/api/v1/analyses/batch/stream", json={"transcripts": ["Valid", ""]})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["type"] for record in records] == ["result", "result", "summary"]
+        assert [record["index"] for record in records[:2]] == [1, 0]
+        assert records[2]["total_count"] == 2
+        assert records[2]["successful_count"] == 1
+
+    def test_stream_sse(self, client):
+        from app.infra.di import get_analyze_batch_use_case
+        from app.use_cases.analyze_batch import BatchAnalysisResult
+        
+        class StreamingUseCase:
+            async def execute_stream(self, transcripts):
+                yield BatchAnalysisResult(transcript=transcripts[0], error="failed", index=0)
+        
+        app.dependency_overrides[get_analyze_batch_use_case] = StreamingUseCase
+        try:
+            response = client.post(
+                "/api/v1/analyses/batch/stream",
+                json={"transcripts": ["Valid"]},
+                headers={"Accept": "text/event-stream"}
+            )
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith("event: result\ndata: ")
+        assert "event: summary" in response.text
+
     def test_too_many_transcripts(self, client):
         request_data = {
             "transcripts": [f"Transcript {i}" for i in range(11)]  # Max is 10
@@ -245,6 +416,262 @@ class TestBatchAnalysisEndpoint:
         assert response.status_code == 422
 
 
+class TestAnalyzeBodyEndpoint:
+    @pytest.fixture
+    def body_use_case(self, mock_analyze_use_case):
+        from app.infra import di
+        
+        app.dependency_overrides[di.get_analyze_transcript_use_case] = lambda: mock_analyze_use_case
+        yield mock_analyze_use_case
+        app.dependency_overrides.clear()
+
+    def test_plain_and_json_bodies(self, client, body_use_case):
+        plain = client.post("/api/v1/analyze", content="Alice: hi", headers={"Content-Type": "text/plain"})
+        as_json = client.post("/api/v1/analyze?bypass_cache=true", json={"transcript": "Bob: hello"})
+        
+        assert plain.status_code == 200
+        assert as_json.status_code == 200
+        assert as_json.json()["summary"] == "Test summary from mock"
+        body_use_case.execute.assert_any_call("Alice: hi", bypass_cache=False)
+        body_use_case.execute.assert_any_call("Bob: hello", bypass_cache=True)
+
+    def test_gzip_body(self, client, body_use_case):
+        import gzip
+        
+        transcript = "Alice: let's review the roadmap\n" * 1000
+        response = client.post(
+            "/api/v1/analyze",
+            content=gzip.compress(transcript.encode("utf-8")),
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}
+        )
+        
+        assert response.status_code == 200
+        body_use_case.execute.assert_called_once_with(transcript, bypass_cache=False)
+
+    def test_oversized_compressed_body(self, client, body_use_case):
+        import gzip
+        
+        response = client.post(
+            "/api/v1/analyze",
+            content=gzip.compress(b"a" * (10 * 1024 * 1024)),
+            headers={"Content-Type": "text/plain", "Content-Encoding": "gzip"}
+        )
+        
+        assert response.status_code == 413
+        body_use_case.execute.assert_not_called()
+
+    def test_zstd_body(self, client, body_use_case):
+        zstandard = pytest.importorskip("zstandard")
+        
+        transcript = "Alice: let's review the roadmap\n" * 1000
+        response = client.post(
+            "/api/v1/analyze",
+            content=zstandard.ZstdCompressor().compress(transcript.encode("utf-8")),
+            headers={"Content-Type": "text/plain", "Content-Encoding": "zstd"}
+        )
+        
+        assert response.status_code == 200
+        body_use_case.execute.assert_called_once_with(transcript, bypass_cache=False)
+
+    def test_escaped_non_ascii_json_body_within_limit(self, client, body_use_case):
+        import json
+        
+        # 90KB of UTF-8 grows to 270KB once json.dumps escapes every character.
+        transcript = "é" * (45 * 1024)
+        response = client.post(
+            "/api/v1/analyze",
+            content=json.dumps({"transcript": transcript}),
+            headers={"Content-Type": "application/json"}
+        )
+        
+        assert response.status_code == 200
+        body_use_case.execute.assert_called_once_with(transcript, bypass_cache=False)
+
+    def test_unsupported_encoding(self, client, body_use_case):
+        response = client.post(
+            "/api/v1/analyze", content=b"data", headers={"Content-Type": "text/plain", "Content-Encoding": "br"}
+        )
+        
+        assert response.status_code == 415
+
+
+class TestDryRunEndpoint:
+    def test_dry_run_does_not_call_llm(self, client):
+        from app.infra import di
+        from app.infra.latency_model import LatencyModel
+        from app.infra.token_counter import TokenCounter
+        from app.use_cases.estimate_analysis import EstimateAnalysisUseCase
+        
+        use_case = EstimateAnalysisUseCase(TokenCounter("test-model"), LatencyModel(), "test-model", 400)
+        app.dependency_overrides[di.get_estimate_analysis_use_case] = lambda: use_case
+        try:
+            response = client.get("/api/v1/analyze/dry-run?transcript=This is a test transcript")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prompt_tokens"] > 0
+        assert data["expected_output_tokens"] == 400
+        assert data["predicted_latency_seconds"] > 0
+        assert data["predicted_queue_seconds"] == 0
+
+
+class TestLongTranscriptEndpoint:
+    def test_long_transcript(self, client, mock_analyze_use_case):
+        from app.infra import di
+        
+        app.dependency_overrides[di.get_analyze_long_transcript_use_case] = lambda: mock_analyze_use_case
+        try:
+            response = client.post("/api/v1/analyses/long", json={"transcript": "Alice: hi\nBob: hello"})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        assert response.json()["summary"] == "Test summary from mock"
+        mock_analyze_use_case.execute.assert_called_once_with("Alice: hi\nBob: hello")
+
+    def test_long_transcript_too_large(self, client):
+        from app.infra import di
+        
+        mock_use_case = AsyncMock()
+        mock_use_case.execute.side_effect = TranscriptTooLargeError(6_000_000, 5_242_880)
+        app.dependency_overrides[di.get_analyze_long_transcript_use_case] = lambda: mock_use_case
+        try:
+            response = client.post("/api/v1/analyses/long", json={"transcript": "large"})
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 413
+
+
+class TestBatchJobEndpoints:
+    @pytest.fixture
+    def job_overrides(self):
+        from app.infra import di
+        from app.infra.job_worker_pool import BatchJobWorkerPool
+        from app.infra.memory_job_repository import MemoryBatchJobRepository
+        from app.use_cases.batch_jobs import CancelBatchJobUseCase, GetBatchJobResultsUseCase, GetBatchJobUseCase, SubmitBatchJobUseCase
+        
+        repository = MemoryBatchJobRepository()
+        pool = BatchJobWorkerPool(repository, AsyncMock())
+        app.dependency_overrides[di.get_submit_batch_job_use_case] = lambda: SubmitBatchJobUseCase(repository, pool)
+        app.dependency_overrides[di.get_get_batch_job_use_case] = lambda: GetBatchJobUseCase(repository)
+        app.dependency_overrides[di.get_get_batch_job_results_use_case] = lambda: GetBatchJobResultsUseCase(repository)
+        app.dependency_overrides[di.get_cancel_batch_job_use_case] = lambda: CancelBatchJobUseCase(repository)
+        yield repository
+        app.dependency_overrides.clear()
+
+    def test_submit_poll_and_cancel(self, client, job_overrides):
+        response = client.post("/api/v1/jobs", json={"transcripts": [f"Transcript {i}" for i in range(50)]})
+        
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert response.json()["status"] == "pending"
+        assert response.json()["total_count"] == 50
+        
+        response = client.get(f"/api/v1/jobs/{job_id}")
+        assert response.status_code == 200
+        assert response.json()["completed_count"] == 0
+        
+        response = client.get(f"/api/v1/jobs/{job_id}/results?offset=10&limit=20")
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["index"] for item in data["results"]] == list(range(10, 30))
+        assert data["results"][0]["status"] == "pending"
+        assert data["next_offset"] == 30
+        
+        response = client.post(f"/api/v1/jobs/{job_id}/cancel")
+        assert response.status_code == 200
+        assert response.json()["status"] == "cancelled"
+
+    def test_job_results_include_analysis_model(self, client, job_overrides):
+        response = client.post("/api/v1/jobs", json={"transcripts": ["Transcript"]})
+        job_id = UUID(response.json()["id"])
+        analysis = TranscriptAnalysis(summary="Summary", next_actions=["Act"], model="gpt-4o-mini")
+        asyncio.run(job_overrides.record_item_result(job_id, 0, analysis=analysis))
+        
+        response = client.get(f"/api/v1/jobs/{job_id}/results")
+        
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["status"] == "succeeded"
+        assert result["analysis"]["model"] == "gpt-4o-mini"
+        assert result["analysis"]["reused"] is False
+
+    def test_job_not_found(self, client, job_overrides):
+        response = client.get(f"/api/v1/jobs/{uuid4()}")
+        
+        assert response.status_code == 404
+
+
+class TestLifespan:
+    def test_starts_without_llm_credentials(self, monkeypatch, tmp_path):
+        from app.infra import di
+        
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        di.get_config.cache_clear()
+        di.get_job_worker_pool.cache_clear()
+        
+        with TestClient(app) as client:
+            response = client.get("/health")
+        
+        assert response.status_code == 200
+
+
+class TestStatsEndpoint:
+    def test_stats(self, client):
+        from app.infra import di
+        from app.infra.analysis_cache import AnalysisCache
+        from app.infra.hedging import HedgingPolicy
+        from app.infra.job_worker_pool import BatchJobWorkerPool
+        from app.infra.memory_job_repository import MemoryBatchJobRepository
+        from app.infra.memory_repository import MemoryRepository
+        from app.infra.near_duplicate_index import NearDuplicateIndex
+        from app.infra.transcript_compaction import default_preprocessor
+        from app.infra.circuit_breaker import CircuitBreaker
+        from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter
+        from app.infra.rate_limiter import RateLimiter
+        from app.infra.retry import RetryPolicy
+        
+        app.dependency_overrides[di.get_analysis_cache] = lambda: AnalysisCache(max_entries=5)
+        app.dependency_overrides[di.get_concurrency_limiter] = lambda: AdaptiveConcurrencyLimiter(initial_limit=3)
+        app.dependency_overrides[di.get_rate_limiter] = lambda: RateLimiter(requests_per_minute=60, tokens_per_minute=0)
+        app.dependency_overrides[di.get_retry_policy] = lambda: RetryPolicy()
+        app.dependency_overrides[di.get_hedging_policy] = lambda: HedgingPolicy()
+        app.dependency_overrides[di.get_job_worker_pool] = lambda: BatchJobWorkerPool(MemoryBatchJobRepository(), AsyncMock())
+        app.dependency_overrides[di.get_repository] = lambda: MemoryRepository(max_entries=10)
+        app.dependency_overrides[di.get_near_duplicate_index] = lambda: NearDuplicateIndex(capacity=8)
+        app.dependency_overrides[di.get_transcript_preprocessor] = lambda: default_preprocessor()
+        app.dependency_overrides[di.get_model_router] = lambda: None
+        app.dependency_overrides[di.get_llm_pool] = lambda: None
+        app.dependency_overrides[di.get_circuit_breaker] = lambda: CircuitBreaker()
+        try:
+            response = client.get("/api/v1/stats")
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["analysis_cache"]["max_entries"] == 5
+        assert data["analysis_cache"]["hits"] == 0
+        assert data["llm_concurrency"]["limit"] == 3
+        assert data["llm_concurrency"]["queue_depth"] == 0
+        assert data["llm_rate_limit"]["requests_available"] == 60
+        assert data["llm_retries"]["retries"] == 0
+        assert data["llm_hedging"]["hedges"] == 0
+        assert data["batch_jobs"]["queue_depth"] == 0
+        assert "samples" in data["llm_latency_model"]
+        assert data["repository"]["max_entries"] == 10
+        assert "documents" in data["search_index"]
+        assert data["near_duplicates"]["capacity"] == 8
+        assert data["transcript_compaction"]["chars_saved"] == 0
+        assert data["model_routing"] is None
+        assert data["llm_pool"] is None
+        assert data["llm_circuit_breaker"]["state"] == "closed"
+
+
 class TestHealthEndpoint:
     def test_health_check(self, client):
         response = client.get("/health")
@@ -1,14 +1,45 @@
+import asyncio
+import json
+
+import httpx
+import openai
 import pytest
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
-from app.domain.errors import EmptyTranscriptError, TranscriptTooLargeError, AnalysisNotFoundError
-from app.domain.models import TranscriptAnalysis, LLMAnalysisDTO
+from app.domain.errors import AnalysisStoreFullError, InvalidCursorError, EmptyTranscriptError, TranscriptTooLargeError, TranscriptTooManyTokensError, AnalysisNotFoundError, LLMRateLimitError, LLMServiceError, LLMTimeoutError, LocalRateLimitError, SearchUnavailableError
+from app.domain.models import TranscriptAnalysis, LLMAnalysisDTO, PackedLLMAnalysisDTO, PackedLLMAnalysisItemDTO, BatchJobStatus, BatchJobItemStatus, BulkBatchStatus
+from app.adapters.llm_pool import LLMClientPool, LLMPoolMember
+from app.adapters.model_router import ModelRoute, ModelRouter
+from app.infra.analysis_cache import AnalysisCache, build_cache_key
+from app.infra.circuit_breaker import CircuitBreaker, CircuitBreakerLLM, CircuitState, is_upstream_failure
+from app.infra.hedging import HedgingPolicy
+from app.infra.concurrency_limiter import AdaptiveConcurrencyLimiter, ConcurrencyLimitedLLM
+from app.infra.job_worker_pool import BatchJobWorkerPool
+from app.infra.latency_model import LatencyModel
+from app.infra.local_batch_llm import LocalFileBatchLLm
+from app.infra.memory_job_repository import MemoryBatchJobRepository
 from app.infra.memory_repository import MemoryRepository
+from app.infra.near_duplicate_index import NearDuplicateIndex
+from app.infra.rate_limiter import RateLimiter
+from app.infra.retry import RetryingLLM, RetryPolicy
+from app.infra.shared_memory_repository import SharedMmapRepository
+from app.infra.search_index import InvertedIndex
+from app.infra.single_flight import SingleFlight
+from app.infra.sqlite_job_repository import SqliteBatchJobRepository
+from app.infra.sqlite_repository import SqliteRepository
+from app.infra.token_counter import TokenCounter
+from app.infra.transcript_compaction import NoiseFilter, SpeakerAliaser, TranscriptPreprocessor, default_preprocessor, normalize_whitespace
 from app.use_cases.analyze_transcript import AnalyzeTranscriptUseCase
 from app.use_cases.get_analysis import GetAnalysisUseCase
-from app.use_cases.analyze_batch import AnalyzeBatchUseCase
+from app.use_cases.list_analyses import ListAnalysesUseCase
+from app.use_cases.search_analyses import SearchAnalysesUseCase
+from app.use_cases.analyze_batch import AnalyzeBatchUseCase, plan_packs
+from app.use_cases.analyze_long_transcript import AnalyzeLongTranscriptUseCase, chunk_turns, split_speaker_turns
+from app.use_cases.bulk_analyze import BulkAnalyzeUseCase
+from app.use_cases.estimate_analysis import EstimateAnalysisUseCase
+from app.use_cases.batch_jobs import CancelBatchJobUseCase, GetBatchJobResultsUseCase, SubmitBatchJobUseCase
 
 
 class MockLLMPort:
@@ -63,6 +94,14 @@ class TestAnalyzeTranscriptUseCase:
         assert saved_analysis is not None
         assert saved_analysis.id == result.id
 
+    @pytest.mark.asyncio
+    async def test_analysis_does_not_share_llm_action_items(self, analyze_use_case, mock_llm_port):
+        result = await analyze_use_case.execute("This is a test transcript with meaningful content.")
+        
+        result.next_actions.append("Added later")
+        
+        assert mock_llm_port.response.action_items == ["Action 1", "Action 2"]
+
     @pytest.mark.asyncio
     async def test_empty_transcript_error(self, analyze_use_case):
         with pytest.raises(EmptyTranscriptError):
@@ -92,6 +131,762 @@ class TestAnalyzeTranscriptUseCase:
         assert "Test transcript" in call_args[0][1]  # user_prompt contains transcript
 
 
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_llm(self, mock_llm_port, repository):
+        cache = AnalysisCache()
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, cache=cache, model_name="test-model")
+        
+        first = await use_case.execute("Repeated transcript")
+        second = await use_case.execute("  Repeated   transcript ")
+        
+        mock_llm_port.run_completion_async.assert_called_once()
+        assert second.summary == first.summary
+        assert second.id != first.id
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_bypass_cache_calls_llm(self, mock_llm_port, repository):
+        cache = AnalysisCache()
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, cache=cache, model_name="test-model")
+        
+        await use_case.execute("Repeated transcript")
+        await use_case.execute("Repeated transcript", bypass_cache=True)
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_llm_call(self, mock_llm_port, repository):
+        async def slow_completion(system_prompt, user_prompt, dto):
+            await asyncio.sleep(0.01)
+            return mock_llm_port.response
+        
+        mock_llm_port.run_completion_async.side_effect = slow_completion
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, single_flight=SingleFlight())
+        
+        results = await asyncio.gather(*[use_case.execute("Same transcript") for _ in range(5)])
+        
+        mock_llm_port.run_completion_async.assert_called_once()
+        assert len({result.id for result in results}) == 5
+        assert await repository.count() == 5
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_caller(self):
+        single_flight = SingleFlight()
+        calls = []
+        
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        results = await asyncio.gather(
+            *[single_flight.do("key", failing) for _ in range(3)],
+            return_exceptions=True
+        )
+        
+        assert len(calls) == 1
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 2}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        single_flight = SingleFlight()
+        
+        async def slow():
+            await asyncio.sleep(0.02)
+            return "done"
+        
+        first = asyncio.ensure_future(single_flight.do("key", slow))
+        second = asyncio.ensure_future(single_flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        
+        assert await second == "done"
+
+
+class TestAnalysisCache:
+    def test_key_depends_on_model_and_prompts(self):
+        key = build_cache_key("transcript", "model-a", "system", "user {transcript}")
+        
+        assert key == build_cache_key(" transcript\n", "model-a", "system", "user {transcript}")
+        assert key != build_cache_key("transcript", "model-b", "system", "user {transcript}")
+        assert key != build_cache_key("transcript", "model-a", "other system", "user {transcript}")
+
+    def test_lru_eviction(self):
+        cache = AnalysisCache(max_entries=2)
+        dto = LLMAnalysisDTO(summary="Summary", action_items=["Action"])
+        
+        cache.set("a", dto)
+        cache.set("b", dto)
+        cache.get("a")
+        cache.set("c", dto)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") is dto
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = AnalysisCache(ttl_seconds=10, clock=lambda: now[0])
+        dto = LLMAnalysisDTO(summary="Summary", action_items=["Action"])
+        
+        cache.set("a", dto)
+        now[0] = 11.0
+        
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+    def test_memory_budget(self):
+        dto = LLMAnalysisDTO(summary="x" * 1000, action_items=[])
+        cache = AnalysisCache(max_bytes=3000)
+        
+        for key in ("a", "b", "c", "d"):
+            cache.set(key, dto)
+        
+        assert cache.stats()["bytes"] <= 3000
+        assert len(cache) < 4
+
+
+class TestAdaptiveConcurrencyLimiter:
+    @pytest.mark.asyncio
+    async def test_queues_beyond_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        assert not waiter.done()
+        
+        limiter.release(latency=0.1)
+        await waiter
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_popped_by_release(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        waiter.cancel()
+        limiter.release()
+        
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    def test_aimd_adjustments(self):
+        now = [0.0]
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=10, clock=lambda: now[0])
+        
+        for _ in range(8):
+            limiter._in_flight += 1
+            limiter.release(latency=0.1)
+        assert limiter.limit == 5
+        
+        limiter._in_flight += 2
+        limiter.release(overloaded=True)
+        limiter.release(overloaded=True)
+        assert limiter.limit == 2  # second decrease falls inside the cooldown
+        
+        now[0] = 5.0
+        limiter._in_flight += 1
+        limiter.release(latency=120.0)
+        assert limiter.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_limited_llm_backs_off_on_rate_limit(self, mock_llm_port):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        llm = ConcurrencyLimitedLLM(mock_llm_port, limiter)
+        mock_llm_port.run_completion_async.side_effect = LLMRateLimitError()
+        
+        with pytest.raises(LLMRateLimitError):
+            await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert limiter.limit == 4
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_limited_llm_waits_for_rate_budget_without_a_slot(self, mock_llm_port):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        slots_held_while_waiting = []
+        
+        async def sleep(seconds: float) -> None:
+            slots_held_while_waiting.append(limiter.in_flight)
+            clock.now += seconds
+        
+        clock = FakeClock()
+        rate_limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0, max_wait_seconds=120.0,
+                                   clock=clock, sleep=sleep)
+        llm = ConcurrencyLimitedLLM(mock_llm_port, limiter, rate_limiter=rate_limiter)
+        
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert slots_held_while_waiting == [0]
+        assert mock_llm_port.run_completion_async.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_limited_llm_ignores_local_rate_limit_rejections(self, mock_llm_port):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8)
+        clock = FakeClock()
+        rate_limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0, max_wait_seconds=0.0,
+                                   clock=clock, sleep=clock.sleep)
+        llm = ConcurrencyLimitedLLM(mock_llm_port, limiter, rate_limiter=rate_limiter)
+        
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        with pytest.raises(LocalRateLimitError):
+            await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert limiter.limit == 8
+        assert limiter.overloads == 0
+        assert limiter.in_flight == 0
+        assert mock_llm_port.run_completion_async.call_count == 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestRateLimiter:
+    @pytest.mark.asyncio
+    async def test_waits_for_request_budget(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=0, clock=clock, sleep=clock.sleep)
+        
+        for _ in range(60):
+            await limiter.acquire(10)
+        assert clock.now == 0.0
+        
+        await limiter.acquire(10)
+        assert clock.now == pytest.approx(1.0)
+        assert limiter.throttled == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_wait_exceeds_budget(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000, max_wait_seconds=5.0,
+                              expected_output_tokens=0, clock=clock, sleep=clock.sleep)
+        
+        await limiter.acquire(1000)
+        
+        with pytest.raises(LLMRateLimitError):
+            await limiter.acquire(1000)
+        assert limiter.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_usage_correction_refunds_tokens(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=1000, expected_output_tokens=500,
+                              clock=clock, sleep=clock.sleep)
+        
+        charged = await limiter.acquire(300)
+        assert charged == 800
+        
+        limiter.record_usage(charged, Mock(total_tokens=350))
+        assert limiter.stats()["tokens_available"] == pytest.approx(650)
+
+
+def rate_limit_error(headers: dict = None) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(429, headers=headers or {}, request=request)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+class TestRetryPolicy:
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        clock = FakeClock()
+        policy = RetryPolicy(max_attempts=3, clock=clock, sleep=clock.sleep)
+        fn = AsyncMock(side_effect=[rate_limit_error(), asyncio.TimeoutError(), "ok"])
+        
+        assert await policy.call_async(fn) == "ok"
+        assert fn.call_count == 3
+        assert policy.stats()["retries"] == 2
+        assert policy.stats()["attempts_per_call"] == {"3": 1}
+
+    @pytest.mark.asyncio
+    async def test_honors_retry_after(self):
+        clock = FakeClock()
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0, clock=clock, sleep=clock.sleep)
+        fn = AsyncMock(side_effect=[rate_limit_error({"retry-after": "7"}), "ok"])
+        
+        await policy.call_async(fn)
+        
+        assert clock.now == pytest.approx(7.0)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_at_deadline(self):
+        clock = FakeClock()
+        policy = RetryPolicy(max_attempts=10, deadline_seconds=5.0, clock=clock, sleep=clock.sleep)
+        fn = AsyncMock(side_effect=rate_limit_error({"retry-after-ms": "6000"}))
+        
+        with pytest.raises(openai.RateLimitError):
+            await policy.call_async(fn)
+        
+        assert fn.call_count == 1
+        assert policy.deadline_exceeded == 1
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_other_errors(self):
+        policy = RetryPolicy()
+        fn = AsyncMock(side_effect=ValueError("bad request"))
+        
+        with pytest.raises(ValueError):
+            await policy.call_async(fn)
+        
+        assert fn.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_mapped_provider_errors_but_not_local_rejections(self):
+        clock = FakeClock()
+        policy = RetryPolicy(clock=clock, sleep=clock.sleep)
+        mapped = LLMRateLimitError()
+        mapped.__cause__ = rate_limit_error({"retry-after": "3"})
+        fn = AsyncMock(side_effect=[mapped, LocalRateLimitError()])
+        
+        with pytest.raises(LocalRateLimitError):
+            await policy.call_async(fn)
+        
+        assert fn.call_count == 2
+        assert clock.now == pytest.approx(3.0)
+
+    @pytest.mark.asyncio
+    async def test_retrying_llm_backs_off_outside_the_concurrency_slot(self, mock_llm_port):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, decrease_cooldown=0.0)
+        slots_held_during_backoff = []
+        
+        async def sleep(seconds: float) -> None:
+            slots_held_during_backoff.append(limiter.in_flight)
+        
+        mock_llm_port.run_completion_async.side_effect = [LLMRateLimitError(), LLMRateLimitError(), mock_llm_port.response]
+        llm = RetryingLLM(ConcurrencyLimitedLLM(mock_llm_port, limiter), RetryPolicy(sleep=sleep))
+        
+        assert await llm.run_completion_async("system", "user", LLMAnalysisDTO) == mock_llm_port.response
+        
+        assert slots_held_during_backoff == [0, 0]
+        assert limiter.overloads == 2
+        assert limiter.in_flight == 0
+
+
+class TestHedgingPolicy:
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_history(self):
+        policy = HedgingPolicy(min_samples=5)
+        fn = AsyncMock(return_value="ok")
+        
+        assert await policy.run(fn) == "ok"
+        assert fn.call_count == 1
+        assert policy.hedge_delay() is None
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        policy = HedgingPolicy(min_samples=1, budget_ratio=1.0, min_delay=0.01)
+        policy.record_latency(0.01)
+        cancelled = []
+        delays = iter([1.0, 0.0])
+        
+        async def call():
+            delay = next(delays)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return delay
+        
+        assert await policy.run(call) == 0.0
+        await asyncio.sleep(0)
+        assert cancelled == [1.0]
+        assert policy.hedges == 1
+        assert policy.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_hedges(self):
+        policy = HedgingPolicy(min_samples=1, budget_ratio=0.05, min_delay=0.001)
+        policy.record_latency(0.001)
+        calls = []
+        
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "ok"
+        
+        assert await policy.run(slow) == "ok"
+        
+        assert len(calls) == 1  # one hedge per 20 requests is not yet available
+        assert policy.hedges == 0
+
+
+class TestModelRouter:
+    @pytest.fixture
+    def routes(self):
+        small = ModelRoute("small-model", MockLLMPort(), max_prompt_tokens=1000)
+        large = ModelRoute("large-model", MockLLMPort())
+        fallback = ModelRoute("fallback-model", MockLLMPort())
+        return small, large, fallback
+
+    @pytest.mark.asyncio
+    async def test_routes_by_prompt_size(self, routes):
+        small, large, fallback = routes
+        router = ModelRouter([small, large], TokenCounter("test-model"), fallback=fallback)
+        
+        _, short_model = await router.run_routed_completion_async("system", "short transcript", LLMAnalysisDTO)
+        _, long_model = await router.run_routed_completion_async("system", "word " * 2000, LLMAnalysisDTO)
+        
+        assert short_model == "small-model"
+        assert long_model == "large-model"
+        assert router.stats()["served"] == {"small-model": 1, "large-model": 1, "fallback-model": 0}
+
+    @pytest.mark.asyncio
+    async def test_saturated_route_shifts_to_fallback(self, routes):
+        _, large, fallback = routes
+        clock = FakeClock()
+        large.rate_limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=0, clock=clock, sleep=clock.sleep)
+        await large.rate_limiter.acquire(10)
+        router = ModelRouter([large], TokenCounter("test-model"), fallback=fallback)
+        
+        _, model = await router.run_routed_completion_async("system", "transcript", LLMAnalysisDTO)
+        
+        assert model == "fallback-model"
+        large.llm.run_completion_async.assert_not_called()
+        assert router.fallbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_shifts_to_fallback(self, routes):
+        _, large, fallback = routes
+        large.breaker = CircuitBreaker(window_size=1, min_calls=1)
+        large.breaker.record(True)
+        router = ModelRouter([large], TokenCounter("test-model"), fallback=fallback)
+        
+        _, model = await router.run_routed_completion_async("system", "transcript", LLMAnalysisDTO)
+        
+        assert model == "fallback-model"
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_retries_on_fallback(self, routes):
+        _, large, fallback = routes
+        large.llm.run_completion_async.side_effect = rate_limit_error()
+        router = ModelRouter([large], TokenCounter("test-model"), fallback=fallback)
+        
+        response, model = await router.run_routed_completion_async("system", "transcript", LLMAnalysisDTO)
+        
+        assert model == "fallback-model"
+        assert response == fallback.llm.response
+        assert router.stats()["served"] == {"large-model": 0, "fallback-model": 1}
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_without_fallback_propagates(self, routes):
+        _, large, _ = routes
+        large.llm.run_completion_async.side_effect = rate_limit_error()
+        router = ModelRouter([large], TokenCounter("test-model"))
+        
+        with pytest.raises(openai.RateLimitError):
+            await router.run_routed_completion_async("system", "transcript", LLMAnalysisDTO)
+
+    @pytest.mark.asyncio
+    async def test_analysis_records_serving_model(self, routes, repository):
+        small, large, _ = routes
+        router = ModelRouter([small, large], TokenCounter("test-model"))
+        cache = AnalysisCache()
+        use_case = AnalyzeTranscriptUseCase(router, repository, cache=cache, model_name="large-model")
+        
+        analysis = await use_case.execute("A short call")
+        cached = await use_case.execute("A short call")
+        
+        assert analysis.model == "small-model"
+        assert cached.model == "small-model"
+        assert (await repository.get_by_id(analysis.id)).model == "small-model"
+
+    @pytest.mark.asyncio
+    async def test_analysis_without_router_records_configured_model(self, mock_llm_port, repository):
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, model_name="test-model")
+        
+        analysis = await use_case.execute("A short call")
+        
+        assert analysis.model == "test-model"
+
+
+class TestLLMClientPool:
+    @pytest.mark.asyncio
+    async def test_balances_least_outstanding(self):
+        members = [LLMPoolMember(f"key-{i}", MockLLMPort()) for i in range(2)]
+        for member in members:
+            async def slow_completion(system_prompt, user_prompt, dto, member=member):
+                await asyncio.sleep(0.01)
+                return member.llm.response
+            member.llm.run_completion_async.side_effect = slow_completion
+        pool = LLMClientPool(members)
+        
+        await asyncio.gather(*[pool.run_completion_async("system", "user", LLMAnalysisDTO) for _ in range(4)])
+        
+        assert [member.llm.run_completion_async.call_count for member in members] == [2, 2]
+        assert all(member.outstanding == 0 for member in members)
+
+    @pytest.mark.asyncio
+    async def test_failing_member_is_ejected_and_call_fails_over(self):
+        clock = FakeClock()
+        failing, healthy = LLMPoolMember("failing", MockLLMPort()), LLMPoolMember("healthy", MockLLMPort())
+        failing.llm.run_completion_async.side_effect = rate_limit_error()
+        pool = LLMClientPool([failing, healthy], eject_seconds=30.0, clock=clock)
+        
+        response = await pool.run_completion_async("system", "user", LLMAnalysisDTO)
+        await pool.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert response == healthy.llm.response
+        assert failing.llm.run_completion_async.call_count == 1
+        assert healthy.llm.run_completion_async.call_count == 2
+        assert pool.stats()["available"] == 1
+        clock.now = 31.0
+        assert pool.select() is failing
+
+    @pytest.mark.asyncio
+    async def test_request_errors_do_not_eject(self):
+        member = LLMPoolMember("key", MockLLMPort())
+        member.llm.run_completion_async.side_effect = ValueError("bad request")
+        pool = LLMClientPool([member, LLMPoolMember("other", MockLLMPort())])
+        
+        with pytest.raises(ValueError):
+            await pool.run_completion_async("system", "user", LLMAnalysisDTO)
+        assert member.ejections == 0
+
+    @pytest.mark.asyncio
+    async def test_raises_when_every_member_fails(self):
+        members = [LLMPoolMember(f"key-{i}", MockLLMPort()) for i in range(2)]
+        for member in members:
+            member.llm.run_completion_async.side_effect = rate_limit_error()
+        pool = LLMClientPool(members)
+        
+        with pytest.raises(openai.RateLimitError):
+            await pool.run_completion_async("system", "user", LLMAnalysisDTO)
+        assert [member.failures for member in members] == [1, 1]
+
+    @pytest.mark.asyncio
+    async def test_local_rate_limit_moves_on_without_ejecting(self):
+        clock = FakeClock()
+        throttled = LLMPoolMember("throttled", MockLLMPort(),
+                                  RateLimiter(requests_per_minute=1, tokens_per_minute=0, clock=clock, sleep=clock.sleep))
+        other = LLMPoolMember("other", MockLLMPort())
+        throttled.llm.run_completion_async.side_effect = LocalRateLimitError()
+        pool = LLMClientPool([throttled, other], clock=clock)
+        
+        response = await pool.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert response == other.llm.response
+        assert throttled.ejections == 0
+        await throttled.rate_limiter.acquire(10)
+        assert pool.select() is other
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(failure_rate_threshold=0.5, window_size=4, min_calls=4, open_seconds=10.0,
+                              half_open_max_calls=2, clock=clock)
+
+    @staticmethod
+    def failing_port() -> MockLLMPort:
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        error = LLMServiceError("upstream unavailable")
+        error.__cause__ = openai.InternalServerError("unavailable", response=httpx.Response(503, request=request), body=None)
+        port = MockLLMPort()
+        port.run_completion_async.side_effect = error
+        return port
+
+    async def trip(self, llm: CircuitBreakerLLM) -> None:
+        for _ in range(4):
+            with pytest.raises(LLMServiceError):
+                await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+
+    @pytest.mark.asyncio
+    async def test_opens_on_failure_rate_and_fails_fast(self, breaker):
+        inner = self.failing_port()
+        llm = CircuitBreakerLLM(inner, breaker)
+        
+        await self.trip(llm)
+        with pytest.raises(LLMServiceError, match="circuit breaker is open"):
+            await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert breaker.state is CircuitState.OPEN
+        assert inner.run_completion_async.call_count == 4
+        assert breaker.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_probes_close_the_circuit(self, breaker, clock):
+        inner = self.failing_port()
+        llm = CircuitBreakerLLM(inner, breaker)
+        await self.trip(llm)
+        
+        clock.now = 10.0
+        inner.run_completion_async.side_effect = None
+        assert breaker.state is CircuitState.HALF_OPEN
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self, breaker, clock):
+        llm = CircuitBreakerLLM(self.failing_port(), breaker)
+        await self.trip(llm)
+        
+        clock.now = 10.0
+        with pytest.raises(LLMServiceError, match="upstream unavailable"):
+            await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert breaker.state is CircuitState.OPEN
+        assert breaker.stats()["times_opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_hands_off_to_fallback(self, breaker):
+        fallback = MockLLMPort()
+        llm = CircuitBreakerLLM(self.failing_port(), breaker, fallback=fallback)
+        await self.trip(llm)
+        
+        response = await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert response == fallback.response
+
+    def test_client_errors_do_not_count_but_slow_calls_do(self, breaker):
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        bad_request = openai.BadRequestError("bad", response=httpx.Response(400, request=request), body=None)
+        try:
+            raise LLMServiceError("bad") from bad_request
+        except LLMServiceError as e:
+            client_error = e
+        
+        for error in (client_error, LLMServiceError("Unexpected error: invalid JSON"), LLMRateLimitError()):
+            breaker.record(is_upstream_failure(error))
+        breaker.record(not is_upstream_failure(LLMTimeoutError()))
+        assert breaker.state is CircuitState.CLOSED
+        
+        for _ in range(4):
+            breaker.record(False, latency=60.0)
+        assert breaker.state is CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_probe_frees_its_slot_without_a_verdict(self, breaker, clock):
+        inner = self.failing_port()
+        llm = CircuitBreakerLLM(inner, breaker)
+        await self.trip(llm)
+        
+        clock.now = 10.0
+        inner.run_completion_async.side_effect = LLMRateLimitError()
+        for _ in range(3):
+            with pytest.raises(LLMRateLimitError):
+                await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        assert breaker.state is CircuitState.HALF_OPEN
+        
+        inner.run_completion_async.side_effect = None
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_every_retried_attempt_is_recorded(self, breaker):
+        async def no_sleep(seconds: float) -> None:
+            pass
+        
+        inner = self.failing_port()
+        llm = RetryingLLM(CircuitBreakerLLM(inner, breaker), RetryPolicy(max_attempts=4, sleep=no_sleep))
+        
+        with pytest.raises(LLMServiceError, match="upstream unavailable"):
+            await llm.run_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert inner.run_completion_async.call_count == 4
+        assert breaker.state is CircuitState.OPEN
+
+
+class TestTokenEstimates:
+    def test_token_counter_counts_chat_overhead(self):
+        counter = TokenCounter("test-model")
+        
+        assert counter.count_messages("", "") > 0
+        assert counter.count("word " * 100) > counter.count("word")
+
+    def test_token_counter_uses_tiktoken_encoding(self):
+        tiktoken = pytest.importorskip("tiktoken")
+        try:
+            encoding = tiktoken.encoding_for_model("gpt-4o")
+        except Exception as e:
+            pytest.skip(f"tiktoken encoding unavailable: {e}")
+        counter = TokenCounter("gpt-4o")
+        
+        assert counter.exact
+        assert counter.count("Alice: let's ship it on Friday") == len(encoding.encode("Alice: let's ship it on Friday"))
+
+    @pytest.mark.asyncio
+    async def test_prompt_is_counted_once_per_call(self, mock_llm_port):
+        async def no_sleep(seconds: float) -> None:
+            pass
+        
+        counter = TokenCounter("test-model")
+        limited = ConcurrencyLimitedLLM(mock_llm_port, AdaptiveConcurrencyLimiter(), LatencyModel(), counter,
+                                        RateLimiter(requests_per_minute=60, tokens_per_minute=0))
+        router = ModelRouter([ModelRoute("test-model", limited)], counter)
+        llm = RetryingLLM(router, RetryPolicy(sleep=no_sleep), counter)
+        mock_llm_port.run_completion_async.side_effect = [LLMTimeoutError(), mock_llm_port.response]
+        
+        await llm.run_routed_completion_async("system", "user", LLMAnalysisDTO)
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert counter.counted == 2  # system and user prompt, once
+
+    def test_latency_model_uses_priors_then_fits(self):
+        model = LatencyModel(min_samples=3, prior_intercept=2.0, prior_seconds_per_token=0.0)
+        assert model.predict(1000) == 2.0
+        
+        for tokens in (100, 200, 300, 400):
+            model.record(tokens, 1.0 + tokens * 0.01)
+        
+        assert model.predict(1000) == pytest.approx(11.0)
+
+    @pytest.mark.asyncio
+    async def test_estimate_includes_queue_wait(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        use_case = EstimateAnalysisUseCase(
+            TokenCounter("test-model"), LatencyModel(prior_intercept=2.0, prior_seconds_per_token=0.0),
+            "test-model", 400, limiter=limiter
+        )
+        
+        estimate = await use_case.execute("Alice: hello")
+        
+        assert estimate.predicted_latency_seconds == 2.0
+        assert estimate.predicted_queue_seconds == 2.0
+        limiter.release(latency=0.1)
+        await waiter
+
+    @pytest.mark.asyncio
+    async def test_token_limit_rejects_transcript(self, mock_llm_port, repository):
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, token_counter=TokenCounter("test-model"),
+                                            max_tokens=10)
+        
+        with pytest.raises(TranscriptTooManyTokensError):
+            await use_case.execute("word " * 100)
+        mock_llm_port.run_completion_async.assert_not_called()
+
+
 class TestGetAnalysisUseCase:
     @pytest.mark.asyncio
     async def test_successful_retrieval(self, get_use_case, repository):
@@ -167,6 +962,377 @@ class TestAnalyzeBatchUseCase:
         results = await batch_use_case.execute([])
         assert len(results) == 0
 
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self, mock_llm_port, repository):
+        async def completion_by_length(system_prompt, user_prompt, dto):
+            await asyncio.sleep(0.03 if "slow" in user_prompt else 0.0)
+            return LLMAnalysisDTO(summary=user_prompt[-4:], action_items=[])
+        
+        mock_llm_port.run_completion_async.side_effect = completion_by_length
+        batch_use_case = AnalyzeBatchUseCase(mock_llm_port, repository)
+        
+        results = [result async for result in batch_use_case.execute_stream(["slow", "fast", ""])]
+        
+        assert [result.index for result in results][-1] == 0
+        assert sorted(result.index for result in results) == [0, 1, 2]
+        assert [result.success for result in sorted(results, key=lambda r: r.index)] == [True, True, False]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_analyzed_once(self, batch_use_case, mock_llm_port, repository):
+        transcripts = ["Same transcript", "Other transcript", "Same  transcript ", "", "Same transcript", "  "]
+        
+        results = await batch_use_case.execute(transcripts)
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert results.deduplicated_count == 2
+        assert [result.index for result in results] == list(range(6))
+        assert [result.transcript for result in results] == transcripts
+        assert [result.success for result in results] == [True, True, True, False, True, False]
+        assert results[0].analysis.id == results[2].analysis.id == results[4].analysis.id
+        assert results[3].error == results[5].error
+        assert await repository.count() == 2
+
+    def test_plan_packs(self):
+        packs, singles = plan_packs([(0, 10), (1, 60), (2, 30), (3, 30), (4, 40), (5, 5)], token_budget=100, max_items=3)
+        
+        assert packs == [[0, 2, 3], [4, 5]]
+        assert singles == [1]
+
+    @pytest.mark.asyncio
+    async def test_packed_batch_falls_back_for_missing_items(self, mock_llm_port, repository):
+        async def completion(system_prompt, user_prompt, dto):
+            if dto is PackedLLMAnalysisDTO:
+                # Drops the second transcript of the pack
+                return PackedLLMAnalysisDTO(analyses=[
+                    PackedLLMAnalysisItemDTO(transcript_id=0, summary="Packed first", action_items=["A"]),
+                    PackedLLMAnalysisItemDTO(transcript_id=2, summary="Packed third", action_items=[]),
+                ])
+            return LLMAnalysisDTO(summary="Single", action_items=[])
+        
+        mock_llm_port.run_completion_async.side_effect = completion
+        use_case = AnalyzeBatchUseCase(mock_llm_port, repository, pack_token_budget=1000, model_name="test-model")
+        
+        results = await use_case.execute(["Check-in one", "Check-in two", "Check-in three", ""])
+        
+        packed_calls = [call for call in mock_llm_port.run_completion_async.call_args_list if call[0][2] is PackedLLMAnalysisDTO]
+        assert len(packed_calls) == 1
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert [result.analysis.summary for result in results[:3]] == ["Packed first", "Single", "Packed third"]
+        assert results[0].analysis.next_actions == ["A"]
+        assert results[0].analysis.model == results[1].analysis.model == "test-model"
+        assert results[3].success is False
+        assert await repository.count() == 3
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_pack_fails_its_items_without_fallback(self, mock_llm_port, repository):
+        mock_llm_port.run_completion_async.side_effect = LLMRateLimitError()
+        use_case = AnalyzeBatchUseCase(mock_llm_port, repository, pack_token_budget=1000)
+        
+        results = await use_case.execute(["Check-in one", "Check-in two", "Check-in three"])
+        
+        assert mock_llm_port.run_completion_async.call_count == 1
+        assert all(result.error == str(LLMRateLimitError()) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_stream_fans_out_duplicates(self, batch_use_case, mock_llm_port):
+        results = [result async for result in batch_use_case.execute_stream(["A", "B", "A"])]
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert sorted(result.index for result in results) == [0, 1, 2]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def job_repository(request, tmp_path):
+    if request.param == "sqlite":
+        repository = SqliteBatchJobRepository(str(tmp_path / "jobs.db"))
+        yield repository
+        asyncio.run(repository.close())
+    else:
+        yield MemoryBatchJobRepository()
+
+
+class TestBatchJobs:
+    @pytest.mark.asyncio
+    async def test_workers_process_submitted_job(self, job_repository, analyze_use_case):
+        pool = BatchJobWorkerPool(job_repository, analyze_use_case, worker_count=3)
+        await pool.start()
+        try:
+            job = await SubmitBatchJobUseCase(job_repository, pool).execute(
+                [f"Transcript {i}" for i in range(20)] + [""]
+            )
+            await pool.join()
+        finally:
+            await pool.stop()
+        
+        stored_job, items = await GetBatchJobResultsUseCase(job_repository).execute(job.id, offset=18, limit=10)
+        assert stored_job.status == BatchJobStatus.COMPLETED
+        assert stored_job.completed_count == 21
+        assert stored_job.successful_count == 20
+        assert stored_job.failed_count == 1
+        assert [item.index for item in items] == [18, 19, 20]
+        assert items[0].analysis.summary == "Test summary"
+        assert items[2].status == BatchJobItemStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_cancelled_job_items_are_skipped(self, job_repository, analyze_use_case, mock_llm_port):
+        pool = BatchJobWorkerPool(job_repository, analyze_use_case, worker_count=1)
+        job = await SubmitBatchJobUseCase(job_repository, pool).execute(["First", "Second"])
+        
+        cancelled = await CancelBatchJobUseCase(job_repository).execute(job.id)
+        await pool.start()
+        await pool.join()
+        await pool.stop()
+        
+        assert cancelled.status == BatchJobStatus.CANCELLED
+        mock_llm_port.run_completion_async.assert_not_called()
+        assert pool.stats()["skipped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_pending_items_recovered_on_start(self, job_repository, analyze_use_case):
+        first_pool = BatchJobWorkerPool(job_repository, analyze_use_case)
+        job = await SubmitBatchJobUseCase(job_repository, first_pool).execute(["First", "Second"])
+        
+        restarted_pool = BatchJobWorkerPool(job_repository, analyze_use_case)
+        await restarted_pool.start()
+        await restarted_pool.join()
+        await restarted_pool.stop()
+        
+        assert (await job_repository.get_job(job.id)).status == BatchJobStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_pools_sharing_a_store_run_each_item_once(self, job_repository, analyze_use_case, mock_llm_port):
+        job = await SubmitBatchJobUseCase(job_repository, BatchJobWorkerPool(job_repository, analyze_use_case)).execute(
+            [f"Transcript {i}" for i in range(6)]
+        )
+        pools = [BatchJobWorkerPool(job_repository, analyze_use_case, worker_count=2) for _ in range(2)]
+        
+        for pool in pools:
+            await pool.start()
+        for pool in pools:
+            await pool.join()
+            await pool.stop()
+        
+        assert mock_llm_port.run_completion_async.call_count == 6
+        assert sum(pool.stats()["processed"] for pool in pools) == 6
+        assert (await job_repository.get_job(job.id)).status == BatchJobStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_expired_claim_can_be_taken_over(self):
+        now = [0.0]
+        repository = MemoryBatchJobRepository(clock=lambda: now[0])
+        job = await SubmitBatchJobUseCase(repository, BatchJobWorkerPool(repository, AsyncMock())).execute(["First"])
+        
+        first = await repository.claim_item(job.id, 0, lease_seconds=60)
+        second = await repository.claim_item(job.id, 0, lease_seconds=60)
+        pending_while_claimed = await repository.list_pending_items()
+        now[0] = 61.0
+        
+        assert first is not None and second is None
+        assert pending_while_claimed == []
+        assert await repository.list_pending_items() == [(job.id, 0)]
+        assert await repository.claim_item(job.id, 0, lease_seconds=60) is not None
+
+    @pytest.mark.asyncio
+    async def test_finished_jobs_expire_after_retention(self):
+        now = [0.0]
+        repository = MemoryBatchJobRepository(clock=lambda: now[0], retention_seconds=60)
+        pool = BatchJobWorkerPool(repository, AsyncMock())
+        finished = await SubmitBatchJobUseCase(repository, pool).execute(["First"])
+        running = await SubmitBatchJobUseCase(repository, pool).execute(["Second"])
+        await repository.record_item_result(finished.id, 0, error="Failed")
+        now[0] = 61.0
+        
+        await repository.list_pending_items()
+        
+        assert await repository.get_job(finished.id) is None
+        assert await repository.get_job(running.id) is not None
+
+
+class TestBulkAnalyzeUseCase:
+    @pytest.mark.asyncio
+    async def test_bulk_round_trip_through_local_batch(self, mock_llm_port, repository, tmp_path):
+        def completion(system_prompt, user_prompt, dto):
+            if "broken" in user_prompt:
+                raise Exception("Model refused")
+            return LLMAnalysisDTO(summary=user_prompt.split()[-1], action_items=["Follow up"])
+        
+        mock_llm_port.run_completion_async.side_effect = completion
+        batch_llm = LocalFileBatchLLm(mock_llm_port, LLMAnalysisDTO, str(tmp_path / "provider"))
+        submitted = []
+        submit = batch_llm.submit
+        
+        async def record_submit(request_file):
+            with open(request_file, encoding="utf-8") as requests:
+                submitted.append(requests.read())
+            return await submit(request_file)
+        
+        batch_llm.submit = record_submit
+        use_case = BulkAnalyzeUseCase(batch_llm, repository, "test-model", str(tmp_path / "work"), poll_interval=0.01)
+        
+        report = await use_case.execute(iter(["first", "", "broken", "fourth"]))
+        
+        assert report.total_count == 4
+        assert report.successful_count == 2
+        assert set(report.errors) == {1, 2}
+        assert await repository.count() == 2
+        stored = await repository.get_by_id(report.analysis_ids[3])
+        assert stored.summary == "fourth"
+        assert stored.model == "test-model"
+        
+        assert list((tmp_path / "work").iterdir()) == []
+        first_request = json.loads(submitted[0].splitlines()[0])
+        assert first_request["custom_id"] == "transcript-0"
+        assert first_request["body"]["model"] == "test-model"
+        assert first_request["body"]["response_format"]["json_schema"]["strict"] is True
+
+    @pytest.mark.asyncio
+    async def test_requests_missing_from_output_count_as_failed(self, repository, tmp_path):
+        content = LLMAnalysisDTO(summary="first", action_items=[]).model_dump_json()
+        record = {"custom_id": "transcript-0", "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}}
+        
+        async def download_results(batch_id, destination):
+            with open(destination, "w", encoding="utf-8") as output:
+                output.write(json.dumps(record) + "\n")
+        
+        batch_llm = Mock()
+        batch_llm.submit = AsyncMock(return_value="batch-1")
+        batch_llm.get_status = AsyncMock(return_value=BulkBatchStatus.COMPLETED)
+        batch_llm.download_results = AsyncMock(side_effect=download_results)
+        use_case = BulkAnalyzeUseCase(batch_llm, repository, "test-model", str(tmp_path), poll_interval=0.01)
+        
+        report = await use_case.execute(["first", "second"])
+        
+        assert report.successful_count == 1
+        assert report.failed_count == 1
+        assert set(report.errors) == {1}
+
+
+    @pytest.mark.asyncio
+    async def test_malformed_output_lines_do_not_abort_ingestion(self, repository, tmp_path):
+        content = LLMAnalysisDTO(summary="third", action_items=[]).model_dump_json()
+        good = {"custom_id": "transcript-2", "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}}}
+        bad = {"custom_id": "transcript-1", "response": {"status_code": 200}}
+        
+        async def download_results(batch_id, destination):
+            with open(destination, "w", encoding="utf-8") as output:
+                output.write("{not json\n" + json.dumps(bad) + "\n" + json.dumps(good) + "\n")
+        
+        batch_llm = Mock()
+        batch_llm.submit = AsyncMock(return_value="batch-1")
+        batch_llm.get_status = AsyncMock(return_value=BulkBatchStatus.COMPLETED)
+        batch_llm.download_results = AsyncMock(side_effect=download_results)
+        use_case = BulkAnalyzeUseCase(batch_llm, repository, "test-model", str(tmp_path), poll_interval=0.01)
+        
+        report = await use_case.execute(["first", "second", "third"])
+        
+        assert report.successful_count == 1
+        assert (await repository.get_by_id(report.analysis_ids[2])).summary == "third"
+        assert report.errors[0] == "No result in batch output"
+        assert "body" in report.errors[1]
+
+
+class TestAnalyzeLongTranscriptUseCase:
+    def test_split_and_chunk_on_speaker_turns(self):
+        transcript = "\n".join(f"Speaker {i % 2}: {'word ' * 40}" for i in range(10))
+        
+        turns = split_speaker_turns(transcript)
+        chunks = chunk_turns(turns, max_tokens=120, overlap_turns=1)
+        
+        assert len(turns) == 10
+        assert len(chunks) > 1
+        assert all(chunk.startswith("Speaker") for chunk in chunks)
+        assert chunks[1].startswith(chunks[0].split("\n\n")[-1])
+
+    def test_oversized_turn_is_hard_split(self):
+        chunks = chunk_turns(["Alice: " + "x" * 1000], max_tokens=50, overlap_turns=0)
+        
+        assert len(chunks) == 6
+        assert "".join(chunks) == "Alice: " + "x" * 1000
+
+    def test_chunks_are_sized_with_the_token_counter(self):
+        token_counter = Mock()
+        token_counter.count.side_effect = lambda text: len(text.split())
+        turns = [f"Speaker {i}: {'word ' * 8}" for i in range(6)]
+        
+        chunks = chunk_turns(turns, max_tokens=20, overlap_turns=0, token_counter=token_counter)
+        
+        # 10 words per turn: two turns per chunk, where the chars/4 estimate would fit one
+        assert len(chunks) == 3
+        assert token_counter.count.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_map_reduce_merges_partials(self, mock_llm_port, repository):
+        def completion(system_prompt, user_prompt, dto):
+            if "Partial analyses" in user_prompt:
+                return LLMAnalysisDTO(summary="Merged", action_items=["Send notes", "send notes.", "Book room"])
+            return LLMAnalysisDTO(summary="Part", action_items=["Send notes"])
+        
+        mock_llm_port.run_completion_async.side_effect = completion
+        use_case = AnalyzeLongTranscriptUseCase(mock_llm_port, repository, chunk_tokens=100, overlap_turns=0)
+        transcript = "\n".join(f"Speaker {i}: {'word ' * 60}" for i in range(8))
+        
+        result = await use_case.execute(transcript)
+        
+        assert result.summary == "Merged"
+        assert result.next_actions == ["Send notes", "Book room"]
+        assert mock_llm_port.run_completion_async.call_count == 9
+        assert await repository.get_by_id(result.id) is not None
+
+    @pytest.mark.asyncio
+    async def test_records_model_of_final_call(self, repository):
+        router = Mock()
+        router.run_routed_completion_async = AsyncMock(return_value=(LLMAnalysisDTO(summary="Merged", action_items=[]), "large-model"))
+        use_case = AnalyzeLongTranscriptUseCase(router, repository, chunk_tokens=100, overlap_turns=0, model_name="default-model")
+        transcript = "\n".join(f"Speaker {i}: {'word ' * 60}" for i in range(4))
+        
+        result = await use_case.execute(transcript)
+        
+        assert result.model == "large-model"
+        assert (await repository.get_by_id(result.id)).model == "large-model"
+
+    @pytest.mark.asyncio
+    async def test_reduce_runs_as_tree_when_partials_exceed_budget(self, mock_llm_port, repository):
+        mock_llm_port.run_completion_async.return_value = LLMAnalysisDTO(summary="s" * 200, action_items=["a"])
+        use_case = AnalyzeLongTranscriptUseCase(mock_llm_port, repository, chunk_tokens=100, overlap_turns=0,
+                                                reduce_tokens=120)
+        transcript = "\n".join(f"Speaker {i}: {'word ' * 60}" for i in range(8))
+        
+        await use_case.execute(transcript)
+        
+        # 8 map calls, 4 + 2 + 1 reduce calls
+        assert mock_llm_port.run_completion_async.call_count == 15
+
+    @pytest.mark.asyncio
+    async def test_failed_chunk_cancels_the_others(self, mock_llm_port, repository):
+        cancelled = []
+        
+        async def completion(system_prompt, user_prompt, dto):
+            if "part 1 of" in user_prompt.lower():
+                raise LLMRateLimitError()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(user_prompt)
+                raise
+        
+        mock_llm_port.run_completion_async.side_effect = completion
+        use_case = AnalyzeLongTranscriptUseCase(mock_llm_port, repository, chunk_tokens=100, overlap_turns=0)
+        transcript = "\n".join(f"Speaker {i}: {'word ' * 60}" for i in range(4))
+        
+        with pytest.raises(LLMRateLimitError):
+            await use_case.execute(transcript)
+        await asyncio.sleep(0)
+        
+        assert len(cancelled) == 3
+        assert await repository.count() == 0
+
+    @pytest.mark.asyncio
+    async def test_too_large(self, mock_llm_port, repository):
+        use_case = AnalyzeLongTranscriptUseCase(mock_llm_port, repository, max_size=10)
+        
+        with pytest.raises(TranscriptTooLargeError):
+            await use_case.execute("Alice: this is too long")
+
 
 class TestMemoryRepository:
     @pytest.mark.asyncio
@@ -205,4 +1371,422 @@ class TestMemoryRepository:
         )
         await repository.save(analysis)
         
-        assert await repository.count() == 1
\ No newline at end of file
+        assert await repository.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_by_entries_and_bytes(self):
+        repository = MemoryRepository(max_entries=2)
+        first, second, third = (TranscriptAnalysis(summary=f"Test {i}", next_actions=[]) for i in range(3))
+        
+        await repository.save(first)
+        await repository.save(second)
+        await repository.get_by_id(first.id)
+        await repository.save(third)
+        
+        assert await repository.get_by_id(second.id) is None
+        assert await repository.get_by_id(first.id) is not None
+        assert repository.evictions == 1
+        
+        small = MemoryRepository(max_bytes=1000)
+        await small.save(TranscriptAnalysis(summary="x" * 400, next_actions=[]))
+        await small.save(TranscriptAnalysis(summary="y" * 400, next_actions=[]))
+        assert await small.count() == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        clock = FakeClock()
+        repository = MemoryRepository(ttl_seconds=10, clock=clock)
+        analysis = TranscriptAnalysis(summary="Test", next_actions=[])
+        await repository.save(analysis)
+        
+        clock.now += 11
+        
+        assert await repository.count() == 0
+        assert await repository.get_by_id(analysis.id) is None
+        assert repository.expirations == 1
+
+    @pytest.mark.asyncio
+    async def test_expiry_queue_drops_evicted_entries(self):
+        repository = MemoryRepository(max_entries=10, ttl_seconds=3600, clock=FakeClock())
+        
+        for i in range(5000):
+            await repository.save(TranscriptAnalysis(summary=f"Test {i}", next_actions=[]))
+        
+        assert await repository.count() == 10
+        assert len(repository._expiry_queue) <= 20
+
+    @pytest.mark.asyncio
+    async def test_get_all_reuses_snapshot_until_write(self):
+        repository = MemoryRepository()
+        await repository.save(TranscriptAnalysis(summary="Test", next_actions=[]))
+        
+        snapshot = await repository.get_all()
+        assert await repository.get_all() is snapshot
+        
+        await repository.save(TranscriptAnalysis(summary="Other", next_actions=[]))
+        assert len(await repository.get_all()) == 2
+
+
+class TestSqliteRepository:
+    @pytest.mark.asyncio
+    async def test_write_behind_group_commit_and_reopen(self, tmp_path):
+        path = str(tmp_path / "analyses.db")
+        repository = SqliteRepository(path, batch_size=100, flush_interval=0.01)
+        analyses = [TranscriptAnalysis(summary=f"Test {i}", next_actions=["Action"]) for i in range(250)]
+        
+        await repository.save_many(analyses[:200])
+        for analysis in analyses[200:]:
+            await repository.save(analysis)
+        
+        # Readable before the background commit
+        assert (await repository.get_by_id(analyses[0].id)).summary == "Test 0"
+        assert await repository.count() == 250
+        assert repository.flush_batches == 3
+        await repository.close()
+        
+        reopened = SqliteRepository(path)
+        stored = await reopened.get_by_id(analyses[42].id)
+        assert stored.summary == "Test 42"
+        assert stored.next_actions == ["Action"]
+        assert stored.created_at == analyses[42].created_at
+        assert [analysis.id for analysis in await reopened.get_all()][:1] == [analyses[0].id]
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_created_at_stored_as_utc(self, tmp_path):
+        repository = SqliteRepository(str(tmp_path / "analyses.db"), flush_interval=0.01)
+        utc = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+        # 11:30 at UTC+05:00 is 06:30 UTC, so earlier although its local text sorts later.
+        earlier = TranscriptAnalysis(summary="Earlier", next_actions=[], created_at=datetime(2024, 1, 1, 11, 30, tzinfo=timezone(timedelta(hours=5))))
+        later = TranscriptAnalysis(summary="Later", next_actions=[], created_at=utc)
+        
+        await repository.save_many([earlier, later])
+        page = await repository.list_page(10, created_from=datetime(2024, 1, 1, 8, 0, tzinfo=timezone.utc))
+        
+        assert [analysis.summary for analysis in page] == ["Later"]
+        assert [analysis.summary for analysis in await repository.list_page(10)] == ["Later", "Earlier"]
+        await repository.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_results_saved_with_save_many(self, mock_llm_port, tmp_path):
+        repository = SqliteRepository(str(tmp_path / "analyses.db"), flush_interval=0.01)
+        use_case = AnalyzeBatchUseCase(mock_llm_port, repository)
+        
+        results = await use_case.execute(["First", "Second", "Third"])
+        await repository.flush()
+        
+        assert all(result.success for result in results)
+        assert repository.flush_batches == 1
+        assert await repository.count() == 3
+        await repository.close()
+
+
+class TestSharedMmapRepository:
+    @pytest.mark.asyncio
+    async def test_visible_across_instances(self, tmp_path):
+        path = str(tmp_path / "shared")
+        writer = SharedMmapRepository(path, capacity=64)
+        reader = SharedMmapRepository(path, capacity=64)
+        analysis = TranscriptAnalysis(summary="Test", next_actions=["Action"])
+        
+        await writer.save(analysis)
+        await writer.save(analysis.model_copy(update={"summary": "Updated"}))
+        
+        stored = await reader.get_by_id(analysis.id)
+        assert stored.summary == "Updated"
+        assert stored.created_at == analysis.created_at
+        assert await reader.count() == 1
+        assert await reader.get_by_id(uuid4()) is None
+        await writer.close()
+        await reader.close()
+
+    @pytest.mark.asyncio
+    async def test_rejects_inserts_beyond_load_factor(self, tmp_path):
+        repository = SharedMmapRepository(str(tmp_path / "shared"), capacity=8)
+        analyses = [TranscriptAnalysis(summary=f"Test {i}", next_actions=[]) for i in range(8)]
+        
+        with pytest.raises(AnalysisStoreFullError):
+            await repository.save_many(analyses)
+        
+        assert await repository.count() == 7
+        assert len(await repository.get_all()) == 7
+        await repository.close()
+
+    @pytest.mark.asyncio
+    async def test_ordered_index_follows_updates(self, tmp_path):
+        path = tmp_path / "shared"
+        repository = SharedMmapRepository(str(path), capacity=64)
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        analyses = [TranscriptAnalysis(summary=f"Test {i}", next_actions=[], created_at=start + timedelta(minutes=i)) for i in range(5)]
+        await repository.save_many(analyses)
+        
+        await repository.save(analyses[3].model_copy(update={"created_at": start - timedelta(minutes=1)}))
+        expected = [analyses[i].id for i in (4, 2, 1, 0, 3)]
+        
+        assert [analysis.id for analysis in await repository.list_page(10)] == expected
+        assert [analysis.id for analysis in await repository.list_page(2, before=(analyses[2].created_at, analyses[2].id))] == expected[2:4]
+        await repository.close()
+        
+        reopened = SharedMmapRepository(str(path), capacity=64)
+        assert [analysis.id for analysis in await reopened.list_page(10)] == expected
+        await reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_full_store_still_returns_analysis(self, tmp_path, mock_llm_port):
+        repository = SharedMmapRepository(str(tmp_path / "shared"), capacity=2)
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository)
+        
+        first = await use_case.execute("First transcript")
+        second = await use_case.execute("Second transcript")
+        
+        assert second.summary == "Test summary"
+        assert await repository.get_by_id(first.id) is not None
+        assert await repository.get_by_id(second.id) is None
+        await repository.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_saves_and_reads(self, tmp_path):
+        repository = SharedMmapRepository(str(tmp_path / "shared"), capacity=64)
+        analyses = [TranscriptAnalysis(summary=f"Test {i}", next_actions=[]) for i in range(20)]
+        
+        await asyncio.gather(*(repository.save(analysis) for analysis in analyses))
+        stored = await asyncio.gather(*(repository.get_by_id(analysis.id) for analysis in analyses))
+        
+        assert [analysis.summary for analysis in stored] == [analysis.summary for analysis in analyses]
+        assert await repository.count() == 20
+        await repository.close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "shared"])
+def analysis_repository(request, tmp_path):
+    if request.param == "memory":
+        return MemoryRepository()
+    if request.param == "sqlite":
+        return SqliteRepository(str(tmp_path / "analyses.db"), flush_interval=0.01)
+    return SharedMmapRepository(str(tmp_path / "shared"), capacity=64)
+
+
+class TestListAnalysesUseCase:
+    @pytest.mark.asyncio
+    async def test_cursor_pages_newest_first(self, analysis_repository):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        analyses = [
+            TranscriptAnalysis(summary=f"Test {i}", next_actions=[], created_at=start + timedelta(minutes=i))
+            for i in range(7)
+        ]
+        await analysis_repository.save_many(analyses[::-1])
+        use_case = ListAnalysesUseCase(analysis_repository)
+        
+        first = await use_case.execute(3)
+        second = await use_case.execute(3, cursor=first.next_cursor)
+        last = await use_case.execute(3, cursor=second.next_cursor)
+        
+        assert [a.summary for a in first.analyses] == ["Test 6", "Test 5", "Test 4"]
+        assert [a.summary for a in second.analyses] == ["Test 3", "Test 2", "Test 1"]
+        assert [a.summary for a in last.analyses] == ["Test 0"]
+        assert last.next_cursor is None
+        await analysis_repository.close()
+
+    @pytest.mark.asyncio
+    async def test_time_range_filter(self, analysis_repository):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        await analysis_repository.save_many([
+            TranscriptAnalysis(summary=f"Test {i}", next_actions=[], created_at=start + timedelta(hours=i))
+            for i in range(5)
+        ])
+        use_case = ListAnalysesUseCase(analysis_repository)
+        
+        page = await use_case.execute(10, created_from=start + timedelta(hours=1),
+                                      created_to=datetime(2024, 1, 1, 4))
+        
+        assert [a.summary for a in page.analyses] == ["Test 3", "Test 2", "Test 1"]
+        await analysis_repository.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, repository):
+        with pytest.raises(InvalidCursorError):
+            await ListAnalysesUseCase(repository).execute(10, cursor="not-a-cursor")
+
+
+class TestSearchAnalyses:
+    @pytest.mark.asyncio
+    async def test_ranked_terms_and_phrases(self):
+        index = InvertedIndex()
+        repository = MemoryRepository()
+        repository.add_listener(index)
+        pricing = TranscriptAnalysis(summary="Customer asked about pricing and pricing tiers", next_actions=["Send quote"])
+        renewal = TranscriptAnalysis(summary="Renewal call, pricing briefly mentioned", next_actions=["Follow up next week"])
+        other = TranscriptAnalysis(summary="Onboarding session", next_actions=["Schedule training", "follow the up"])
+        await repository.save_many([pricing, renewal, other])
+        use_case = SearchAnalysesUseCase(index, repository)
+        
+        by_term = await use_case.execute("pricing", 10)
+        by_phrase = await use_case.execute('"follow up"', 10)
+        
+        assert [result.analysis.id for result in by_term.results] == [pricing.id, renewal.id]
+        assert by_term.total_matches == 2
+        assert [result.analysis.id for result in by_phrase.results] == [renewal.id]
+
+    @pytest.mark.asyncio
+    async def test_evicted_analyses_leave_the_index(self):
+        index = InvertedIndex()
+        repository = MemoryRepository(max_entries=1)
+        repository.add_listener(index)
+        first = TranscriptAnalysis(summary="Budget review", next_actions=[])
+        second = TranscriptAnalysis(summary="Budget planning", next_actions=[])
+        
+        await repository.save(first)
+        await repository.save(second)
+        
+        top, total = index.search("budget", 10)
+        assert [analysis_id for analysis_id, _ in top] == [second.id]
+        assert total == 1
+        assert index.stats()["documents"] == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_pages_through_repository(self):
+        repository = MemoryRepository()
+        analyses = [TranscriptAnalysis(summary=f"Budget review {n}", next_actions=[]) for n in range(5)]
+        await repository.save_many(analyses)
+        index = InvertedIndex()
+        
+        indexed = await index.backfill(repository, page_size=2)
+        
+        _, total = index.search("budget", 10)
+        assert indexed == 5
+        assert total == 5
+
+    @pytest.mark.asyncio
+    async def test_unavailable_without_index(self):
+        use_case = SearchAnalysesUseCase(None, MemoryRepository())
+        
+        with pytest.raises(SearchUnavailableError):
+            await use_case.execute("budget", 10)
+
+
+MEETING_TRANSCRIPT = "\n".join(
+    f"[00:{minute:02d}] Alice: item {minute} on the roadmap needs an owner before the quarterly review"
+    for minute in range(40)
+)
+
+
+class TestNearDuplicateReuse:
+    def test_index_matches_variants_only(self):
+        index = NearDuplicateIndex(threshold=0.8)
+        analysis_id = uuid4()
+        index.add(index.signature(MEETING_TRANSCRIPT), analysis_id)
+        variant = "Hi everyone!\n" + MEETING_TRANSCRIPT.replace("[00:", "[01:").replace("needs an", "um needs an")
+        unrelated = "\n".join(f"Bob: candidate {n} interviewed well for the design role" for n in range(40))
+        
+        match = index.query(index.signature(variant))
+        
+        assert match is not None and match[0] == analysis_id
+        assert match[1] >= 0.8
+        assert index.query(index.signature(unrelated)) is None
+
+    def test_index_allocates_on_use_and_overwrites_oldest(self):
+        unused = NearDuplicateIndex(capacity=1_000_000)
+        index = NearDuplicateIndex(threshold=0.8, capacity=2)
+        transcripts = [f"Alice: we reviewed topic {topic} and agreed on owners for {topic}" * 5 for topic in ("alpha", "beta", "gamma")]
+        ids = [uuid4() for _ in transcripts]
+        
+        for transcript, analysis_id in zip(transcripts, ids):
+            index.add(index.signature(transcript), analysis_id)
+        
+        assert unused._signatures.nbytes == 0
+        assert len(index) == 2
+        assert index.query(index.signature(transcripts[0])) is None
+        assert index.query(index.signature(transcripts[2]))[0] == ids[2]
+        assert index.query(index.signature(transcripts[1]))[0] == ids[1]
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_reuses_stored_analysis(self, mock_llm_port, repository):
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, near_duplicates=NearDuplicateIndex(threshold=0.8))
+        
+        first = await use_case.execute(MEETING_TRANSCRIPT)
+        second = await use_case.execute(MEETING_TRANSCRIPT.replace("[00:", "[02:"))
+        fresh = await use_case.execute(MEETING_TRANSCRIPT.replace("[00:", "[03:"), bypass_cache=True)
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert first.reused_from is None
+        assert second.reused_from == first.id
+        assert second.id != first.id
+        assert second.summary == first.summary
+        assert (await repository.get_by_id(second.id)).reused_from == first.id
+        assert fresh.reused_from is None
+
+    @pytest.mark.asyncio
+    async def test_evicted_original_falls_back_to_llm(self, mock_llm_port):
+        repository = MemoryRepository(max_entries=1)
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, near_duplicates=NearDuplicateIndex(threshold=0.8))
+        
+        await use_case.execute(MEETING_TRANSCRIPT)
+        await repository.save(TranscriptAnalysis(summary="Other", next_actions=[]))
+        result = await use_case.execute(MEETING_TRANSCRIPT.replace("[00:", "[02:"))
+        
+        assert mock_llm_port.run_completion_async.call_count == 2
+        assert result.reused_from is None
+
+
+class TestTranscriptCompaction:
+    def test_steps(self):
+        transcript = "\n".join(
+            f"[00:{minute:02d}] Mark Foster | MCC, ACTC:   um, let's   cover item {minute}\n\n\n"
+            f"Ann: sure" for minute in range(5)
+        )
+        
+        compacted = TranscriptPreprocessor([NoiseFilter(), normalize_whitespace, SpeakerAliaser()]).process(transcript)
+        
+        assert compacted.text.startswith("Speakers:\nS1 = Mark Foster | MCC, ACTC\n\n")
+        assert "S1: let's cover item 3" in compacted.text
+        # Short names cost more in the legend than they save
+        assert "Ann: sure" in compacted.text
+        assert "[00:" not in compacted.text
+        assert "\n\n\n" not in compacted.text
+        assert compacted.tokens_saved > 0
+
+    def test_custom_noise_patterns_and_stats(self):
+        preprocessor = TranscriptPreprocessor([NoiseFilter([r"\(inaudible\)"]), normalize_whitespace])
+        
+        first = preprocessor.process("We (inaudible) agreed on the plan")
+        preprocessor.compact("Estimates (inaudible) are not recorded")
+        
+        assert first.text == "We agreed on the plan"
+        assert preprocessor.stats()["processed"] == 1
+        assert preprocessor.stats()["chars_saved"] == first.chars_saved
+        assert first.tokens_saved > 0
+
+    def test_tokens_counted_only_when_read(self):
+        token_counter = Mock()
+        token_counter.count.side_effect = len
+        preprocessor = TranscriptPreprocessor([normalize_whitespace], token_counter=token_counter)
+        
+        compacted = preprocessor.process("Alice:   hello")
+        
+        assert token_counter.count.call_count == 0
+        assert compacted.tokens_saved == 2
+        assert token_counter.count.call_count == 2
+
+    def test_keeps_labels_and_times_that_are_content(self):
+        transcript = "\n".join(
+            "Note: the budget is fixed\n10:30 we agreed to ship on Friday\n10:31 Mark Foster | MCC, ACTC: ok"
+            for _ in range(5)
+        )
+        
+        compacted = default_preprocessor().process(transcript)
+        
+        assert "Note: the budget is fixed" in compacted.text
+        assert "10:30 we agreed to ship on Friday" in compacted.text
+        assert "10:31" not in compacted.text
+        assert "S1: ok" in compacted.text
+        assert "= Note" not in compacted.text
+
+    @pytest.mark.asyncio
+    async def test_use_case_prompts_with_compacted_transcript(self, mock_llm_port, repository):
+        use_case = AnalyzeTranscriptUseCase(mock_llm_port, repository, preprocessor=default_preprocessor())
+        
+        await use_case.execute("[00:01] Alice:    um, hello\n[00:02] Bob: hi")
+        
+        user_prompt = mock_llm_port.run_completion_async.call_args[0][1]
+        assert user_prompt.endswith("Transcript:\nAlice: hello\nBob: hi")
+